@@ -1,58 +1,205 @@
+import functools
 import random
 import randomname
 
+from monopoly_simulation import fields as field_types
 from monopoly_simulation.fields import StartField, TaxField, ChanceField, PropertyField
+from monopoly_simulation.sampling import chance_event_table
+
+
+PROPERTY_NOUNS = ('geography', 'houses', 'buildings', 'fast_food')
+
+
+@functools.lru_cache(maxsize=None)
+def property_name_words():
+    """
+    Adjective and noun lists randomname draws property names from, loaded once.
+    """
+    adjectives = randomname.util.get_groups_list(randomname.util.prefix('a', randomname.ADJECTIVES))
+    nouns = randomname.util.get_groups_list(randomname.util.prefix('n', PROPERTY_NOUNS))
+    return adjectives, nouns
+
+
+_name_rng = random.Random()
+
+
+def property_name(index):
+    """
+    Name of the property with the given index, the same on every board.
+    Equal to `randomname.get_name(noun=PROPERTY_NOUNS, seed=index)` (title-cased), but without
+    resolving the word lists on every call.
+    """
+    adjectives, nouns = property_name_words()
+    _name_rng.seed(index)
+    return f"{_name_rng.choice(adjectives)} {_name_rng.choice(nouns)}".replace("-", " ").title()
+
 
 class Board:
-    def __init__(self, config):
+    """
+    Board of a game, laid out lazily so building it and playing a turn cost O(1) in the board size.
+
+    Position 0 is the Start field. Every other position gets its field the first time it is revealed
+    (landed on or viewed): a field type drawn from the fields not placed yet, which gives the same
+    distribution as shuffling all fields up front. Properties get an index (and the name of that index)
+    drawn without replacement.
+
+    The engine dispatches on the flat tables of the revealed positions (position -> value):
+    - field_codes: field type code (fields.START, TAX, CHANCE, PROPERTY)
+    - tax_amounts, property_prices, property_rents: amounts of tax and property fields
+    - chance_effects: (action code, amount) of chance fields
+    - chance_descriptions: description of the chance event of chance fields
+    - property_indices: index of the property, which gives its name
+    Ownership is kept in a bitset over positions (`is_owned` / `mark_owned`).
+    Field views for the GUI are built on demand by `get_field` / `fields`.
+    """
+    def __init__(self, config, rng=None):
         self.config = config
-        self.fields = [None] * self.config.board_size
+        self.board_size = self.config.board_size
+        # The layout has its own generator, so revealing fields (e.g. when the GUI draws the board)
+        # never shifts the dice stream of the game
+        self.rng = random.Random((rng if rng is not None else random).getrandbits(64))
         self.initialize_board(
-            self.config.tax_fields, 
+            self.config.tax_fields,
             self.config.chance_fields,
             self.config.property_fields
             )
-        
+
 
     def initialize_board(self, tax_fields=0, chance_fields=0, property_fields=0):
+        # Fields not placed yet, per type code
+        self.unplaced = [0, tax_fields, chance_fields, property_fields]
+        self.unplaced_total = tax_fields + chance_fields + property_fields
+        self.property_swaps = {} # sparse Fisher-Yates shuffle of the property indices
+        self.properties_left = property_fields
 
-        position = 0
+        self.field_codes = {}
+        self.tax_amounts = {}
+        self.property_prices = {}
+        self.property_rents = {}
+        self.chance_effects = {}
+        self.chance_descriptions = {}
+        self.property_indices = {}
+        self.owned_bits = bytearray((self.board_size + 7) // 8)
+        self.views = {}
 
         # At the start of the board, we always have one StartField
-        self.fields[0] = StartField(cash_amount=self.config.start_cash)
-        position += 1
-        
-        for _ in range(tax_fields):
-            self.fields[position] = TaxField(tax_amount=self.config.tax_amount) 
-            position += 1
-
-        for _ in range(chance_fields):
-            self.fields[position] = ChanceField(chance_event=random.choice(self.config.chance_events))  
-            position += 1
-
-        property_names = [
-            randomname.get_name(
-                noun=( 'geography', 'houses', 'buildings', 'fast_food'), 
-                seed=seed
-                ).replace("-", " ").title() for seed in range(property_fields)]
-        for property_name in property_names:
-            property_price = self.config.property_price
-            property_rent = self.config.property_rent
-            self.fields[position] = PropertyField(property_name, property_price, property_rent)
-            position += 1
-
-        #Shuffling the fields except the first one (StartField)
-        self.fields[1:] = random.sample(self.fields[1:], len(self.fields[1:]))
-
-        
+        self.field_codes[0] = field_types.START
+
+    def reveal(self, position):
+        """
+        Places a field on a position that was not revealed yet and returns its type code.
+        """
+        code = self.field_codes.get(position)
+        if code is not None:
+            return code
+        if self.unplaced_total <= 0:
+            raise ValueError("All fields are placed, the board is larger than its fields.")
+
+        # Type of a field drawn uniformly from the fields not placed yet
+        draw = self.rng.randrange(self.unplaced_total)
+        code = field_types.TAX
+        while draw >= self.unplaced[code]:
+            draw -= self.unplaced[code]
+            code += 1
+        self.unplaced[code] -= 1
+        self.unplaced_total -= 1
+
+        if code == field_types.TAX:
+            self.tax_amounts[position] = self.config.tax_amount
+        elif code == field_types.CHANCE:
+            event = chance_event_table(self.config).sample(self.rng)
+            self.chance_effects[position] = (field_types.CHANCE_ACTION_CODES[event["action"]], event["amount"])
+            self.chance_descriptions[position] = event["description"]
+        else:
+            self.property_prices[position] = self.config.property_price
+            self.property_rents[position] = self.config.property_rent
+            self.property_indices[position] = self.draw_property_index()
+
+        self.field_codes[position] = code
+        return code
+
+    def draw_property_index(self):
+        # One step of a Fisher-Yates shuffle of range(property_fields), storing only swapped entries
+        last = self.properties_left - 1
+        i = self.rng.randrange(self.properties_left)
+        index = self.property_swaps.pop(i, i)
+        if i != last:
+            self.property_swaps[i] = self.property_swaps.pop(last, last)
+        self.properties_left -= 1
+        return index
+
+    def property_name_at(self, position):
+        return property_name(self.property_indices[position])
+
+    def is_owned(self, position):
+        return self.owned_bits[position >> 3] >> (position & 7) & 1
+
+    def mark_owned(self, position):
+        self.owned_bits[position >> 3] |= 1 << (position & 7)
+        view = self.views.get(position)
+        if view is not None:
+            view.is_owned = True
+
+    def build_view(self, position):
+        code = self.reveal(position)
+        if code == field_types.START:
+            return StartField(cash_amount=self.config.start_cash)
+        if code == field_types.TAX:
+            return TaxField(tax_amount=self.tax_amounts[position])
+        if code == field_types.CHANCE:
+            action, amount = self.chance_effects[position]
+            return ChanceField(chance_event={
+                "description": self.chance_descriptions[position],
+                "action": field_types.CHANCE_ACTIONS[action],
+                "amount": amount,
+            })
+        field = PropertyField(self.property_name_at(position), self.property_prices[position], self.property_rents[position])
+        field.is_owned = bool(self.is_owned(position))
+        return field
+
+    @property
+    def fields(self):
+        """
+        Views of all fields; reveals the whole board, so it is meant for drawing small boards.
+        """
+        return [self.get_field(i) for i in range(self.board_size)]
+
     def get_field(self, index):
-        if 0 <= index < self.config.board_size:
-            return self.fields[index]
+        if 0 <= index < self.board_size:
+            view = self.views.get(index)
+            if view is None:
+                view = self.views[index] = self.build_view(index)
+            return view
         else:
             raise IndexError("Index out of bounds for board fields.")
-        
+
     def set_field(self, index, field):
-        if 0 <= index < self.config.board_size:
-            self.fields[index] = field
+        """
+        Replaces the field on a position. If the type changes, the replaced field goes back to the
+        unplaced fields and the new one is taken from them, so later reveals keep their distribution.
+        """
+        if 0 <= index < self.board_size:
+            old_code = self.reveal(index)
+            self.views[index] = field
+            code = field.type_code
+            if code != old_code:
+                if old_code != field_types.START:
+                    self.unplaced[old_code] += 1
+                    self.unplaced_total += 1
+                if self.unplaced[code] > 0:
+                    self.unplaced[code] -= 1
+                    self.unplaced_total -= 1
+            self.field_codes[index] = code
+            if code == field_types.TAX:
+                self.tax_amounts[index] = field.tax_amount
+            elif code == field_types.CHANCE:
+                event = field.chance_event
+                self.chance_effects[index] = (field_types.CHANCE_ACTION_CODES[event["action"]], event["amount"])
+                self.chance_descriptions[index] = event["description"]
+            elif code == field_types.PROPERTY:
+                self.property_prices[index] = field.price
+                self.property_rents[index] = field.rent
+                if field.is_owned:
+                    self.mark_owned(index)
         else:
-            raise IndexError("Index out of bounds for board fields.")
\ No newline at end of file
+            raise IndexError("Index out of bounds for board fields.")
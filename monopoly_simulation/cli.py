@@ -4,15 +4,15 @@ import os
 
 def compare_reward_strategies():
     script_path = os.path.join(os.path.dirname(__file__), 'experiments', 'compare_reward_strategies.py')
-    subprocess.run([sys.executable, "-m", "streamlit", "run", script_path])
+    subprocess.run([sys.executable, "-m", "streamlit", "run", script_path, "--", *sys.argv[1:]])
 
 def compare_start_cash():
     script_path = os.path.join(os.path.dirname(__file__), 'experiments', 'compare_start_cash.py')
-    subprocess.run([sys.executable, "-m", "streamlit", "run", script_path])
+    subprocess.run([sys.executable, "-m", "streamlit", "run", script_path, "--", *sys.argv[1:]])
 
 def compare_players():
     script_path = os.path.join(os.path.dirname(__file__), 'experiments', 'compare_players.py')
-    subprocess.run([sys.executable, "-m", "streamlit", "run", script_path])
+    subprocess.run([sys.executable, "-m", "streamlit", "run", script_path, "--", *sys.argv[1:]])
 
 def app():
     script_path = os.path.join(os.path.dirname(__file__), 'gui', 'app.py')
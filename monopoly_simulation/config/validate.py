@@ -49,11 +49,15 @@ def validate_config(config_path: str) -> dict:
         if not isinstance(value, bool):
             raise ValueError(f"Invalid '{key}': must be a boolean value.")
 
-    # Validate that total fields do not exceed board size
+    # Validate that the fields fill the board next to the Start field
     total_fields = sum(config.get(k, 0) for k in required_non_negative_ints)
-    if total_fields > config["board_size"]:
+    if total_fields > config["board_size"] - 1:
         raise ValueError(
-            f"The sum of fields ({total_fields}) exceeds the board size ({config['board_size']})."
+            f"The sum of fields ({total_fields}) and the Start field exceeds the board size ({config['board_size']})."
+        )
+    if total_fields < config["board_size"] - 1:
+        raise ValueError(
+            f"The sum of fields ({total_fields}) and the Start field does not fill the board size ({config['board_size']})."
         )
 
     # Validate chance events
@@ -65,6 +69,20 @@ def validate_config(config_path: str) -> dict:
             raise ValueError(f"Invalid action '{event["action"]}' in chance events.")
         if not isinstance(event["amount"], int):
             raise ValueError(f"Invalid value '{event["amount"]}' in chance events, must an integer.")
+        weight = event.get("weight", 1)
+        if isinstance(weight, bool) or not isinstance(weight, (int, float)) or weight <= 0:
+            raise ValueError(f"Invalid weight '{weight}' in chance events, must be a positive number.")
+
+    # Validate dice and sampling options
+    num_dice = config.get("num_dice", 1)
+    if not isinstance(num_dice, int) or num_dice <= 0:
+        raise ValueError("Invalid 'num_dice': must be a positive integer.")
+    sampling_block_size = config.get("sampling_block_size", 0)
+    if not isinstance(sampling_block_size, int) or sampling_block_size < 0:
+        raise ValueError("Invalid 'sampling_block_size': must be a non-negative integer.")
+    for key in ["roll_again_on_doubles", "chance_deck"]:
+        if not isinstance(config.get(key, False), bool):
+            raise ValueError(f"Invalid '{key}': must be a boolean value.")
 
     # Vaidate player type
     player_type = config["player_type"]
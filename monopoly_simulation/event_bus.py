@@ -0,0 +1,300 @@
+"""
+Event bus for simulation turn outcomes.
+
+Producers (Simulation.run) publish events into a local batch which is handed to a transport
+once it is full or flushed at the end of a game. Consumers receive whole batches, so the cost of
+locking, pickling or sending over a socket is paid once per batch instead of once per event.
+
+Available transports:
+- RingBufferTransport: bounded in-process ring buffer shared by threads
+- MultiprocessingQueueTransport: `multiprocessing` queue for producers and consumers in separate processes
+- SocketTransport: connection to a local TCP SocketBroker, a stand-in for a message broker
+  so producers and consumers can run on different hosts. Frames are JSON (data only, nothing
+  a peer sends is executed); owned properties travel as their names.
+"""
+import json
+import multiprocessing
+import queue
+import socket
+import struct
+import threading
+
+from monopoly_simulation.fields import Field
+
+
+END_OF_STREAM = "END_OF_STREAM"
+
+
+class RingBufferTransport:
+    """
+    In-process transport holding at most `capacity` batches.
+    Producers block while the buffer is full, which gives backpressure to fast simulations.
+    """
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.slots = [None] * capacity
+        self.head = 0
+        self.size = 0
+        self.condition = threading.Condition()
+
+    def send(self, batch):
+        with self.condition:
+            while self.size == self.capacity:
+                self.condition.wait()
+            self.slots[(self.head + self.size) % self.capacity] = batch
+            self.size += 1
+            self.condition.notify_all()
+
+    def receive(self, timeout=None):
+        with self.condition:
+            if self.size == 0 and not self.condition.wait_for(lambda: self.size > 0, timeout):
+                return None
+            batch = self.slots[self.head]
+            self.slots[self.head] = None
+            self.head = (self.head + 1) % self.capacity
+            self.size -= 1
+            self.condition.notify_all()
+            return batch
+
+    def close(self):
+        pass
+
+
+class MultiprocessingQueueTransport:
+    """
+    Transport for producers and consumers running in separate processes on the same host.
+    Pass the transport to `multiprocessing.Process` arguments before starting the process.
+    """
+    def __init__(self, maxsize=1024, context=None):
+        context = context or multiprocessing.get_context()
+        self.queue = context.Queue(maxsize)
+
+    def send(self, batch):
+        self.queue.put(batch)
+
+    def receive(self, timeout=None):
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.queue.close()
+
+
+def field_name(value):
+    # JSON fallback for the board fields in the properties owned of a turn outcome
+    if isinstance(value, Field):
+        return value.name
+    raise TypeError(f"{type(value).__name__} can not be sent over a socket transport.")
+
+
+def encode_batch(batch):
+    return json.dumps(batch, default=field_name, separators=(",", ":")).encode("utf-8")
+
+
+def decode_batch(payload):
+    """
+    Batch of turn outcome tuples (or the end of stream marker) from a JSON frame.
+    """
+    batch = json.loads(payload.decode("utf-8"))
+    if batch == END_OF_STREAM:
+        return batch
+    return [tuple(event) for event in batch]
+
+
+def send_frame(sock, payload):
+    sock.sendall(struct.pack("!I", len(payload)) + payload)
+
+
+def receive_exactly(sock, size):
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("Connection closed by the other side.")
+        data.extend(chunk)
+    return bytes(data)
+
+
+def receive_frame(sock):
+    (size,) = struct.unpack("!I", receive_exactly(sock, 4))
+    return receive_exactly(sock, size)
+
+
+class SocketBroker:
+    """
+    Minimal local TCP broker. Clients introduce themselves as publisher (b"P") or subscriber (b"S").
+    Every frame from a publisher is forwarded unchanged to all subscribers; frames published
+    before the first subscriber connects are kept and delivered to it.
+    """
+    def __init__(self, host="127.0.0.1", port=0):
+        self.server = socket.create_server((host, port))
+        self.host, self.port = self.server.getsockname()[:2]
+        self.subscribers = []
+        self.pending = []
+        self.lock = threading.Lock()
+        self.running = False
+
+    def start(self):
+        self.running = True
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.running = False
+        try:
+            self.server.shutdown(socket.SHUT_RDWR)  # wakes up the blocked accept()
+        except OSError:
+            pass
+        self.server.close()
+        with self.lock:
+            for subscriber in self.subscribers:
+                subscriber.close()
+            self.subscribers = []
+
+    def _accept_loop(self):
+        while self.running:
+            try:
+                connection, _ = self.server.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._handle_client, args=(connection,), daemon=True).start()
+
+    def _handle_client(self, connection):
+        try:
+            role = receive_exactly(connection, 1)
+        except ConnectionError:
+            connection.close()
+            return
+
+        if role == b"S":
+            with self.lock:
+                for frame in self.pending:
+                    send_frame(connection, frame)
+                self.pending = []
+                self.subscribers.append(connection)
+            return
+
+        try:
+            while self.running:
+                frame = receive_frame(connection)
+                with self.lock:
+                    if not self.subscribers:
+                        self.pending.append(frame)
+                    for subscriber in list(self.subscribers):
+                        try:
+                            send_frame(subscriber, frame)
+                        except OSError:
+                            self.subscribers.remove(subscriber)
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            connection.close()
+
+
+class SocketTransport:
+    """
+    Connection to a SocketBroker, either as a publisher or a subscriber.
+    The socket is opened lazily, so the transport can be created in one process and used in another.
+    """
+    def __init__(self, host="127.0.0.1", port=5557, role="publisher"):
+        if role not in ("publisher", "subscriber"):
+            raise ValueError(f"Unknown socket transport role: {role}")
+        self.host = host
+        self.port = port
+        self.role = role
+        self.sock = None
+
+    def _connect(self):
+        if self.sock is None:
+            self.sock = socket.create_connection((self.host, self.port))
+            self.sock.sendall(b"P" if self.role == "publisher" else b"S")
+        return self.sock
+
+    def send(self, batch):
+        send_frame(self._connect(), encode_batch(batch))
+
+    def receive(self, timeout=None):
+        sock = self._connect()
+        sock.settimeout(timeout)
+        try:
+            return decode_batch(receive_frame(sock))
+        except socket.timeout:
+            return None
+        finally:
+            sock.settimeout(None)
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+    def __getstate__(self):
+        return {**self.__dict__, "sock": None}
+
+
+class EventBus:
+    """
+    Batched publish / subscribe on top of a transport.
+
+    Producers call `publish` for every event and `flush` at natural boundaries (end of a game);
+    `close` marks the end of the stream for consumers. Consumers iterate `subscribe()` for batches
+    or `events()` for single events.
+    """
+    def __init__(self, transport=None, batch_size=256):
+        self.transport = transport if transport is not None else RingBufferTransport()
+        self.batch_size = batch_size
+        self.batch = []
+        self.closed = False
+
+    def publish(self, event):
+        batch = self.batch
+        batch.append(event)
+        if len(batch) >= self.batch_size:
+            self.flush()
+
+    def publish_batch(self, events):
+        self.batch.extend(events)
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.batch:
+            self.transport.send(self.batch)
+            self.batch = []
+
+    def close(self):
+        self.flush()
+        self.transport.send(END_OF_STREAM)
+
+    def receive_batch(self, timeout=None):
+        """
+        Returns the next batch of events, or an empty list if nothing arrived within `timeout`
+        or the stream has ended.
+        """
+        if self.closed:
+            return []
+        batch = self.transport.receive(timeout)
+        if batch is None:
+            return []
+        if batch == END_OF_STREAM:
+            self.closed = True
+            return []
+        return batch
+
+    def subscribe(self, timeout=None):
+        """
+        Yields batches until the producer closes the stream (or `timeout` passes without a batch).
+        """
+        while not self.closed:
+            batch = self.receive_batch(timeout)
+            if not batch:
+                if timeout is not None and not self.closed:
+                    return
+                continue
+            yield batch
+
+    def events(self, timeout=None):
+        for batch in self.subscribe(timeout):
+            yield from batch
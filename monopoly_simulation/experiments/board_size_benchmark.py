@@ -0,0 +1,93 @@
+"""
+Benchmark of the engine on boards of increasing size.
+
+Boards are laid out lazily, so building a board and playing a turn should cost the same on a board of
+20 fields and on one of 10^6 fields. For every board size the same number of games is played and the
+turns per second (board construction included) are reported; they should stay flat.
+A turn landing on a field for the first time places that field and costs a bit more, so small boards,
+where every field is placed after a few turns, run somewhat faster than large ones.
+
+Example:
+    python -m monopoly_simulation.experiments.board_size_benchmark --board_sizes 20 1000 100000 1000000
+"""
+import argparse
+import contextlib
+import os
+import random
+import time
+
+import pandas as pd
+
+from monopoly_simulation.player import create_player_from_type
+from monopoly_simulation.simualtion import Simulation, SimulationConfig
+
+
+def scaled_config(config, board_size):
+    """
+    Config with `board_size` fields and the same share of tax, chance and property fields as `config`.
+    """
+    fields = config.board_size - 1
+    tax_fields = round(config.tax_fields * (board_size - 1) / fields)
+    chance_fields = round(config.chance_fields * (board_size - 1) / fields)
+    return config.with_overrides(
+        board_size=board_size,
+        tax_fields=tax_fields,
+        chance_fields=chance_fields,
+        property_fields=board_size - 1 - tax_fields - chance_fields,
+    )
+
+
+def benchmark_board_size(config, board_size, num_games, seed=0):
+    board_config = scaled_config(config, board_size)
+    player = create_player_from_type(board_config.player_type, start_cash=board_config.start_cash)
+    simulation = Simulation(board_config, player)
+
+    turns = 0
+    start = time.perf_counter()
+    # The engine prints every turn
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for game_no in range(num_games):
+            random.seed(seed + game_no)
+            simulation.reset(seed + game_no)
+            turns += sum(1 for _ in simulation.iter_turns())
+    seconds = time.perf_counter() - start
+
+    return {
+        "Board Size": board_size,
+        "Games": num_games,
+        "Turns": turns,
+        "Seconds": round(seconds, 3),
+        "Turns/sec": round(turns / seconds),
+        "Fields Revealed (Last Game)": len(simulation.board.field_codes),
+    }
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Measure engine throughput for growing board sizes.")
+    parser.add_argument("--config_path", type=str, default=os.path.join("monopoly_simulation", "config", "default_config.yaml"))
+    parser.add_argument("--board_sizes", type=int, nargs="+", default=[20, 1000, 10000, 100000, 1000000])
+    parser.add_argument("--num_games", type=int, default=200, help="Games per board size")
+    parser.add_argument("--max_turns", type=int, default=250)
+    parser.add_argument("--player_type", type=str, default="always_buy", choices=["always_buy", "never_buy", "qlearning"])
+    parser.add_argument("--output", type=str, default=None, help="Optional CSV file for the results")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    config = SimulationConfig(args.config_path).with_overrides(player_type=args.player_type, max_turns=args.max_turns)
+
+    results = []
+    for board_size in args.board_sizes:
+        result = benchmark_board_size(config, board_size, args.num_games)
+        print(f"Board size {board_size}: {result['Turns/sec']} turns/sec")
+        results.append(result)
+
+    results_df = pd.DataFrame(results)
+    print(results_df.to_string(index=False))
+    if args.output:
+        results_df.to_csv(args.output, index=False)
+
+
+if __name__ == "__main__":
+    main()
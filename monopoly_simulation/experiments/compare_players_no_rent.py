@@ -16,6 +16,7 @@ def parse_arguments():
                         help="Number of games to simulate (default: 10000)")
     parser.add_argument("--max_turns", type=int, default=250,
                         help="Maximum number of turns per game (default: 250)")
+    add_adaptive_arguments(parser)
     return parser.parse_args()
 
 
@@ -28,10 +29,12 @@ def setup_simulations(config, args):
     ])
 
     for player_type in args.player_options:
-        config.start_cash = args.start_cash
-        config.player_type = player_type
-        config.max_turns = args.max_turns
-        config.property_rent =0
+        config = config.with_overrides(
+            start_cash=args.start_cash,
+            player_type=player_type,
+            max_turns=args.max_turns,
+            property_rent=0,
+        )
         
         
         print(f"Running simulation with player type: {player_type}")
@@ -82,18 +85,27 @@ def main():
     running_info.info(f"Running {args.num_games} games for player types: {args.player_options}...")
 
     
-    simulations = run_and_collect_results(simulations, args.num_games)
+    simulations = run_comparison(simulations, args)
 
-    game_stats_df, property_revenue_df, property_owned_df, player_cash_df = combine_results(simulations)
+    game_stats_df, property_revenue_df, property_owned_df, player_cash_trajectories = combine_results(simulations)
 
     
     running_info.success(f"Simulations completed. Total games played: {len(game_stats_df)}")
     
     st.write(simulations_info_df)
+    sequential_report_df = create_sequential_report_df(simulations, args.confidence)
+    if sequential_report_df is not None:
+        st.write("### Sequential Testing Report")
+        st.write(sequential_report_df)
+        st.caption(sequential_guarantee(simulations))
+    worker_utilization_df = create_worker_utilization_df(simulations)
+    if worker_utilization_df is not None:
+        st.write("### Worker Utilization")
+        st.write(worker_utilization_df)
     display_game_stats(game_stats_df)
-    display_cash_stats(player_cash_df)
-    display_property_revenue_stats(property_revenue_df)
-    display_property_ownership(property_owned_df)
+    display_cash_trajectory_stats(player_cash_trajectories)
+    plot_property_revenue(property_revenue_df)
+    plot_property_ownership(property_owned_df)
 
 
 if __name__ == "__main__":
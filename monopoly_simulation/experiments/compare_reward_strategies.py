@@ -16,6 +16,7 @@ def parse_arguments():
                         help="Number of games to simulate (default: 10000)")
     parser.add_argument("--max_turns", type=int, default=250,
                         help="Maximum number of turns per game (default: 250)")
+    add_adaptive_arguments(parser)
     return parser.parse_args()
 
 
@@ -28,10 +29,12 @@ def setup_simulations(config, args):
     ])
 
     for reward_strategy in args.reward_strategy_options:
-        config.start_cash = args.start_cash
-        config.player_type = "qlearning"
-        config.reward_strategy = reward_strategy.lower()
-        config.max_turns = args.max_turns
+        config = config.with_overrides(
+            start_cash=args.start_cash,
+            player_type="qlearning",
+            reward_strategy=reward_strategy.lower(),
+            max_turns=args.max_turns,
+        )
         
         print(f"Running simulation with reward strategy: {reward_strategy}")
 
@@ -72,7 +75,7 @@ def main():
     default_config_path = os.path.join("monopoly_simulation", "config", "default_config.yaml")
     config = load_config_and_validate(default_config_path)
 
-    config.player_type = 'qlearning'
+    config = config.with_overrides(player_type='qlearning')
 
     simulations, simulations_info_df = setup_simulations(config, args)
     
@@ -83,17 +86,26 @@ def main():
     running_info.info(f"Running {args.num_games} games for QLearning Agent with reward strategies: {args.reward_strategy_options}...")
 
     
-    simulations = run_and_collect_results(simulations, args.num_games)
+    simulations = run_comparison(simulations, args)
 
-    game_stats_df, property_revenue_df, property_owned_df, player_cash_df = combine_results(simulations)
+    game_stats_df, property_revenue_df, property_owned_df, player_cash_trajectories = combine_results(simulations)
     
     running_info.success(f"Simulations completed. Total games played: {len(game_stats_df)}")
 
     st.write(simulations_info_df)
+    sequential_report_df = create_sequential_report_df(simulations, args.confidence)
+    if sequential_report_df is not None:
+        st.write("### Sequential Testing Report")
+        st.write(sequential_report_df)
+        st.caption(sequential_guarantee(simulations))
+    worker_utilization_df = create_worker_utilization_df(simulations)
+    if worker_utilization_df is not None:
+        st.write("### Worker Utilization")
+        st.write(worker_utilization_df)
     display_game_stats(game_stats_df)
-    display_cash_stats(player_cash_df)
-    display_property_revenue_stats(property_revenue_df)
-    display_property_ownership(property_owned_df)
+    display_cash_trajectory_stats(player_cash_trajectories)
+    plot_property_revenue(property_revenue_df)
+    plot_property_ownership(property_owned_df)
 
 if __name__ == "__main__":
     main()
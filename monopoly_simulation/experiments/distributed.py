@@ -0,0 +1,413 @@
+"""
+Coordinator / worker mode for large experiment sweeps.
+
+The coordinator splits every simulation of a sweep (start cash x property rent x player type)
+into game shards and publishes them to a job broker backed by a SQLite file.
+Workers on any host with access to the file claim shards, run them and push back
+mergeable aggregates. A claimed shard is leased to its worker; if the worker dies and stops
+renewing the lease, the shard is handed out again. Workers only exit once no shard is pending or
+running, and the coordinator also returns expired shards to the queue and restarts its local workers,
+so shards of dead workers are retried even when no other worker is left.
+
+Example on one machine:
+    python -m monopoly_simulation.experiments.distributed coordinator --broker sweep.db --local_workers 4
+    python -m monopoly_simulation.experiments.distributed worker --broker sweep.db   # extra workers, any host
+"""
+import argparse
+import multiprocessing
+import os
+import pickle
+import socket
+import sqlite3
+import time
+import uuid
+
+import pandas as pd
+
+from monopoly_simulation.player import QLearningPlayer, create_player_from_type
+from monopoly_simulation.simualtion import Simulation, SimulationConfig
+from monopoly_simulation.experiments.shards import make_shards, run_shard
+
+
+class SQLiteJobBroker:
+    """
+    Shard queue stored in a SQLite file. Every method opens its own short transaction,
+    so any number of coordinator and worker processes can share the file.
+    """
+    def __init__(self, path, lease_seconds=120, max_attempts=3):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.connection = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS shards (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id TEXT NOT NULL,
+                simulation_title TEXT NOT NULL,
+                payload BLOB NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                worker_id TEXT,
+                lease_expires REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                result BLOB,
+                error TEXT
+            )
+        """)
+        self.connection.execute("CREATE INDEX IF NOT EXISTS shards_status ON shards (status, lease_expires)")
+
+    def close(self):
+        self.connection.close()
+
+    def publish(self, job_id, shards):
+        self.connection.execute("BEGIN IMMEDIATE")
+        self.connection.executemany(
+            "INSERT INTO shards (job_id, simulation_title, payload) VALUES (?, ?, ?)",
+            [(job_id, shard["simulation_title"], pickle.dumps(shard)) for shard in shards]
+        )
+        self.connection.execute("COMMIT")
+
+    def claim(self, worker_id):
+        """
+        Leases the next pending shard (or a shard whose lease expired) to the worker.
+        Returns (shard_id, shard) or None if there is nothing to do right now.
+        """
+        now = time.time()
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            self._reclaim_expired(now)
+            row = self.connection.execute(
+                "SELECT id, payload FROM shards WHERE status = 'pending' ORDER BY id LIMIT 1"
+            ).fetchone()
+            if row is None:
+                self.connection.execute("COMMIT")
+                return None
+            self.connection.execute(
+                "UPDATE shards SET status = 'running', worker_id = ?, lease_expires = ?, attempts = attempts + 1 "
+                "WHERE id = ?",
+                (worker_id, now + self.lease_seconds, row[0])
+            )
+            self.connection.execute("COMMIT")
+        except Exception:
+            self.connection.execute("ROLLBACK")
+            raise
+        return row[0], pickle.loads(row[1])
+
+    def _reclaim_expired(self, now):
+        # Shards of dead workers that were already retried too many times are given up,
+        # the others go back to the queue
+        self.connection.execute(
+            "UPDATE shards SET status = 'failed', error = 'Lease expired too many times', lease_expires = NULL "
+            "WHERE status = 'running' AND lease_expires < ? AND attempts >= ?",
+            (now, self.max_attempts)
+        )
+        self.connection.execute(
+            "UPDATE shards SET status = 'pending', error = 'Lease expired', lease_expires = NULL "
+            "WHERE status = 'running' AND lease_expires < ?",
+            (now,)
+        )
+
+    def reclaim_expired(self):
+        """
+        Returns shards whose lease expired to the queue (or marks them failed after `max_attempts`).
+        """
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            self._reclaim_expired(time.time())
+            self.connection.execute("COMMIT")
+        except Exception:
+            self.connection.execute("ROLLBACK")
+            raise
+
+    def unfinished(self, job_id=None):
+        """
+        Number of pending or running shards (of one job, or of all jobs).
+        """
+        query = "SELECT COUNT(*) FROM shards WHERE status IN ('pending', 'running')"
+        if job_id is None:
+            return self.connection.execute(query).fetchone()[0]
+        return self.connection.execute(query + " AND job_id = ?", (job_id,)).fetchone()[0]
+
+    def fail_unfinished(self, job_id, error):
+        """
+        Marks all pending or running shards of a job failed, e.g. when the coordinator gives up on it.
+        """
+        self.connection.execute(
+            "UPDATE shards SET status = 'failed', error = ?, lease_expires = NULL "
+            "WHERE job_id = ? AND status IN ('pending', 'running')",
+            (error, job_id)
+        )
+
+    def renew_lease(self, shard_id, worker_id):
+        self.connection.execute(
+            "UPDATE shards SET lease_expires = ? WHERE id = ? AND worker_id = ? AND status = 'running'",
+            (time.time() + self.lease_seconds, shard_id, worker_id)
+        )
+
+    def complete(self, shard_id, worker_id, aggregate):
+        """
+        Stores the result of a shard. Results of a worker that lost its lease are ignored.
+        """
+        cursor = self.connection.execute(
+            "UPDATE shards SET status = 'done', result = ?, lease_expires = NULL, error = NULL "
+            "WHERE id = ? AND worker_id = ? AND status = 'running'",
+            (pickle.dumps(aggregate), shard_id, worker_id)
+        )
+        return cursor.rowcount == 1
+
+    def fail(self, shard_id, worker_id, error):
+        """
+        Returns a shard to the queue after an error, or marks it failed after `max_attempts`.
+        """
+        self.connection.execute(
+            "UPDATE shards SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+            "error = ?, lease_expires = NULL WHERE id = ? AND worker_id = ?",
+            (self.max_attempts, error, shard_id, worker_id)
+        )
+
+    def progress(self, job_id):
+        rows = self.connection.execute(
+            "SELECT status, COUNT(*) FROM shards WHERE job_id = ? GROUP BY status", (job_id,)
+        ).fetchall()
+        return dict(rows)
+
+    def results(self, job_id):
+        """
+        Aggregates of all finished shards of a job merged per simulation title.
+        """
+        merged = {}
+        for title, result in self.connection.execute(
+            "SELECT simulation_title, result FROM shards WHERE job_id = ? AND status = 'done' ORDER BY id", (job_id,)
+        ):
+            aggregate = pickle.loads(result)
+            if title in merged:
+                merged[title].merge(aggregate)
+            else:
+                merged[title] = aggregate
+        return merged
+
+
+def run_worker(broker_path, worker_id=None, idle_timeout=10.0, poll_interval=0.5, lease_seconds=120, max_attempts=3):
+    """
+    Claims and runs shards until no shard is pending or running any more for `idle_timeout` seconds.
+    While shards of other workers are running the worker keeps polling, so it can take them over
+    if their worker dies and the lease expires.
+    """
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+    broker = SQLiteJobBroker(broker_path, lease_seconds=lease_seconds, max_attempts=max_attempts)
+    print(f"Worker {worker_id} started")
+
+    idle_since = time.time()
+    shards_done = 0
+    try:
+        while True:
+            claimed = broker.claim(worker_id)
+            if claimed is None:
+                if broker.unfinished():
+                    idle_since = time.time()
+                elif time.time() - idle_since > idle_timeout:
+                    break
+                time.sleep(poll_interval)
+                continue
+
+            shard_id, shard = claimed
+            print(f"Worker {worker_id} running shard {shard_id} ({shard['simulation_title']}, seeds {shard['seed_start']}+{shard['num_games']})")
+            last_renewal = time.time()
+
+            def renew_lease(games_done):
+                nonlocal last_renewal
+                if time.time() - last_renewal > lease_seconds / 3:
+                    broker.renew_lease(shard_id, worker_id)
+                    last_renewal = time.time()
+
+            try:
+                aggregate = run_shard(shard, progress_callback=renew_lease)
+            except Exception as e:
+                broker.fail(shard_id, worker_id, repr(e))
+                print(f"Worker {worker_id} failed shard {shard_id}: {e!r}")
+            else:
+                broker.complete(shard_id, worker_id, aggregate)
+                shards_done += 1
+            idle_since = time.time()
+    finally:
+        broker.close()
+
+    print(f"Worker {worker_id} finished after {shards_done} shards")
+    return shards_done
+
+
+def build_sweep(config, player_types, start_cash_options, property_rent_options, train_games=0):
+    """
+    Creates one (title, config, player) entry per combination of the sweep.
+    QLearning players are trained locally by the coordinator before being snapshotted into shards.
+    """
+    sweep = []
+    for player_type in player_types:
+        for start_cash in start_cash_options:
+            for property_rent in property_rent_options:
+                simulation_config = config.with_overrides(
+                    player_type=player_type,
+                    start_cash=start_cash,
+                    property_rent=property_rent,
+                )
+
+                player = create_player_from_type(
+                    player_type=player_type,
+                    start_cash=start_cash,
+                    alpha=simulation_config.alpha,
+                    gamma=simulation_config.gamma,
+                    epsilon=simulation_config.epsilon,
+                    reward_strategy=simulation_config.reward_strategy
+                )
+                if isinstance(player, QLearningPlayer):
+                    simulation = Simulation(simulation_config, player)
+                    # Only the player's learning matters, so no turn record is built
+                    for _ in range(train_games):
+                        simulation.reset()
+                        simulation.observe()
+                    player.eval_mode()
+                player.reset(start_cash)
+
+                title = f"Player: {player_type}, Start Cash: {start_cash}, Rent: {property_rent}"
+                sweep.append((title, simulation_config, player))
+    return sweep
+
+
+def run_coordinator(
+    broker_path,
+    config,
+    player_types,
+    start_cash_options,
+    property_rent_options,
+    num_games,
+    shard_size=1000,
+    train_games=0,
+    local_workers=0,
+    poll_interval=1.0,
+    lease_seconds=120,
+    max_attempts=3,
+    timeout=6 * 3600):
+    """
+    Publishes the shards of a sweep, optionally starts local worker processes,
+    waits until every shard is done or failed and returns a summary DataFrame and the merged aggregates.
+    While waiting, expired leases are reclaimed and local workers that died are restarted.
+    Shards still unfinished after `timeout` seconds are marked failed.
+    """
+    broker = SQLiteJobBroker(broker_path, lease_seconds=lease_seconds, max_attempts=max_attempts)
+    job_id = uuid.uuid4().hex
+
+    shards = []
+    for title, simulation_config, player in build_sweep(config, player_types, start_cash_options, property_rent_options, train_games):
+        shards.extend(make_shards(title, simulation_config, player, num_games, shard_size))
+    broker.publish(job_id, shards)
+    print(f"Published {len(shards)} shards for job {job_id}")
+
+    def start_worker():
+        worker = multiprocessing.Process(
+            target=run_worker,
+            args=(broker_path,),
+            kwargs={"lease_seconds": lease_seconds, "max_attempts": max_attempts},
+        )
+        worker.start()
+        return worker
+
+    workers = [start_worker() for _ in range(local_workers)]
+
+    deadline = time.time() + timeout
+    while True:
+        broker.reclaim_expired()
+        progress = broker.progress(job_id)
+        finished = progress.get("done", 0) + progress.get("failed", 0)
+        print(f"Job {job_id}: {progress}")
+        if finished == len(shards):
+            break
+        if time.time() > deadline:
+            print(f"Job {job_id} did not finish within {timeout} seconds, giving up on its remaining shards.")
+            broker.fail_unfinished(job_id, "Coordinator deadline reached")
+            progress = broker.progress(job_id)
+            break
+        for i, worker in enumerate(workers):
+            if not worker.is_alive():
+                print(f"Local worker {worker.pid} exited with code {worker.exitcode}, restarting it")
+                workers[i] = start_worker()
+        time.sleep(poll_interval)
+
+    for worker in workers:
+        worker.join(timeout=30)
+        if worker.is_alive():
+            worker.terminate()
+            worker.join()
+
+    aggregates = broker.results(job_id)
+    broker.close()
+    if progress.get("failed", 0):
+        print(f"Warning: {progress['failed']} shards failed and are missing from the results.")
+
+    summary_df = pd.DataFrame([aggregate.summary(title) for title, aggregate in aggregates.items()])
+    return summary_df, aggregates
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Run Monopoly experiment sweeps on several workers through a job broker.")
+    subparsers = parser.add_subparsers(dest="mode", required=True)
+
+    coordinator = subparsers.add_parser("coordinator", help="Publish a sweep and collect its results.")
+    coordinator.add_argument("--broker", type=str, default="monopoly_jobs.db", help="Path to the SQLite job broker file.")
+    coordinator.add_argument("--config_path", type=str, default=os.path.join("monopoly_simulation", "config", "default_config.yaml"))
+    coordinator.add_argument("--player_types", type=str, nargs="+", default=["always_buy", "never_buy", "qlearning"])
+    coordinator.add_argument("--start_cash_options", type=int, nargs="+", default=[1000, 1500, 2000])
+    coordinator.add_argument("--property_rent_options", type=int, nargs="+", default=[0, 50])
+    coordinator.add_argument("--num_games", type=int, default=10000, help="Number of games per simulation of the sweep.")
+    coordinator.add_argument("--max_turns", type=int, default=250)
+    coordinator.add_argument("--shard_size", type=int, default=1000, help="Games per shard.")
+    coordinator.add_argument("--train_games", type=int, default=10000, help="Games used to train QLearning players before evaluation.")
+    coordinator.add_argument("--local_workers", type=int, default=0, help="Worker processes started on this machine.")
+    coordinator.add_argument("--lease_seconds", type=float, default=120, help="Seconds after which a shard of a silent worker is retried.")
+    coordinator.add_argument("--max_attempts", type=int, default=3, help="Attempts per shard before it is marked failed.")
+    coordinator.add_argument("--timeout", type=float, default=6 * 3600, help="Seconds after which unfinished shards are marked failed.")
+    coordinator.add_argument("--output", type=str, default=None, help="Optional path of a pickle file for the merged aggregates.")
+
+    worker = subparsers.add_parser("worker", help="Run shards published to the broker.")
+    worker.add_argument("--broker", type=str, default="monopoly_jobs.db", help="Path to the SQLite job broker file.")
+    worker.add_argument("--idle_timeout", type=float, default=10.0, help="Exit after no shard was pending or running for this many seconds.")
+    worker.add_argument("--lease_seconds", type=float, default=120)
+    worker.add_argument("--max_attempts", type=int, default=3)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+
+    if args.mode == "worker":
+        run_worker(args.broker, idle_timeout=args.idle_timeout, lease_seconds=args.lease_seconds, max_attempts=args.max_attempts)
+        return
+
+    if not os.path.exists(args.config_path):
+        raise FileNotFoundError(f"Configuration file '{args.config_path}' does not exist.")
+    config = SimulationConfig(args.config_path).with_overrides(max_turns=args.max_turns)
+
+    start = time.time()
+    summary_df, aggregates = run_coordinator(
+        broker_path=args.broker,
+        config=config,
+        player_types=args.player_types,
+        start_cash_options=args.start_cash_options,
+        property_rent_options=args.property_rent_options,
+        num_games=args.num_games,
+        shard_size=args.shard_size,
+        train_games=args.train_games,
+        local_workers=args.local_workers,
+        lease_seconds=args.lease_seconds,
+        max_attempts=args.max_attempts,
+        timeout=args.timeout,
+    )
+    print(summary_df.to_string(index=False))
+    print(f"Sweep completed in {time.time() - start:.2f} seconds.")
+
+    if args.output:
+        with open(args.output, "wb") as f:
+            pickle.dump(aggregates, f)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,39 @@
+import math
 import os
 import time
 import concurrent.futures
 import pandas as pd
 
-from monopoly_simulation.player import QLearningPlayer
+from monopoly_simulation.player import QLearningPlayer, create_player_from_type
+from monopoly_simulation.event_bus import EventBus
 from monopoly_simulation.simualtion import Simulation, SimulationConfig
+from monopoly_simulation.game_logs import GameLogSampler, bankrupt_before
 from monopoly_simulation.experiments.stat_utils import (
     create_game_stats_df,
     create_property_revenue_stats_df,
     create_property_ownership_stats_df,
-    create_player_cash_stats_df
+    PROPERTY_REVENUE_EVENTS,
+    PROPERTY_OWNERSHIP_EVENTS,
+    PROPERTY_EVENT_FIELDS,
 )
+from monopoly_simulation.experiments.sequential_testing import ArmStats, stopping_reason, corrected_confidence, guarantee_note
+from monopoly_simulation.experiments.trajectory_stats import CashTrajectoryStats
+from monopoly_simulation.experiments.scheduler import ArmProgress, GuidedScheduler
+from monopoly_simulation.experiments.worker_pool import shared_executor
+
+REPORT_COLUMNS = [
+    "simulation_title",
+    "game_no",
+    "turn",
+    "player_position",
+    "player_cash",
+    "properties_owned",
+    "event",
+    "description",
+    "amount",
+    "end_game_status"
+]
+
 
 def load_config_and_validate(default_config_path):
     if not os.path.exists(default_config_path):
@@ -20,17 +43,18 @@ def load_config_and_validate(default_config_path):
 def run_multiple_simulations_with_report(
     num_games: int,
     simulation: Simulation,
-    simulation_title: str = f"Simulation_{time.time()}"):
+    simulation_title: str = f"Simulation_{time.time()}",
+    first_game_no: int = 0,
+    cash_trajectory: CashTrajectoryStats = None):
     
     report = []
-    for i in range(num_games):
-        print(f"\n\nRunning simulation {i + 1}/{num_games}\n")
-        simulation.run()
-        
-        # Collecting game run info
+    for i in range(first_game_no, first_game_no + num_games):
+        print(f"\n\nRunning simulation {i + 1}/{first_game_no + num_games}\n")
+        # Collecting game run info, turn by turn as the game is played
+        for turn_outcome in simulation.iter_turns():
 
-        while simulation.turn_outcomes_queue:
-            turn_outcome = simulation.turn_outcomes_queue.popleft()
+            if cash_trajectory is not None:
+                cash_trajectory.add_turn_outcome(turn_outcome)
             
             # Collecting the outcome for the report
             report.append({
@@ -43,20 +67,116 @@ def run_multiple_simulations_with_report(
         # Resetting the simulation for the next run
         simulation.reset()
     
-    return pd.DataFrame(
-        report, 
-        columns=[
-            "simulation_title",
-            "game_no",
-            "turn",
-            "player_position",
-            "player_cash",
-            "properties_owned",
-            "event",
-            "description",
-            "amount",
-            "end_game_status"]
-        )
+    return pd.DataFrame(report, columns=REPORT_COLUMNS)
+
+
+def train_simulation(num_games: int, simulation: Simulation):
+    """
+    Plays games only for their effect on the player (e.g. training a QLearning player).
+    Nothing subscribes to the turns, so no turn record is built.
+    """
+    for i in range(num_games):
+        print(f"\n\nRunning training game {i + 1}/{num_games}\n")
+        simulation.observe()
+        simulation.reset()
+
+
+def collect_event_records(
+    num_games: int,
+    simulation: Simulation,
+    events,
+    fields,
+    simulation_title: str = f"Simulation_{time.time()}",
+    first_game_no: int = 0):
+    """
+    Plays games and collects only the turns of the given event kinds with the given fields, as a report
+    with the columns simulation_title, game_no and `fields`. Records of other turns are never built.
+    """
+    records = []
+    game_no = first_game_no
+
+    def collect(record):
+        record["simulation_title"] = simulation_title
+        record["game_no"] = game_no
+        records.append(record)
+
+    subscription = simulation.subscribe(collect, events, fields)
+    try:
+        for game_no in range(first_game_no, first_game_no + num_games):
+            simulation.observe()
+            simulation.reset()
+    finally:
+        simulation.unsubscribe(subscription)
+
+    return pd.DataFrame(records, columns=["simulation_title", "game_no", *fields])
+
+
+def collect_property_stats(num_games: int, simulation: Simulation, simulation_title: str):
+    """
+    Property revenue and ownership of `num_games` games, built from rent payments and purchases only.
+    """
+    turn_outcomes = collect_event_records(
+        num_games,
+        simulation,
+        PROPERTY_REVENUE_EVENTS + PROPERTY_OWNERSHIP_EVENTS,
+        PROPERTY_EVENT_FIELDS,
+        simulation_title,
+    )
+    return {
+        "property_revenue_df": create_property_revenue_stats_df(turn_outcomes),
+        "property_owned_df": create_property_ownership_stats_df(turn_outcomes),
+    }
+
+
+def publish_simulation_games(num_games: int, simulation: Simulation):
+    """
+    Producer side of an event bus run: plays games and publishes all turn outcomes
+    to `simulation.event_bus`, then closes the stream.
+    """
+    for i in range(num_games):
+        print(f"\n\nRunning simulation {i + 1}/{num_games}\n")
+        simulation.run()
+        simulation.reset()
+    simulation.event_bus.close()
+
+
+def publish_games_worker(config, num_games, transport, batch_size=256):
+    """
+    Target for a separate process (or host) publishing games of one simulation through `transport`.
+    """
+    player = create_player_from_type(
+        player_type=config.player_type,
+        start_cash=config.start_cash,
+        alpha=config.alpha,
+        gamma=config.gamma,
+        epsilon=config.epsilon,
+        reward_strategy=config.reward_strategy
+    )
+    simulation = Simulation(config, player, EventBus(transport, batch_size))
+    publish_simulation_games(num_games, simulation)
+
+
+def collect_report_from_event_bus(
+    event_bus: EventBus,
+    simulation_title: str,
+    first_game_no: int = 0,
+    cash_trajectory: CashTrajectoryStats = None,
+    timeout: float = None):
+    """
+    Consumer side of an event bus run: builds the same report as `run_multiple_simulations_with_report`
+    from the turn outcome value tuples of a single producer. Games are numbered by their end game events.
+    """
+    report = []
+    game_no = first_game_no
+    for batch in event_bus.subscribe(timeout):
+        if cash_trajectory is not None:
+            cash_trajectory.add_turn_log(batch)
+        for values in batch:
+            report.append((simulation_title, game_no, *values))
+            if values[7] is not None:  # end_game_status
+                game_no += 1
+
+    return pd.DataFrame(report, columns=REPORT_COLUMNS)
     
 
 
@@ -67,19 +187,16 @@ def process_simulation(sim, num_games):
 
     # If QLearningPlayer is used tarin it first
     if isinstance(simulation.player, QLearningPlayer):
-        run_multiple_simulations_with_report(
-        num_games=num_games,
-        simulation=simulation,
-        simulation_title=simulation_title,
-        )
+        train_simulation(num_games, simulation)
         simulation.player.eval_mode()
 
         
-    
+    cash_trajectory = CashTrajectoryStats(simulation.config.max_turns)
     turn_outcomes = run_multiple_simulations_with_report(
         num_games=num_games,
         simulation=simulation,
         simulation_title=simulation_title,
+        cash_trajectory=cash_trajectory,
     )
 
     return {
@@ -87,17 +204,290 @@ def process_simulation(sim, num_games):
         "game_stats_df": create_game_stats_df(turn_outcomes),
         "property_revenue_df": create_property_revenue_stats_df(turn_outcomes),
         "property_owned_df": create_property_ownership_stats_df(turn_outcomes),
-        "player_cash_df": create_player_cash_stats_df(turn_outcomes),
+        "player_cash_trajectory": cash_trajectory,
     }
 
-def run_and_collect_results(simulations, num_games):
+def process_simulation_with_log_sample(sim, num_games, log_sample_size, keep_log=None):
+    """
+    Like `process_simulation`, but keeping full turn logs only for a reservoir sample of `log_sample_size`
+    games and the games matching `keep_log`. Game stats come from the summaries of all games and property
+    stats from the rent payments and purchases of all games; the cash trajectory is built from the
+    sampled games, so its cost is bounded by the sample size.
+    """
+    simulation = sim["simulation"]
+    simulation_title = sim["title"]
+
+    if isinstance(simulation.player, QLearningPlayer):
+        train_simulation(num_games, simulation)
+        simulation.player.eval_mode()
+
+    log_sampler = GameLogSampler(log_sample_size, keep_log)
+    property_events = []
+
+    def collect_property_event(record):
+        record["simulation_title"] = simulation_title
+        record["game_no"] = log_sampler.games - 1
+        property_events.append(record)
+
+    subscription = simulation.subscribe(
+        collect_property_event,
+        PROPERTY_REVENUE_EVENTS + PROPERTY_OWNERSHIP_EVENTS,
+        PROPERTY_EVENT_FIELDS,
+    )
+    try:
+        simulation.play_games(num_games, log_sampler)
+    finally:
+        simulation.unsubscribe(subscription)
+    property_events = pd.DataFrame(property_events, columns=["simulation_title", "game_no", *PROPERTY_EVENT_FIELDS])
+
+    cash_trajectory = CashTrajectoryStats(simulation.config.max_turns)
+    for _, turn_log in log_sampler.sampled_games():
+        cash_trajectory.add_turn_log(turn_log)
+
+    return {
+        **sim,
+        "game_stats_df": log_sampler.summary_df(simulation_title),
+        "property_revenue_df": create_property_revenue_stats_df(property_events),
+        "property_owned_df": create_property_ownership_stats_df(property_events),
+        "player_cash_trajectory": cash_trajectory,
+        "sampled_turn_outcomes_df": log_sampler.sampled_turn_outcomes_df(simulation_title),
+        "kept_turn_outcomes_df": log_sampler.kept_turn_outcomes_df(simulation_title),
+    }
+
+def run_and_collect_results(simulations, num_games, log_sample_size=None, keep_log=None):
+    """
+    Plays `num_games` games of every simulation on a thread pool.
+    With a `log_sample_size` only a sample of the games (plus those matching `keep_log`) keep turn logs.
+    """
     results = []
 
     with concurrent.futures.ThreadPoolExecutor() as executor:
-        futures = [executor.submit(process_simulation, sim, num_games) for sim in simulations]
+        if log_sample_size is None:
+            futures = [executor.submit(process_simulation, sim, num_games) for sim in simulations]
+        else:
+            futures = [
+                executor.submit(process_simulation_with_log_sample, sim, num_games, log_sample_size, keep_log)
+                for sim in simulations
+            ]
         for future in concurrent.futures.as_completed(futures):
             results.append(future.result())
 
     return results
 
 
+def add_adaptive_arguments(parser):
+    """
+    Adds the sequential testing and parallel execution options shared by all comparison scripts.
+    """
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes used to play the games, with load balancing across simulations (default: 1). "
+                             "Ignored in adaptive mode.")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="Play games in batches and stop each simulation once its results are statistically decided. "
+                             "--num_games becomes the upper limit of games per simulation.")
+    parser.add_argument("--batch_size", type=int, default=200,
+                        help="Games played per simulation between stopping checks in adaptive mode (default: 200)")
+    parser.add_argument("--confidence", type=float, default=0.95,
+                        help="Confidence level in adaptive mode, held simultaneously by all intervals of all simulations "
+                             "over all stopping checks (default: 0.95)")
+    parser.add_argument("--win_rate_precision", type=float, default=0.02,
+                        help="Target half width of the win rate interval in adaptive mode (default: 0.02)")
+    parser.add_argument("--turns_precision", type=float, default=5.0,
+                        help="Target half width of the average turns before bankruptcy interval in adaptive mode (default: 5)")
+    parser.add_argument("--log_sample_size", type=int, default=None,
+                        help="Keep turn logs only for a uniform sample of this many games per simulation and summaries "
+                             "for all others (default: keep all turn logs). Ignored in adaptive and multi-worker mode.")
+    parser.add_argument("--keep_logs_bankrupt_before", type=int, default=None,
+                        help="With --log_sample_size, also keep the turn logs of every game lost before this turn.")
+    return parser
+
+
+def run_comparison(simulations, args):
+    """
+    Runs the comparison with a fixed number of games, adaptively if `--adaptive` was passed,
+    or on a load balanced process pool if more than one worker was requested.
+    """
+    if getattr(args, "adaptive", False):
+        return run_adaptive_and_collect_results(
+            simulations,
+            max_games=args.num_games,
+            batch_size=args.batch_size,
+            confidence=args.confidence,
+            win_rate_precision=args.win_rate_precision,
+            turns_precision=args.turns_precision,
+        )
+    if getattr(args, "workers", 1) > 1:
+        # Reruns of the report page reuse the warm worker pool of the Streamlit server
+        executor = shared_executor(args.workers)
+        return run_balanced_and_collect_results(simulations, args.num_games, args.workers, executor)
+    keep_turns = getattr(args, "keep_logs_bankrupt_before", None)
+    return run_and_collect_results(
+        simulations,
+        args.num_games,
+        log_sample_size=getattr(args, "log_sample_size", None),
+        keep_log=bankrupt_before(keep_turns) if keep_turns is not None else None,
+    )
+
+
+def run_balanced_and_collect_results(simulations, num_games, workers=None, executor=None):
+    """
+    Plays `num_games` games of every simulation on a process pool using the guided self-scheduling
+    GuidedScheduler, so simulations with long games do not leave workers idle at the end of the run.
+    QLearning players are trained in this process first and shipped to workers as snapshots.
+    """
+    with concurrent.futures.ThreadPoolExecutor() as training_executor:
+        training = [
+            training_executor.submit(train_simulation, num_games, sim["simulation"])
+            for sim in simulations if isinstance(sim["simulation"].player, QLearningPlayer)
+        ]
+        concurrent.futures.wait(training)
+    for sim in simulations:
+        if isinstance(sim["simulation"].player, QLearningPlayer):
+            sim["simulation"].player.eval_mode()
+
+    arms = [
+        ArmProgress(sim["title"], sim["simulation"].config, sim["simulation"].player, num_games)
+        for sim in simulations
+    ]
+    aggregates, utilization_df = GuidedScheduler(workers).run(arms, executor)
+
+    results = []
+    for sim in simulations:
+        aggregate = aggregates[sim["title"]]
+        results.append({
+            **sim,
+            "game_stats_df": aggregate.game_stats_df(sim["title"]),
+            "property_revenue_agg_df": aggregate.property_revenue_agg_df(sim["title"]),
+            "property_owned_agg_df": aggregate.property_owned_agg_df(sim["title"]),
+            "player_cash_trajectory": aggregate.cash_trajectory,
+            "worker_utilization_df": utilization_df,
+        })
+    return results
+
+
+def create_worker_utilization_df(simulations):
+    """
+    Per worker utilization of a load balanced run, or None for other runs.
+    """
+    for sim in simulations:
+        if sim.get("worker_utilization_df") is not None:
+            return sim["worker_utilization_df"]
+    return None
+
+
+def run_adaptive_and_collect_results(
+    simulations,
+    max_games,
+    batch_size=200,
+    confidence=0.95,
+    win_rate_precision=0.02,
+    turns_precision=5.0):
+    """
+    Plays games in batches for every simulation and stops each one separately
+    once its win rate and turns before bankruptcy are known precisely enough
+    or its win rate is clearly separated from all other simulations.
+    QLearning players are still trained for `max_games` games before evaluation starts.
+    `confidence` holds simultaneously for all intervals at every check (see `corrected_confidence`).
+    """
+    max_looks = math.ceil(max_games / batch_size)
+    interval_confidence = corrected_confidence(confidence, len(simulations), max_looks)
+    arms = {sim["title"]: ArmStats() for sim in simulations}
+    turn_outcomes = {sim["title"]: [] for sim in simulations}
+    cash_trajectories = {sim["title"]: CashTrajectoryStats(sim["simulation"].config.max_turns) for sim in simulations}
+    stopped_by = {}
+
+    with concurrent.futures.ThreadPoolExecutor() as executor:
+
+        # Training phase of QLearning players is not part of sequential testing
+        training = [
+            executor.submit(train_simulation, max_games, sim["simulation"])
+            for sim in simulations if isinstance(sim["simulation"].player, QLearningPlayer)
+        ]
+        concurrent.futures.wait(training)
+        for sim in simulations:
+            if isinstance(sim["simulation"].player, QLearningPlayer):
+                sim["simulation"].player.eval_mode()
+
+        active = list(simulations)
+        while active:
+            futures = {
+                executor.submit(
+                    run_multiple_simulations_with_report,
+                    min(batch_size, max_games - arms[sim["title"]].games),
+                    sim["simulation"],
+                    sim["title"],
+                    arms[sim["title"]].games,
+                    cash_trajectories[sim["title"]],
+                ): sim
+                for sim in active
+            }
+            for future in concurrent.futures.as_completed(futures):
+                sim = futures[future]
+                batch = future.result()
+                turn_outcomes[sim["title"]].append(batch)
+                arms[sim["title"]].add_game_stats(create_game_stats_df(batch))
+
+            # Stopping checks are done after the whole round so every arm is compared with the same data
+            for sim in list(active):
+                reason = stopping_reason(
+                    sim["title"], arms, max_games,
+                    confidence=interval_confidence,
+                    win_rate_precision=win_rate_precision,
+                    turns_precision=turns_precision,
+                    min_games=min(batch_size, max_games),
+                )
+                if reason is not None:
+                    print(f"Stopping {sim['title']} after {arms[sim['title']].games} games: {reason}")
+                    stopped_by[sim["title"]] = reason
+                    active.remove(sim)
+
+    results = []
+    for sim in simulations:
+        outcomes = pd.concat(turn_outcomes[sim["title"]], ignore_index=True)
+        results.append({
+            **sim,
+            "game_stats_df": create_game_stats_df(outcomes),
+            "property_revenue_df": create_property_revenue_stats_df(outcomes),
+            "property_owned_df": create_property_ownership_stats_df(outcomes),
+            "player_cash_trajectory": cash_trajectories[sim["title"]],
+            "arm_stats": arms[sim["title"]],
+            "stopped_by": stopped_by[sim["title"]],
+            "interval_confidence": interval_confidence,
+            "guarantee": guarantee_note(confidence, interval_confidence, len(simulations), max_looks),
+        })
+    return results
+
+
+def create_sequential_report_df(simulations, confidence=0.95):
+    """
+    Summarizes the intervals and the number of games actually used by each simulation in adaptive mode.
+    Returns None for results of a fixed size run.
+    """
+    rows = []
+    for sim in simulations:
+        arm_stats = sim.get("arm_stats")
+        if arm_stats is None:
+            return None
+        interval_confidence = sim.get("interval_confidence", confidence)
+        win_low, win_high = arm_stats.win_rate_interval(interval_confidence)
+        turns_low, turns_high = arm_stats.bankrupt_turns_interval(interval_confidence)
+        rows.append({
+            "Simulation Title": sim["title"],
+            "Games Played": arm_stats.games,
+            "Win Rate": arm_stats.win_rate,
+            "Win Rate CI Low": win_low,
+            "Win Rate CI High": win_high,
+            "Avg Turns Before Bankruptcy": arm_stats.avg_turns_before_bankruptcy,
+            "Turns CI Low": turns_low,
+            "Turns CI High": turns_high,
+            "Stopped By": sim["stopped_by"],
+            "Interval Confidence": interval_confidence,
+        })
+    return pd.DataFrame(rows)
+
+
+def sequential_guarantee(simulations):
+    """
+    Error guarantee of an adaptive run, or None for results of a fixed size run.
+    """
+    return simulations[0].get("guarantee") if simulations else None
@@ -0,0 +1,178 @@
+"""
+Load balancing scheduler for playing many games of several simulations on a process pool.
+
+Game cost differs a lot between simulations (a NeverBuyPlayer game usually lasts all `max_turns`,
+an AlwaysBuyPlayer game with low start cash ends after a few turns), so splitting the games statically
+leaves workers idle at the end of a run. The scheduler uses guided self-scheduling instead:
+- a small probe chunk is played first for every simulation to measure its cost per game,
+- every next chunk takes a share of the estimated remaining work (in seconds, not games),
+  so chunks are large at the start and shrink towards the end of the run,
+- the simulation with the most estimated remaining work is served first.
+"""
+import concurrent.futures
+import contextlib
+import os
+import pickle
+import time
+
+import pandas as pd
+
+from monopoly_simulation.experiments.shards import config_fingerprint, make_shard, run_shard
+
+
+def timed_run_shard(shard):
+    """
+    Runs a shard in a pool worker and reports which worker ran it and when.
+    """
+    start = time.time()
+    aggregate = run_shard(shard)
+    return aggregate, os.getpid(), start, time.time()
+
+
+class ArmProgress:
+    """
+    Scheduling state of one simulation.
+    """
+    def __init__(self, title, config, player, num_games, first_seed=0):
+        self.title = title
+        self.config = config
+        self.player_snapshot = pickle.dumps(player)
+        self.fingerprint = config_fingerprint(config)
+        self.next_seed = first_seed
+        self.remaining = num_games
+        self.in_flight = 0
+        self.seconds_per_game = None
+
+    def record_cost(self, games, seconds, smoothing=0.5):
+        cost = seconds / games
+        if self.seconds_per_game is None:
+            self.seconds_per_game = cost
+        else:
+            self.seconds_per_game = smoothing * cost + (1 - smoothing) * self.seconds_per_game
+
+    def take(self, games):
+        shard = make_shard(self.title, self.config, self.player_snapshot, self.next_seed, games, self.fingerprint)
+        self.next_seed += games
+        self.remaining -= games
+        self.in_flight += 1
+        return shard
+
+
+class GuidedScheduler:
+    """
+    Plays `num_games` games for every simulation on a process pool with cost-aware chunk sizes.
+
+    :param workers: Number of worker processes (defaults to the number of CPUs).
+    :param probe_chunk: Games in the first chunk of every simulation, used to measure its cost.
+    :param min_chunk: Smallest number of games sent to a worker at once.
+    :param chunks_per_worker: Each chunk is sized to 1 / (chunks_per_worker * workers) of the remaining work.
+    :param min_chunk_seconds: Lower bound of the expected chunk duration, keeps dispatch overhead small.
+    """
+    def __init__(self, workers=None, probe_chunk=16, min_chunk=4, chunks_per_worker=2, min_chunk_seconds=0.05):
+        self.workers = workers or os.cpu_count() or 1
+        self.probe_chunk = probe_chunk
+        self.min_chunk = min_chunk
+        self.chunks_per_worker = chunks_per_worker
+        self.min_chunk_seconds = min_chunk_seconds
+
+    def _default_cost(self, arms):
+        known = [arm.seconds_per_game for arm in arms if arm.seconds_per_game is not None]
+        return max(known) if known else None
+
+    def next_shard(self, arms):
+        """
+        Picks the simulation and chunk size for the next free worker, or None if all games are handed out.
+        """
+        candidates = [arm for arm in arms if arm.remaining > 0]
+        if not candidates:
+            return None
+
+        # Every simulation is probed once before costs are compared
+        for arm in candidates:
+            if arm.seconds_per_game is None and arm.in_flight == 0:
+                return arm.take(min(self.probe_chunk, arm.remaining))
+
+        default_cost = self._default_cost(arms)
+        if default_cost is None:
+            # Only probes are running, so there is no estimate yet
+            arm = max(candidates, key=lambda a: a.remaining)
+            return arm.take(min(self.probe_chunk, arm.remaining))
+
+        def remaining_seconds(arm):
+            cost = arm.seconds_per_game if arm.seconds_per_game is not None else default_cost
+            return arm.remaining * cost
+
+        total_remaining = sum(remaining_seconds(arm) for arm in candidates)
+        arm = max(candidates, key=remaining_seconds)
+        cost = arm.seconds_per_game if arm.seconds_per_game is not None else default_cost
+
+        chunk_seconds = max(self.min_chunk_seconds, total_remaining / (self.chunks_per_worker * self.workers))
+        games = max(self.min_chunk, int(chunk_seconds / cost)) if cost > 0 else arm.remaining
+        return arm.take(min(games, arm.remaining))
+
+    def run(self, arms, executor=None):
+        """
+        :param arms: List of ArmProgress.
+        :param executor: Executor to submit the shards to (e.g. the shared worker pool);
+            by default a process pool with `workers` processes is started for the run.
+        :return: (aggregates merged per simulation title, per worker utilization DataFrame)
+        """
+        aggregates = {}
+        by_title = {arm.title: arm for arm in arms}
+        worker_stats = {}
+        run_start = time.time()
+
+        with contextlib.ExitStack() as stack:
+            if executor is None:
+                executor = stack.enter_context(concurrent.futures.ProcessPoolExecutor(max_workers=self.workers))
+            in_flight = {}
+
+            def submit_next():
+                shard = self.next_shard(arms)
+                if shard is None:
+                    return False
+                in_flight[executor.submit(timed_run_shard, shard)] = shard
+                return True
+
+            for _ in range(self.workers):
+                if not submit_next():
+                    break
+
+            while in_flight:
+                done, _ = concurrent.futures.wait(in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    shard = in_flight.pop(future)
+                    aggregate, pid, start, end = future.result()
+
+                    arm = by_title[shard["simulation_title"]]
+                    arm.in_flight -= 1
+                    arm.record_cost(shard["num_games"], end - start)
+
+                    if arm.title in aggregates:
+                        aggregates[arm.title].merge(aggregate)
+                    else:
+                        aggregates[arm.title] = aggregate
+
+                    stats = worker_stats.setdefault(pid, {"Chunks": 0, "Games": 0, "Busy Seconds": 0.0})
+                    stats["Chunks"] += 1
+                    stats["Games"] += shard["num_games"]
+                    stats["Busy Seconds"] += end - start
+
+                    submit_next()
+
+        wall_seconds = time.time() - run_start
+        utilization_df = pd.DataFrame([
+            {
+                "Worker": pid,
+                **stats,
+                "Utilization": stats["Busy Seconds"] / wall_seconds if wall_seconds else 0.0,
+            }
+            for pid, stats in worker_stats.items()
+        ], columns=["Worker", "Chunks", "Games", "Busy Seconds", "Utilization"])
+
+        total_busy = utilization_df["Busy Seconds"].sum()
+        print(
+            f"Scheduler finished in {wall_seconds:.2f}s, "
+            f"ideal {total_busy / self.workers:.2f}s (total work / {self.workers} workers)"
+        )
+        return aggregates, utilization_df
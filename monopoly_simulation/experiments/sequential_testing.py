@@ -0,0 +1,174 @@
+"""
+Sequential testing helpers for the comparison experiments.
+
+Instead of playing a fixed number of games per simulation, games are played in batches
+and every simulation (arm) is stopped as soon as its confidence intervals on win rate and
+average turns before bankruptcy are narrow enough, or as soon as its win rate interval is
+clearly separated from the intervals of all other arms.
+
+The intervals are checked after every batch (look) and compared across arms, so each one is built at
+a Bonferroni corrected level (`corrected_confidence`): with A arms, at most K looks per arm and two
+intervals per arm, every interval has miscoverage (1 - confidence) / (2 * A * K). Then, with probability
+at least `confidence`, all intervals of all arms at every look cover their true values at once.
+This covers the reported final intervals, and every separation stop ranks the arms correctly.
+"""
+import math
+from statistics import NormalDist
+
+
+STOP_PRECISION = "Precision reached"
+STOP_SEPARATION = "Separated from other arms"
+STOP_MAX_GAMES = "Max games reached"
+
+
+def z_score(confidence=0.95):
+    """
+    Two-sided normal quantile for the given confidence level.
+    """
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+
+class ArmStats:
+    """
+    Running summary of the games played by one simulation arm.
+    Only counts and sums are kept, so two summaries can be merged (e.g. results of separate shards).
+    """
+    def __init__(self):
+        self.games = 0
+        self.wins = 0
+        self.bankruptcies = 0
+        self.bankrupt_turns_sum = 0
+        self.bankrupt_turns_sq_sum = 0
+
+    def add_game(self, end_game_status, turns_played):
+        self.games += 1
+        if end_game_status == "Win":
+            self.wins += 1
+        elif end_game_status == "Bankrupcy":
+            self.bankruptcies += 1
+            self.bankrupt_turns_sum += turns_played
+            self.bankrupt_turns_sq_sum += turns_played * turns_played
+
+    def add_game_stats(self, game_stats_df):
+        """
+        Adds all games from a DataFrame created by `create_game_stats_df`.
+        """
+        for status, turns in zip(game_stats_df["End Game Status"], game_stats_df["Turns Played"]):
+            self.add_game(status, turns)
+
+    def merge(self, other):
+        self.games += other.games
+        self.wins += other.wins
+        self.bankruptcies += other.bankruptcies
+        self.bankrupt_turns_sum += other.bankrupt_turns_sum
+        self.bankrupt_turns_sq_sum += other.bankrupt_turns_sq_sum
+        return self
+
+    @property
+    def win_rate(self):
+        return self.wins / self.games if self.games else 0.0
+
+    @property
+    def avg_turns_before_bankruptcy(self):
+        return self.bankrupt_turns_sum / self.bankruptcies if self.bankruptcies else None
+
+    def win_rate_interval(self, confidence=0.95):
+        """
+        Wilson score interval for the win rate. Behaves well for rates close to 0 or 1.
+        """
+        if self.games == 0:
+            return 0.0, 1.0
+        z = z_score(confidence)
+        n = self.games
+        p = self.win_rate
+        denominator = 1 + z * z / n
+        center = (p + z * z / (2 * n)) / denominator
+        half_width = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denominator
+        return max(0.0, center - half_width), min(1.0, center + half_width)
+
+    def bankrupt_turns_interval(self, confidence=0.95):
+        """
+        Normal approximation interval for the average turns before bankruptcy.
+        Returns (None, None) until at least two bankruptcies were observed.
+        """
+        n = self.bankruptcies
+        if n < 2:
+            return None, None
+        mean = self.bankrupt_turns_sum / n
+        variance = max(0.0, (self.bankrupt_turns_sq_sum - n * mean * mean) / (n - 1))
+        half_width = z_score(confidence) * math.sqrt(variance / n)
+        return mean - half_width, mean + half_width
+
+
+def corrected_confidence(confidence, num_arms, max_looks, intervals_per_arm=2):
+    """
+    Per interval confidence level keeping `confidence` simultaneously over all intervals of
+    `num_arms` arms checked at up to `max_looks` looks each (Bonferroni correction).
+    """
+    return 1 - (1 - confidence) / (max(1, num_arms) * max(1, max_looks) * intervals_per_arm)
+
+
+def guarantee_note(confidence, interval_confidence, num_arms, max_looks):
+    """
+    Statement of the error guarantee of a sequential comparison, for the report.
+    """
+    return (
+        f"Intervals are built at {interval_confidence:.5f} confidence each (Bonferroni over {num_arms} arms, "
+        f"up to {max_looks} looks per arm and 2 intervals per arm), so all of them hold simultaneously, "
+        f"including at every stopping check, with probability at least {confidence:.2f}."
+    )
+
+
+def intervals_overlap(a, b):
+    return a[0] <= b[1] and b[0] <= a[1]
+
+
+def precision_reached(arm_stats, confidence=0.95, win_rate_precision=0.02, turns_precision=5.0):
+    """
+    Checks whether both intervals of an arm are narrower than the requested half widths.
+    An arm that never went bankrupt only needs a precise win rate.
+    """
+    low, high = arm_stats.win_rate_interval(confidence)
+    if (high - low) / 2 > win_rate_precision:
+        return False
+
+    if arm_stats.bankruptcies == 0:
+        return True
+    turns_low, turns_high = arm_stats.bankrupt_turns_interval(confidence)
+    if turns_low is None:
+        return False
+    return (turns_high - turns_low) / 2 <= turns_precision
+
+
+def separated_from_others(title, arms, confidence=0.95):
+    """
+    Checks whether the win rate interval of an arm does not overlap with any other arm.
+    """
+    if len(arms) < 2:
+        return False
+    interval = arms[title].win_rate_interval(confidence)
+    return all(
+        not intervals_overlap(interval, other.win_rate_interval(confidence))
+        for other_title, other in arms.items() if other_title != title
+    )
+
+
+def stopping_reason(title, arms, max_games, confidence=0.95, win_rate_precision=0.02, turns_precision=5.0, min_games=100):
+    """
+    Returns why an arm should stop playing games, or None if it should keep going.
+
+    :param title: Title of the arm to check.
+    :param arms: Mapping of simulation title to ArmStats for every arm in the comparison.
+    :param max_games: Upper limit on games played per arm.
+    :param min_games: Games every arm plays before any stopping rule applies.
+    """
+    arm_stats = arms[title]
+    if arm_stats.games >= max_games:
+        return STOP_MAX_GAMES
+    if arm_stats.games < min_games:
+        return None
+    if precision_reached(arm_stats, confidence, win_rate_precision, turns_precision):
+        return STOP_PRECISION
+    if separated_from_others(title, arms, confidence):
+        return STOP_SEPARATION
+    return None
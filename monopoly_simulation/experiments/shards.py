@@ -0,0 +1,195 @@
+"""
+Game shards: self-contained units of work that can be run by any worker process or host.
+
+A shard describes a range of game seeds for one simulation (config and player snapshot)
+and running it produces a ShardAggregate, a summary that can be merged with the
+aggregates of other shards of the same simulation.
+"""
+import pickle
+import pandas as pd
+
+from monopoly_simulation.simualtion import Simulation
+from monopoly_simulation.experiments.sequential_testing import ArmStats
+from monopoly_simulation.experiments.trajectory_stats import CashTrajectoryStats
+
+
+def config_fingerprint(config):
+    """
+    Stable content hash of a simulation config, used to check that coordinator and workers
+    simulate exactly the same rules.
+    """
+    return config.content_hash
+
+
+class ShardAggregate:
+    """
+    Mergeable summary of the games of one simulation.
+    """
+    def __init__(self, max_turns):
+        self.arm_stats = ArmStats()
+        self.cash_trajectory = CashTrajectoryStats(max_turns)
+        self.rent_payments = {}       # property name -> number of rent payments
+        self.rent_games = {}          # property name -> number of games in which rent was paid on it
+        self.property_purchases = {}  # property name -> number of purchases
+        self.properties_owned = 0     # properties bought summed over all games
+        self.games_with_purchases = 0
+        self.game_summaries = []      # (seed, turns played, player cash, end game status, properties bought) per game
+
+        self.game_seed = None
+        self.game_rent_properties = set()
+        self.game_purchases = 0
+
+    def start_game(self, seed=None):
+        self.game_seed = seed
+        self.game_rent_properties = set()
+        self.game_purchases = 0
+
+    def add_turn_outcome(self, turn_outcome):
+        self.cash_trajectory.add_turn_outcome(turn_outcome)
+
+        event = turn_outcome["event"]
+        if event == "Rent Payment":
+            name = turn_outcome["description"]
+            self.rent_payments[name] = self.rent_payments.get(name, 0) + 1
+            self.game_rent_properties.add(name)
+        elif event == "Property Purchase":
+            name = turn_outcome["description"]
+            self.property_purchases[name] = self.property_purchases.get(name, 0) + 1
+            self.properties_owned += 1
+            self.game_purchases += 1
+
+        if turn_outcome["end_game_status"] is not None:
+            self.end_game(turn_outcome)
+
+    def end_game(self, turn_outcome):
+        self.arm_stats.add_game(turn_outcome["end_game_status"], turn_outcome["turn"])
+        for name in self.game_rent_properties:
+            self.rent_games[name] = self.rent_games.get(name, 0) + 1
+        if self.game_purchases:
+            self.games_with_purchases += 1
+        self.game_summaries.append((
+            self.game_seed,
+            turn_outcome["turn"],
+            turn_outcome["player_cash"],
+            turn_outcome["end_game_status"],
+            self.game_purchases,
+        ))
+        self.start_game()
+
+    def merge(self, other):
+        self.arm_stats.merge(other.arm_stats)
+        self.cash_trajectory.merge(other.cash_trajectory)
+        for name, count in other.rent_payments.items():
+            self.rent_payments[name] = self.rent_payments.get(name, 0) + count
+        for name, count in other.rent_games.items():
+            self.rent_games[name] = self.rent_games.get(name, 0) + count
+        for name, count in other.property_purchases.items():
+            self.property_purchases[name] = self.property_purchases.get(name, 0) + count
+        self.properties_owned += other.properties_owned
+        self.games_with_purchases += other.games_with_purchases
+        self.game_summaries.extend(other.game_summaries)
+        return self
+
+    def game_stats_df(self, simulation_title):
+        """
+        Same columns as `create_game_stats_df`, built from the per game summaries.
+        Games played with a seed are numbered by their seed.
+        """
+        return pd.DataFrame(
+            [
+                (simulation_title, game_no if seed is None else seed, turns, cash, status)
+                for game_no, (seed, turns, cash, status, _) in enumerate(self.game_summaries)
+            ],
+            columns=["Simulation Title", "Game No", "Turns Played", "Player Cash", "End Game Status"]
+        )
+
+    def property_revenue_agg_df(self, simulation_title):
+        """
+        Same shape as `aggregate_property_revenue` applied to `create_property_revenue_stats_df`.
+        """
+        return pd.DataFrame(
+            [(simulation_title, name, count) for name, count in self.rent_games.items()],
+            columns=["Simulation Title", "Property Name", "Revenue"]
+        )
+
+    def property_owned_agg_df(self, simulation_title):
+        """
+        Same shape as `aggregate_property_ownership` applied to `create_property_ownership_stats_df`.
+        """
+        if not self.games_with_purchases:
+            return pd.DataFrame(columns=["Simulation Title", "Properties Owned"])
+        return pd.DataFrame(
+            [(simulation_title, self.properties_owned / self.games_with_purchases)],
+            columns=["Simulation Title", "Properties Owned"]
+        )
+
+    def summary(self, simulation_title, confidence=0.95):
+        arm_stats = self.arm_stats
+        win_low, win_high = arm_stats.win_rate_interval(confidence)
+        return {
+            "Simulation Title": simulation_title,
+            "Games Played": arm_stats.games,
+            "Win Rate": arm_stats.win_rate,
+            "Win Rate CI Low": win_low,
+            "Win Rate CI High": win_high,
+            "Avg Turns Before Bankruptcy": arm_stats.avg_turns_before_bankruptcy,
+            "Avg Properties Owned": self.properties_owned / arm_stats.games if arm_stats.games else 0.0,
+            "Rent Payments": sum(self.rent_payments.values()),
+        }
+
+
+def make_shard(simulation_title, config, player_snapshot, seed_start, num_games, fingerprint=None):
+    return {
+        "simulation_title": simulation_title,
+        "config": config,
+        "config_fingerprint": fingerprint or config_fingerprint(config),
+        "player_snapshot": player_snapshot,
+        "seed_start": seed_start,
+        "num_games": num_games,
+    }
+
+
+def make_shards(simulation_title, config, player, num_games, shard_size=1000, first_seed=0):
+    """
+    Splits `num_games` games of one simulation into shards of consecutive seeds.
+    The player is snapshotted (pickled) so trained QLearning players are shipped with their q-table.
+    """
+    player_snapshot = pickle.dumps(player)
+    fingerprint = config_fingerprint(config)
+    return [
+        make_shard(
+            simulation_title, config, player_snapshot, seed_start,
+            min(shard_size, first_seed + num_games - seed_start), fingerprint
+        )
+        for seed_start in range(first_seed, first_seed + num_games, shard_size)
+    ]
+
+
+def run_shard(shard, progress_callback=None):
+    """
+    Plays every game of a shard and returns its ShardAggregate.
+    Game `i` of the shard is played with seed `seed_start + i`, so a shard gives
+    the same result no matter which worker runs it.
+
+    :param progress_callback: Optional callable receiving the number of games finished so far.
+    """
+    config = shard["config"]
+    if config_fingerprint(config) != shard["config_fingerprint"]:
+        raise ValueError(f"Config of shard '{shard['simulation_title']}' does not match its fingerprint.")
+
+    player = pickle.loads(shard["player_snapshot"])
+    simulation = Simulation(config, player)
+    aggregate = ShardAggregate(config.max_turns)
+
+    for i in range(shard["num_games"]):
+        seed = shard["seed_start"] + i
+        player.seed(seed) # player decisions (e.g. QLearning ties)
+        simulation.reset(seed)
+        aggregate.start_game(seed)
+        for turn_outcome in simulation.iter_turns():
+            aggregate.add_turn_outcome(turn_outcome)
+
+        if progress_callback is not None:
+            progress_callback(i + 1)
+
+    return aggregate
@@ -5,10 +5,21 @@ from monopoly_simulation.gui.statistics import (
     display_game_stats, 
     display_property_revenue_stats, 
     display_cash_stats, 
-    display_property_ownership
+    display_cash_trajectory_stats,
+    display_property_ownership,
+    aggregate_property_revenue,
+    aggregate_property_ownership,
+    plot_property_revenue,
+    plot_property_ownership,
 )
 
 
+# Event kinds and turn outcome fields the property stats are built from (see `Simulation.subscribe`)
+PROPERTY_REVENUE_EVENTS = ("Rent Payment",)
+PROPERTY_OWNERSHIP_EVENTS = ("Property Purchase",)
+PROPERTY_EVENT_FIELDS = ("turn", "event", "description", "amount")
+
+
 def create_game_stats_df(turn_outcomes):
     """
     Create a DataFrame summarizing game statistics from turn outcomes.
@@ -87,18 +98,50 @@ def create_player_cash_stats_df(turn_outcomes):
 
 
 
+def concat_non_empty(dfs):
+    """
+    Concatenates DataFrames skipping empty ones (e.g. simulations that never bought a property).
+    """
+    non_empty = [df for df in dfs if not df.empty]
+    return pd.concat(non_empty) if non_empty else dfs[0]
+
+
 def combine_results(simulations):
     """
     Combines results from multiple simulations into a single DataFrame for each type of statistic.
-    Each simulation should have a dictionary with keys: "game_stats_df", "property_revenue_df", "property_owned_df", and "player_cash_df".
-    
+    Each simulation should have a dictionary with keys: "game_stats_df", "property_revenue_df", "property_owned_df", and "player_cash_trajectory".
+    Instead of raw property frames a simulation can provide already aggregated "property_revenue_agg_df" and "property_owned_agg_df".
+    Property statistics are returned aggregated (ready for `plot_property_revenue` and `plot_property_ownership`),
+    cash trajectories are merged per simulation title instead of concatenated.
     """
     game_stats_df = pd.concat([sim["game_stats_df"] for sim in simulations if sim["game_stats_df"] is not None])
-    property_revenue_df = pd.concat([sim["property_revenue_df"] for sim in simulations if sim["property_revenue_df"] is not None])
-    property_owned_df = pd.concat([sim["property_owned_df"] for sim in simulations if sim["property_owned_df"] is not None])
-    player_cash_df = pd.concat([sim["player_cash_df"] for sim in simulations if sim["player_cash_df"] is not None])
 
-    return game_stats_df, property_revenue_df, property_owned_df, player_cash_df
+    property_revenue_agg_dfs = []
+    property_owned_agg_dfs = []
+    for sim in simulations:
+        if sim.get("property_revenue_agg_df") is not None:
+            property_revenue_agg_dfs.append(sim["property_revenue_agg_df"])
+        elif sim.get("property_revenue_df") is not None:
+            property_revenue_agg_dfs.append(aggregate_property_revenue(sim["property_revenue_df"]))
+        if sim.get("property_owned_agg_df") is not None:
+            property_owned_agg_dfs.append(sim["property_owned_agg_df"])
+        elif sim.get("property_owned_df") is not None:
+            property_owned_agg_dfs.append(aggregate_property_ownership(sim["property_owned_df"]))
+    property_revenue_df = concat_non_empty(property_revenue_agg_dfs)
+    property_owned_df = concat_non_empty(property_owned_agg_dfs)
+
+    player_cash_trajectories = {}
+    for sim in simulations:
+        cash_trajectory = sim.get("player_cash_trajectory")
+        if cash_trajectory is None:
+            continue
+        title = sim["title"]
+        if title in player_cash_trajectories:
+            player_cash_trajectories[title].merge(cash_trajectory)
+        else:
+            player_cash_trajectories[title] = cash_trajectory
+
+    return game_stats_df, property_revenue_df, property_owned_df, player_cash_trajectories
 
 
 
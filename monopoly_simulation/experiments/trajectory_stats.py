@@ -0,0 +1,176 @@
+"""
+Fixed memory statistics of the player cash trajectory.
+
+Instead of keeping one row per turn per game, the cash observed at every turn is folded into
+running count / mean / variance and a small relative-error quantile sketch.
+Memory grows with `max_turns` (and logarithmically with the cash range), not with the number of games,
+and accumulators built on separate shards can be merged.
+"""
+import math
+import pandas as pd
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with relative accuracy guarantee (DDSketch style).
+    Values are counted in logarithmic buckets, so any returned quantile is within
+    `relative_accuracy` of the true value.
+    """
+    def __init__(self, relative_accuracy=0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.positive = {}
+        self.negative = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def _key(self, value):
+        return math.ceil(math.log(value) / self.log_gamma)
+
+    def _value(self, key):
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def add(self, value, count=1):
+        if value > 0:
+            key = self._key(value)
+            self.positive[key] = self.positive.get(key, 0) + count
+        elif value < 0:
+            key = self._key(-value)
+            self.negative[key] = self.negative.get(key, 0) + count
+        else:
+            self.zero_count += count
+        self.count += count
+
+    def merge(self, other):
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy.")
+        for key, count in other.positive.items():
+            self.positive[key] = self.positive.get(key, 0) + count
+        for key, count in other.negative.items():
+            self.negative[key] = self.negative.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        return self
+
+    def quantile(self, q):
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return -self._value(key)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return self._value(key)
+        return self._value(max(self.positive))
+
+
+class CashTrajectoryStats:
+    """
+    Per turn statistics of player cash across all games that reached the turn.
+
+    Keeps for every turn: number of observations, mean, variance (Welford), a quantile sketch
+    and the number of games that went bankrupt on that turn (used to compute survival counts).
+    """
+    QUANTILES = (0.05, 0.5, 0.95)
+
+    def __init__(self, max_turns, relative_accuracy=0.01):
+        self.max_turns = max_turns
+        self.relative_accuracy = relative_accuracy
+        size = max_turns + 1
+        self.count = [0] * size
+        self.mean = [0.0] * size
+        self.m2 = [0.0] * size
+        self.bankruptcies = [0] * size
+        self.sketches = [QuantileSketch(relative_accuracy) for _ in range(size)]
+
+    def add(self, turn, cash):
+        """
+        Adds the cash observed at a given turn of one game.
+        """
+        count = self.count[turn] + 1
+        delta = cash - self.mean[turn]
+        mean = self.mean[turn] + delta / count
+        self.m2[turn] += delta * (cash - mean)
+        self.mean[turn] = mean
+        self.count[turn] = count
+        self.sketches[turn].add(cash)
+
+    def add_turn_outcome(self, turn_outcome):
+        self.add(turn_outcome["turn"], turn_outcome["player_cash"])
+        if turn_outcome["end_game_status"] == "Bankrupcy":
+            self.bankruptcies[turn_outcome["turn"]] += 1
+
+    def add_turn_log(self, turn_log):
+        """
+        Adds turn outcome value tuples (see `Simulation.iter_turn_values`), e.g. a whole game or an event bus batch.
+        """
+        for turn, _, player_cash, _, _, _, _, end_game_status in turn_log:
+            self.add(turn, player_cash)
+            if end_game_status == "Bankrupcy":
+                self.bankruptcies[turn] += 1
+
+    def merge(self, other):
+        """
+        Merges statistics of another accumulator (e.g. built on a different shard of games).
+        """
+        if other.max_turns != self.max_turns:
+            raise ValueError("Cannot merge cash trajectories with different max_turns.")
+        for turn in range(self.max_turns + 1):
+            other_count = other.count[turn]
+            if other_count == 0:
+                continue
+            count = self.count[turn] + other_count
+            delta = other.mean[turn] - self.mean[turn]
+            self.mean[turn] += delta * other_count / count
+            self.m2[turn] += other.m2[turn] + delta * delta * self.count[turn] * other_count / count
+            self.count[turn] = count
+            self.bankruptcies[turn] += other.bankruptcies[turn]
+            self.sketches[turn].merge(other.sketches[turn])
+        return self
+
+    def variance(self, turn):
+        count = self.count[turn]
+        return self.m2[turn] / (count - 1) if count > 1 else 0.0
+
+    def quantile(self, turn, q):
+        return self.sketches[turn].quantile(q)
+
+    def survival(self):
+        """
+        Number of games still in play after each turn.
+        """
+        return [count - bankrupt for count, bankrupt in zip(self.count, self.bankruptcies)]
+
+    def to_df(self, simulation_title=None):
+        """
+        One row per turn that was reached by at least one game.
+        """
+        survival = self.survival()
+        rows = []
+        for turn in range(self.max_turns + 1):
+            if self.count[turn] == 0:
+                continue
+            p5, p50, p95 = (self.quantile(turn, q) for q in self.QUANTILES)
+            rows.append({
+                "Simulation Title": simulation_title,
+                "Turn": turn,
+                "Games": self.count[turn],
+                "Surviving Games": survival[turn],
+                "Mean Cash": self.mean[turn],
+                "Std Cash": math.sqrt(self.variance(turn)),
+                "P5 Cash": p5,
+                "P50 Cash": p50,
+                "P95 Cash": p95,
+            })
+        return pd.DataFrame(rows, columns=[
+            "Simulation Title", "Turn", "Games", "Surviving Games",
+            "Mean Cash", "Std Cash", "P5 Cash", "P50 Cash", "P95 Cash"
+        ])
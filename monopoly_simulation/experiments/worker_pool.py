@@ -0,0 +1,194 @@
+"""
+Long-lived worker process pool shared by all Streamlit sessions.
+
+Starting a process pool and importing the engine in every worker costs more than a small run, and
+Streamlit reruns would pay it again and again. The pool is created once per server process
+(`get_shared_worker_pool` is a cached resource); its workers are started and warmed up right away
+(engine imported, default config parsed and validated, one board built).
+
+Jobs are queued per owner (a Streamlit session) and handed to the workers round robin, at most one job
+per free worker, so a session submitting a large run does not starve the others.
+When a worker dies the broken pool is replaced right away and the jobs that were running on it are
+queued again (at most `max_attempts` times each).
+"""
+import collections
+import concurrent.futures
+import contextlib
+import os
+import threading
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+
+# Resolved from the package, workers may be started from any working directory
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config", "default_config.yaml")
+
+
+def warm_worker():
+    """
+    Pool initializer: imports the engine, parses the default config and builds a board once,
+    so the first job of every worker does not pay for it.
+    """
+    from monopoly_simulation.board import Board
+    from monopoly_simulation.simualtion import SimulationConfig
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        Board(SimulationConfig(DEFAULT_CONFIG_PATH))
+
+
+def ready():
+    return os.getpid()
+
+
+class FairWorkerPool:
+    """
+    Process pool with a fair queue in front of it.
+
+    :param workers: Number of worker processes (defaults to the number of CPUs).
+    :param max_attempts: Number of times a job is run before the death of its worker fails it.
+    """
+    def __init__(self, workers=None, max_attempts=3):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_attempts = max_attempts
+        self.executor = self._start_executor()
+        self.executor_lock = threading.Lock()
+        self.condition = threading.Condition()
+        self.queues = collections.OrderedDict() # owner -> deque of (future, fn, args, kwargs, owner, attempts)
+        self.in_flight = 0
+
+        self.dispatcher = threading.Thread(target=self._dispatch, name="worker-pool-dispatcher", daemon=True)
+        self.dispatcher.start()
+
+    def _start_executor(self):
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.workers, initializer=warm_worker)
+        # Start every worker now instead of on the first jobs
+        concurrent.futures.wait([executor.submit(ready) for _ in range(self.workers)])
+        return executor
+
+    def _replace_executor(self, broken):
+        """
+        Replaces the executor once it is broken; jobs of the same broken pool only replace it once.
+        """
+        with self.executor_lock:
+            if self.executor is broken:
+                broken.shutdown(wait=False)
+                self.executor = self._start_executor()
+
+    def submit(self, owner, fn, *args, **kwargs):
+        """
+        Queues a job of `owner`; returns a concurrent.futures.Future.
+        """
+        future = concurrent.futures.Future()
+        with self.condition:
+            self.queues.setdefault(owner, collections.deque()).append((future, fn, args, kwargs, owner, 0))
+            self.condition.notify()
+        return future
+
+    def executor_for(self, owner):
+        return OwnerExecutor(self, owner)
+
+    def pending_jobs(self):
+        with self.condition:
+            return {owner: len(queue) for owner, queue in self.queues.items() if queue}
+
+    def _next_job(self):
+        # Round robin: take the job of the first owner with work and move that owner to the end
+        for owner, queue in self.queues.items():
+            if queue:
+                job = queue.popleft()
+                if queue:
+                    self.queues.move_to_end(owner)
+                else:
+                    del self.queues[owner]
+                return job
+        return None
+
+    def _dispatch(self):
+        while True:
+            with self.condition:
+                job = None
+                while job is None:
+                    if self.in_flight < self.workers:
+                        job = self._next_job()
+                    if job is None:
+                        self.condition.wait()
+                future, fn, args, kwargs, owner, attempts = job
+                # Requeued jobs are already running
+                if attempts == 0 and not future.set_running_or_notify_cancel():
+                    continue # cancelled while queued
+                self.in_flight += 1
+
+            executor = self.executor
+            try:
+                inner = executor.submit(fn, *args, **kwargs)
+            except concurrent.futures.process.BrokenProcessPool as e:
+                self._job_broken(job, executor, e)
+                continue
+            inner.add_done_callback(lambda inner, job=job, executor=executor: self._inner_done(job, executor, inner))
+
+    def _inner_done(self, job, executor, inner):
+        exception = inner.exception()
+        if isinstance(exception, concurrent.futures.process.BrokenProcessPool):
+            self._job_broken(job, executor, exception)
+        elif exception is not None:
+            self._job_done(job[0], exception=exception)
+        else:
+            self._job_done(job[0], result=inner.result())
+
+    def _job_broken(self, job, executor, exception):
+        """
+        A worker of `executor` died while the job was submitted or running: replaces the pool and
+        queues the job again ahead of the other jobs of its owner, or fails it after `max_attempts` runs.
+        """
+        self._replace_executor(executor)
+        future, fn, args, kwargs, owner, attempts = job
+        if attempts + 1 >= self.max_attempts:
+            self._job_done(future, exception=exception)
+            return
+        with self.condition:
+            self.in_flight -= 1
+            self.queues.setdefault(owner, collections.deque()).appendleft((future, fn, args, kwargs, owner, attempts + 1))
+            self.queues.move_to_end(owner, last=False)
+            self.condition.notify()
+
+    def _job_done(self, future, result=None, exception=None):
+        with self.condition:
+            self.in_flight -= 1
+            self.condition.notify()
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(result)
+
+
+class OwnerExecutor:
+    """
+    Executor-like view of the pool for one owner, accepted where a ProcessPoolExecutor is used.
+    """
+    def __init__(self, pool, owner):
+        self.pool = pool
+        self.owner = owner
+
+    def submit(self, fn, *args, **kwargs):
+        return self.pool.submit(self.owner, fn, *args, **kwargs)
+
+
+def current_session_id():
+    """
+    Id of the Streamlit session running the script, or the process id outside of Streamlit.
+    """
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else f"process-{os.getpid()}"
+
+
+@st.cache_resource(show_spinner=False)
+def get_shared_worker_pool(workers=None):
+    return FairWorkerPool(workers)
+
+
+def shared_executor(workers=None):
+    """
+    Executor submitting jobs of the current session to the shared pool.
+    """
+    return get_shared_worker_pool(workers).executor_for(current_session_id())
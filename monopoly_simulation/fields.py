@@ -1,27 +1,58 @@
+# Field type codes of the compiled board tables
+START = 0
+TAX = 1
+CHANCE = 2
+PROPERTY = 3
+
+FIELD_TYPE_NAMES = ("Start", "Tax", "Chance", "Property")
+
+# Chance action codes of the compiled board tables
+RECEIVE = 0
+PAY = 1
+MOVE = 2
+SKIP = 3
+
+CHANCE_ACTIONS = ("receive", "pay", "move", "skip")
+CHANCE_ACTION_CODES = {action: code for code, action in enumerate(CHANCE_ACTIONS)}
+
+
 class Field:
+    """
+    View of one board field, used by the GUI. The engine works on the compiled tables of the Board.
+    """
+    __slots__ = ("field_type", "type_code")
+
     def __init__(self, field_type):
         self.field_type = field_type
+        self.type_code = FIELD_TYPE_NAMES.index(field_type)
 
 class StartField(Field):
+    __slots__ = ("cash_amount",)
+
     def __init__(self, cash_amount=200):
         self.cash_amount = cash_amount
         super().__init__("Start")
 
 class TaxField(Field):
+    __slots__ = ("tax_amount",)
+
     def __init__(self,tax_amount):
         self.tax_amount = tax_amount
         super().__init__("Tax")
 
 class ChanceField(Field):
+    __slots__ = ("chance_event",)
+
     def __init__(self, chance_event):
         self.chance_event = chance_event
         super().__init__("Chance")
 
 class PropertyField(Field):
+    __slots__ = ("name", "price", "rent", "is_owned")
+
     def __init__(self, name, price, rent):
         self.name = name
         self.price = price
         self.rent = rent
         self.is_owned = False
         super().__init__( "Property")
-
@@ -0,0 +1,109 @@
+"""
+Summaries of every game with full turn logs for a sample of them.
+
+A GameLogSampler keeps a small summary of every game played, but the turn by turn log only of
+- a uniform reservoir sample of `sample_size` games (Algorithm R), which gives unbiased trajectories,
+- every game matching the `keep_log` predicate (e.g. bankrupt before turn 20).
+Whether a game is in the reservoir is decided before it is played, so without a predicate the other
+games build no turn records at all. Memory is one summary per game plus `sample_size` logs (and the
+logs kept by the predicate).
+"""
+import random
+
+import pandas as pd
+
+from monopoly_simulation.simualtion import TURN_OUTCOME_FIELDS
+
+
+# Fields of a game summary, in the order of the tuples of `GameLogSampler.summaries`
+GAME_SUMMARY_FIELDS = ("game_no", "seed", "turns", "player_cash", "end_game_status", "properties_owned")
+
+
+def bankrupt_before(turn):
+    """
+    `keep_log` predicate of games lost before `turn`.
+    """
+    return lambda summary: summary["end_game_status"] == "Bankrupcy" and summary["turns"] < turn
+
+
+class GameLogSampler:
+    """
+    Game summaries plus turn logs of a reservoir sample of games and of the games matching `keep_log`.
+    Turn logs are lists of turn outcome value tuples (see `Simulation.iter_turn_values`).
+    """
+    def __init__(self, sample_size, keep_log=None, seed=None):
+        if sample_size < 0:
+            raise ValueError("The log sample size must not be negative.")
+        self.sample_size = sample_size
+        self.keep_log = keep_log
+        self.rng = random.Random(seed)
+        self.games = 0
+        self.summaries = []
+        self.sampled_logs = {}  # reservoir slot -> (game_no, turn log)
+        self.kept_logs = {}     # game_no -> turn log, for games matching `keep_log`
+        self.slot = None        # reservoir slot of the game being played
+
+    def start_game(self):
+        """
+        Draws whether the next game enters the reservoir and returns whether its log must be recorded.
+        """
+        if self.games < self.sample_size:
+            self.slot = self.games
+        else:
+            slot = self.rng.randrange(self.games + 1)
+            self.slot = slot if slot < self.sample_size else None
+        self.games += 1
+        return self.slot is not None or self.keep_log is not None
+
+    def end_game(self, game_no, seed, last_turn, turn_log=None):
+        """
+        Records the summary of a game from its last turn values, and its log if it is sampled or kept.
+        """
+        turn, _, player_cash, properties_owned, _, _, _, end_game_status = last_turn
+        summary = (game_no, seed, turn, player_cash, end_game_status, len(properties_owned))
+        self.summaries.append(summary)
+
+        if self.slot is not None:
+            self.sampled_logs[self.slot] = (game_no, turn_log)
+        if self.keep_log is not None and self.keep_log(dict(zip(GAME_SUMMARY_FIELDS, summary))):
+            self.kept_logs[game_no] = turn_log
+        self.slot = None
+        return summary
+
+    def sampled_games(self):
+        """
+        (game_no, turn log) of the games in the reservoir, by game number.
+        """
+        return sorted(self.sampled_logs.values(), key=lambda game: game[0])
+
+    def summary_df(self, simulation_title):
+        """
+        Summaries of all games, in the shape of `create_game_stats_df`.
+        """
+        df = pd.DataFrame(self.summaries, columns=GAME_SUMMARY_FIELDS)
+        df.insert(0, "simulation_title", simulation_title)
+        return df[["simulation_title", "game_no", "turns", "player_cash", "end_game_status"]].rename(columns={
+            "simulation_title": "Simulation Title",
+            "game_no": "Game No",
+            "turns": "Turns Played",
+            "player_cash": "Player Cash",
+            "end_game_status": "End Game Status",
+        })
+
+    def sampled_turn_outcomes_df(self, simulation_title):
+        return turn_log_df(self.sampled_games(), simulation_title)
+
+    def kept_turn_outcomes_df(self, simulation_title):
+        return turn_log_df(sorted(self.kept_logs.items()), simulation_title)
+
+
+def turn_log_df(games, simulation_title):
+    """
+    Report of turn logs given as (game_no, turn log) pairs, with the columns of a full run report.
+    """
+    rows = [
+        (simulation_title, game_no, *values)
+        for game_no, turn_log in games
+        for values in turn_log
+    ]
+    return pd.DataFrame(rows, columns=["simulation_title", "game_no", *TURN_OUTCOME_FIELDS])
@@ -0,0 +1,164 @@
+"""
+Background execution of GUI simulation runs.
+
+A BackgroundRun plays the games of one GUI run on its own thread, so the Streamlit script thread
+is never blocked and widget interactions (which rerun the script) do not restart the run.
+Finished rows are collected in shared buffers; the dashboard drains them periodically from a fragment.
+The worker thread never touches `st.session_state`.
+"""
+import threading
+from collections import deque
+
+
+FRAME_KEYS = ["player_cash_stats", "property_reveue_stats", "property_owned_stats", "game_stats"]
+
+
+def game_rows(simulation_title, game_no, turn_outcomes, rows=None, cash_totals=None):
+    """
+    Converts the turn outcomes of one game into rows of the session frames, per frame key.
+    With `cash_totals` (turn -> [cash sum, games]) the player cash is added up per turn there
+    instead of adding one cash row per turn.
+    """
+    if rows is None:
+        rows = {key: [] for key in FRAME_KEYS}
+    for turn_outcome in turn_outcomes:
+        if cash_totals is None:
+            rows["player_cash_stats"].append({
+                "Simulation Title": simulation_title,
+                "Game No": game_no,
+                "Turn": turn_outcome["turn"],
+                "Player Cash": turn_outcome["player_cash"],
+                "Games": 1,
+            })
+        else:
+            totals = cash_totals.setdefault(turn_outcome["turn"], [0, 0])
+            totals[0] += turn_outcome["player_cash"]
+            totals[1] += 1
+
+        # Check if the turn outcome is a rent payment
+        if turn_outcome["event"] == "Rent Payment":
+            rows["property_reveue_stats"].append({
+                "Simulation Title": simulation_title,
+                "Game No": game_no,
+                "Property Name": turn_outcome["description"],
+                "Revenue": turn_outcome["amount"]
+            })
+
+        elif turn_outcome["event"] == "Property Purchase":
+            rows["property_owned_stats"].append({
+                "Simulation Title": simulation_title,
+                "Game No": game_no,
+                "Property Name": turn_outcome["description"],
+                "Turn": turn_outcome["turn"],
+                "Price": turn_outcome["amount"]
+            })
+
+        # Check if the game has ended
+        if turn_outcome["end_game_status"] is not None:
+            rows["game_stats"].append({
+                "Simulation Title": simulation_title,
+                "Game No": game_no,
+                "Turns Played": turn_outcome["turn"],
+                "Player Cash": turn_outcome["player_cash"],
+                "End Game Status": turn_outcome["end_game_status"],
+                "Description": turn_outcome["description"]
+            })
+    return rows
+
+
+class BackgroundRun:
+    """
+    Plays `num_games` games of a simulation on a background thread.
+
+    :param run_id: Identifier of the GUI run (the simulation id of the saved form).
+    :param preview_games: Number of most recent finished games kept for the game preview animation (0 disables it).
+    """
+    def __init__(self, run_id, simulation, simulation_title, num_games, train_test_ratio=0.8, preview_games=0):
+        self.run_id = run_id
+        self.simulation = simulation
+        self.simulation_title = simulation_title
+        self.num_games = num_games
+        self.train_test_ratio = train_test_ratio
+
+        self.lock = threading.Lock()
+        self.rows = {key: [] for key in FRAME_KEYS}
+        self.preview_games = deque(maxlen=preview_games) if preview_games else None
+        self.games_done = 0
+        self.eval_started_game = None
+        self.error = None
+
+        self.stop_requested = threading.Event()
+        self.thread = threading.Thread(target=self._run, name=f"simulation-run-{run_id}", daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stop_requested.set()
+
+    @property
+    def finished(self):
+        return not self.thread.is_alive() and self.thread.ident is not None
+
+    def take_rows(self):
+        """
+        Returns the rows collected since the previous call, per session frame key.
+        """
+        with self.lock:
+            rows = self.rows
+            self.rows = {key: [] for key in FRAME_KEYS}
+        return rows
+
+    def next_preview_game(self):
+        """
+        Oldest finished game not shown yet as (game no, board, turn outcomes), or None.
+        """
+        with self.lock:
+            if self.preview_games:
+                return self.preview_games.popleft()
+        return None
+
+    def _run(self):
+        try:
+            for i in range(self.num_games):
+                if self.stop_requested.is_set():
+                    break
+                self._play_game(i)
+        except Exception as e:
+            self.error = e
+            raise
+
+    def _turns_until_stopped(self):
+        for turn_outcome in self.simulation.iter_turns():
+            if self.stop_requested.is_set():
+                return
+            yield turn_outcome
+
+    def _play_game(self, i):
+        simulation = self.simulation
+
+        # Turn qLearning player into eval mode if the game is not in training phase
+        if simulation.config.player_type == "qlearning":
+            if i > self.train_test_ratio * self.num_games and self.eval_started_game is None:
+                simulation.player.eval_mode()
+                self.eval_started_game = i
+
+        # Turns are turned into rows as they are played; only games kept for the preview are stored whole
+        turns = self._turns_until_stopped()
+        if self.preview_games is not None:
+            turns = turn_outcomes = list(turns)
+        rows = game_rows(self.simulation_title, i, turns)
+
+        board = simulation.board
+        # Reset the simulation for the next game
+        simulation.reset()
+        if self.stop_requested.is_set():
+            return # the game was abandoned mid-way
+
+        with self.lock:
+            for key in FRAME_KEYS:
+                self.rows[key].extend(rows[key])
+            if self.preview_games is not None:
+                self.preview_games.append((i, board, turn_outcomes))
+            self.games_done = i + 1
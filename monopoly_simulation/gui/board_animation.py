@@ -0,0 +1,138 @@
+"""
+Client-side animation of a whole game on the board.
+
+The server plays a game at full engine speed and sends the board once, together with a compact
+turn log of the whole game (one small JSON array). The browser then animates moves, purchases
+and events at the requested speed, so there is no server round-trip and no full re-render per turn.
+"""
+import json
+import streamlit.components.v1 as components
+
+from monopoly_simulation.gui.board_display import BoardRenderer, generate_css_and_wrapper
+
+
+EVENT_CODES = {
+    None: 0,
+    "Start": 1,
+    "Tax": 2,
+    "Chance": 3,
+    "Property Purchase": 4,
+    "Buy Skip": 5,
+    "Rent Payment": 6,
+    "Game Over": 7,
+    "Win": 8,
+}
+
+
+def compact_turn_log(turn_outcomes):
+    """
+    Encodes turn outcomes as [turn, position, cash, event code, description index] rows
+    plus the table of event names and the table of distinct descriptions.
+    """
+    descriptions = []
+    description_index = {}
+    log = []
+    for turn_outcome in turn_outcomes:
+        description = turn_outcome["description"] or ""
+        if description not in description_index:
+            description_index[description] = len(descriptions)
+            descriptions.append(description)
+        log.append([
+            turn_outcome["turn"],
+            turn_outcome["player_position"],
+            turn_outcome["player_cash"],
+            EVENT_CODES.get(turn_outcome["event"], 0),
+            description_index[description],
+        ])
+    event_names = [""] * len(EVENT_CODES)
+    for name, code in EVENT_CODES.items():
+        event_names[code] = name or ""
+    return {"log": log, "events": event_names, "descriptions": descriptions}
+
+
+def script_json(value):
+    """
+    JSON of `value` safe to embed in a <script> block: `<`, `>` and `&` are escaped,
+    so a description cannot close the script tag or open a new one.
+    """
+    payload = json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+    return payload.replace("<", "\\u003c").replace(">", "\\u003e").replace("&", "\\u0026")
+
+
+ANIMATION_SCRIPT = """
+<script>
+(function() {
+    const game = %(payload)s;
+    const speedMs = %(speed_ms)d;
+    const fields = document.querySelectorAll('.fields > .field');
+    const center = document.querySelector('.center');
+    const PURCHASE = game.events.indexOf('Property Purchase');
+    let owned = 0;
+    let playerPosition = null;
+
+    function movePlayer(position) {
+        if (position === playerPosition) return;
+        if (playerPosition !== null) {
+            const old = fields[playerPosition].querySelector('.player');
+            if (old) old.remove();
+        }
+        const icon = document.createElement('div');
+        icon.className = 'player';
+        icon.textContent = '🐱';
+        fields[position].firstElementChild.prepend(icon);
+        playerPosition = position;
+    }
+
+    // Event names and descriptions are set as text, never parsed as HTML
+    function setLines(element, lines) {
+        element.replaceChildren();
+        lines.forEach((line, i) => {
+            if (i > 0) element.appendChild(document.createElement('br'));
+            element.appendChild(document.createTextNode(line));
+        });
+    }
+
+    function show(step) {
+        const [turn, position, cash, eventCode, descriptionIndex] = game.log[step];
+        if (eventCode === PURCHASE) {
+            fields[position].firstElementChild.classList.add('bought');
+            owned += 1;
+        }
+        movePlayer(position);
+        setLines(center, [
+            'Turn: ' + (turn + 1),
+            '💰 ' + cash + ' $ \\u00a0 🏠 ' + owned,
+            '',
+            game.events[eventCode] + ':',
+            game.descriptions[descriptionIndex],
+        ]);
+    }
+
+    let step = 0;
+    function tick() {
+        if (step >= game.log.length) return;
+        show(step);
+        step += 1;
+        setTimeout(tick, speedMs);
+    }
+    tick();
+})();
+</script>
+"""
+
+
+def render_board_animation(board, turn_outcomes, speed=0.7, height=480):
+    """
+    Renders the board of a finished game once and animates its turn log in the browser.
+
+    :param speed: Seconds per turn of the animation.
+    :return: Seconds the animation takes to play.
+    """
+    # Initial board state, before the first turn
+    fields_html = ''.join(BoardRenderer(board).fields_html)
+    payload = script_json(compact_turn_log(turn_outcomes))
+    script = ANIMATION_SCRIPT % {"payload": payload, "speed_ms": int(speed * 1000)}
+
+    html = generate_css_and_wrapper(fields_html, center_content="Starting game...")
+    components.html(html.replace("</body>", script + "</body>"), height=height)
+    return len(turn_outcomes) * speed
@@ -153,19 +153,22 @@ def render_html_board(board):
     return generate_css_and_wrapper(fields_html)
 
 
-def render_html_board_with_game(board, simulation_title, game_no, turn_outcome):
+def render_html_board_with_game(board, simulation_title, game_no, turn_outcome, owned_properties=None):
     """
     Render board with player position and event description.
+    Properties bought in the game can be passed as `owned_properties`, otherwise they are looked up in the session stats.
     """
     fields = board.fields
     board_size = len(fields)
     player_position = turn_outcome.get('player_position', 0)
 
+    if owned_properties is None:
+        owned_properties = get_owned_properties(simulation_title=simulation_title, game_no=game_no)
+
     def is_bought(field):
         if field.field_type != "Property":
             return False
         
-        owned_properties = get_owned_properties(simulation_title=simulation_title, game_no=game_no)
         return field.name in owned_properties
     
     fields_html = ''.join([
@@ -182,4 +185,64 @@ def render_html_board_with_game(board, simulation_title, game_no, turn_outcome):
 
     event_description = f"{turn_outcome.get('event', '')}:&#10;&#13;{turn_outcome.get('description', '')}"
 
-    return generate_css_and_wrapper(fields_html, event_description)
\ No newline at end of file
+    return generate_css_and_wrapper(fields_html, event_description)
+
+
+class BoardRenderer:
+    """
+    Live board renderer for game preview.
+
+    Keeps the HTML of every field and the owned properties of the current game as a bitmask of positions,
+    updated on `Property Purchase` events, so a turn only rebuilds the fields whose state changed
+    (bought, player arrived or left) instead of looking up ownership of every field in the session stats.
+    Create a new renderer for every game, the board is rebuilt on reset.
+    """
+    def __init__(self, board):
+        self.board = board
+        self.board_size = board.board_size
+        self.owned_mask = 0
+        self.owned_count = 0
+        self.player_position = None
+        self.fields_html = [self.render_field(i) for i in range(self.board_size)]
+
+    def is_bought(self, position):
+        return bool(self.owned_mask >> position & 1)
+
+    def render_field(self, position):
+        field = self.board.get_field(position)
+        angle = 360 * position / self.board_size
+        return f"<div class='field' \
+            style='transform: rotate({angle}deg) \
+                translate(0, -220px) \
+                rotate(-{angle}deg);'>\
+            <div class='field  {'bought' if self.is_bought(position) else ''}'> \
+                {get_field_display(field, position, self.player_position)}\
+            </div>\
+        </div>"
+
+    def mark_bought(self, position):
+        if not self.is_bought(position):
+            self.owned_mask |= 1 << position
+            self.owned_count += 1
+            self.fields_html[position] = self.render_field(position)
+
+    def move_player(self, position):
+        if position == self.player_position:
+            return
+        previous_position = self.player_position
+        self.player_position = position
+        if previous_position is not None:
+            self.fields_html[previous_position] = self.render_field(previous_position)
+        self.fields_html[position] = self.render_field(position)
+
+    def render(self, turn_outcome):
+        """
+        Render board for a turn outcome, updating ownership and player position first.
+        """
+        position = turn_outcome.get('player_position', 0)
+        if turn_outcome.get('event') == "Property Purchase":
+            self.mark_bought(position)
+        self.move_player(position)
+
+        event_description = f"{turn_outcome.get('event', '')}:&#10;&#13;{turn_outcome.get('description', '')}"
+        return generate_css_and_wrapper(''.join(self.fields_html), event_description)
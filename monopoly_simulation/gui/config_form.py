@@ -1,5 +1,6 @@
 import streamlit as st
 from monopoly_simulation.simualtion import SimulationConfig  # your own class
+from monopoly_simulation.gui.refresh import RefreshPolicy
 
 def render_config_form():
     # Ensure session_state keys exist
@@ -7,11 +8,15 @@ def render_config_form():
     with st.container():
         st.write("## Input your simulation configuration")
         
-        sim_id = st.session_state.get('simulation_id', 1)
+        # Numbered by saved runs, so re-opening an older run does not reuse its id
+        sim_id = len(st.session_state.run_history) + 1
 
         sim_title = st.text_input("Simulation title", value=f"Simulation {sim_id}")
         start_cash = st.number_input("Starting cash for a player", value=1000, step=100)
-        num_games = st.number_input("Number of games to run", value=1, min_value=1, max_value=1000)
+        fast_mode = st.checkbox("Fast mode", value=False, help="Plays the games in worker processes without game preview. \
+            Use it for runs of more than 1,000 games.")
+        max_games = 1_000_000 if fast_mode else 1000
+        num_games = st.number_input("Number of games to run", value=1, min_value=1, max_value=max_games)
         max_turns = st.number_input("Number of turns per game", value=25, step=1)
 
         player_type = st.selectbox(
@@ -37,27 +42,35 @@ Mixed: Combination of sparse and dense rewarding.""",
                 key=f"reward"
             )
 
-        game_preview = st.checkbox("Game preview", value=True, help="If checked, the game will be displayed in the dashboard the simulation. \
+        game_preview = not fast_mode and st.checkbox("Game preview", value=True, help="If checked, the game will be displayed in the dashboard the simulation. \
             This will slow down the execution, not recommanded for running more than one simulation")
+        speed = st.session_state.speed
+        if game_preview:
+            speed = st.slider("Preview speed (seconds per turn)", 0.05, 2.0, st.session_state.speed, 0.05,
+                              help="Every game is played at full speed and then animated in the browser at this speed.")
+
+        with st.expander("Dashboard refresh"):
+            policy = st.session_state.refresh_policy
+            refresh_games = st.number_input("Refresh every N games (0 = off)", value=policy.every_games or 0, min_value=0, step=10)
+            refresh_ms = st.number_input("Refresh every T milliseconds (0 = off)", value=policy.every_ms or 0, min_value=0, step=250,
+                                         help="Statistics are redrawn when either limit is reached.")
         
         saved = st.button("Save")
 
         if saved:
             
             # Save simulation configuration
-            sim_config = SimulationConfig()
-            sim_config.player_type = player_type
-            sim_config.start_cash = start_cash
-            sim_config.num_games = num_games
-            sim_config.max_turns = max_turns
-
+            overrides = {
+                "player_type": player_type.lower().replace(" ", "_"),
+                "start_cash": start_cash,
+                "max_turns": max_turns,
+            }
             if player_type == "QLearning":
-                sim_config.alpha = alpha
-                sim_config.gamma = gamma
-                sim_config.epsilon = epsilon
-                sim_config.reward_strategy = reward_strategy.lower()
+                overrides.update(alpha=alpha, gamma=gamma, epsilon=epsilon, reward_strategy=reward_strategy.lower())
+            sim_config = SimulationConfig().with_overrides(**overrides)
                 
             st.session_state.run_history.loc[len(st.session_state.run_history)] = {
+                "Run Id": sim_id,
                 "Simulation Title": sim_title,
                 "Player Type": player_type,
                 "Start Cash": start_cash,
@@ -69,10 +82,14 @@ Mixed: Combination of sparse and dense rewarding.""",
             }
         
             st.session_state.simulation_config = sim_config
-            st.session_state.simulation_id = sim_id + 1
+            st.session_state.num_games = num_games
+            st.session_state.simulation_id = sim_id
             st.session_state.simulation_title = sim_title
             
             st.session_state.game_preview = game_preview
+            st.session_state.fast_mode = fast_mode
+            st.session_state.speed = speed
+            st.session_state.refresh_policy = RefreshPolicy(every_games=refresh_games, every_ms=refresh_ms or (None if refresh_games else 1000))
 
             st.session_state.show_form = False
             st.rerun()
@@ -0,0 +1,146 @@
+"""
+Fast mode of the GUI: games are played in worker processes without any preview.
+
+Every worker plays a chunk of games and sends back the rows of the session frames for the whole
+chunk as DataFrames, so the dashboard appends one frame per chunk instead of bookkeeping per turn.
+Player cash comes back as one average per turn (with the number of games behind it) rather than
+one row per turn of every game, so the session keeps one cash row per turn however many games are played.
+QLearning training is sequential (every game updates the q-table), so training chunks are played
+one after another and the trained player is handed on; evaluation chunks run in parallel.
+"""
+import concurrent.futures
+import contextlib
+import os
+import pickle
+import random
+
+import pandas as pd
+
+from monopoly_simulation.simualtion import Simulation
+from monopoly_simulation.gui.background import BackgroundRun, FRAME_KEYS, game_rows
+
+
+def play_games_chunk(simulation_title, config, player_snapshot, first_game_no, num_games, base_seed):
+    """
+    Plays games `first_game_no` .. `first_game_no + num_games - 1` in a worker process.
+    Game `g` is played with seed `base_seed + g`.
+
+    :return: (session frame rows per frame key as DataFrames, pickled player after the chunk)
+    """
+    player = pickle.loads(player_snapshot)
+    simulation = Simulation(config, player)
+    rows = {key: [] for key in FRAME_KEYS}
+    cash_totals = {}
+
+    # The engine prints every turn; in fast mode that output would cost more than the games
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for game_no in range(first_game_no, first_game_no + num_games):
+            seed = base_seed + game_no
+            player.seed(seed) # player decisions (e.g. QLearning exploration)
+            simulation.reset(seed)
+            game_rows(simulation_title, game_no, simulation.iter_turns(), rows, cash_totals)
+
+    frames = {key: pd.DataFrame(key_rows) for key, key_rows in rows.items()}
+    frames["player_cash_stats"] = pd.DataFrame(
+        [
+            {"Simulation Title": simulation_title, "Turn": turn, "Player Cash": total / games, "Games": games}
+            for turn, (total, games) in sorted(cash_totals.items())
+        ],
+        columns=["Simulation Title", "Turn", "Player Cash", "Games"],
+    )
+    return frames, pickle.dumps(player)
+
+
+class FastRun(BackgroundRun):
+    """
+    BackgroundRun that plays the games in chunks on a process pool.
+    `take_rows` returns one DataFrame per frame key instead of row dicts.
+
+    :param workers: Number of worker processes (defaults to the number of CPUs).
+    :param chunk_size: Largest number of games per chunk (defaults to a size that gives every worker a few chunks).
+    :param executor: Executor to submit the chunks to (e.g. the shared worker pool);
+        by default a process pool with `workers` processes is started for the run.
+    """
+    def __init__(self, run_id, simulation, simulation_title, num_games, train_test_ratio=0.8,
+                 workers=None, chunk_size=None, executor=None, first_chunk_size=50):
+        super().__init__(run_id, simulation, simulation_title, num_games, train_test_ratio)
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size or max(100, min(5000, num_games // (4 * self.workers)))
+        self.first_chunk_size = min(first_chunk_size, self.chunk_size)
+        self.executor = executor
+        self.base_seed = random.randrange(2**31)
+
+    def take_rows(self):
+        with self.lock:
+            rows = self.rows
+            self.rows = {key: [] for key in FRAME_KEYS}
+        return {
+            key: pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+            for key, frames in rows.items()
+        }
+
+    def _add_chunk(self, frames, games):
+        with self.lock:
+            for key in FRAME_KEYS:
+                if not frames[key].empty:
+                    self.rows[key].append(frames[key])
+            self.games_done += games
+
+    def _chunks(self, first_game_no, last_game_no):
+        # Chunks start small and double up to `chunk_size`, so the first results show up right away
+        start = first_game_no
+        size = self.first_chunk_size
+        while start < last_game_no:
+            games = min(size, last_game_no - start)
+            yield start, games
+            start += games
+            size = min(2 * size, self.chunk_size)
+
+    def _run(self):
+        try:
+            if self.executor is not None:
+                self._run_on(self.executor)
+            else:
+                with concurrent.futures.ProcessPoolExecutor(max_workers=self.workers) as executor:
+                    self._run_on(executor)
+        except Exception as e:
+            self.error = e
+            raise
+
+    def _run_on(self, executor):
+        simulation = self.simulation
+        first_eval_game = 0
+
+        # Training chunks run one after another, each continues with the player trained by the previous one
+        if simulation.config.player_type == "qlearning":
+            first_eval_game = min(self.num_games, int(self.train_test_ratio * self.num_games) + 1)
+            player_snapshot = pickle.dumps(simulation.player)
+            for start, games in self._chunks(0, first_eval_game):
+                if self.stop_requested.is_set():
+                    return
+                frames, player_snapshot = executor.submit(
+                    play_games_chunk, self.simulation_title, simulation.config, player_snapshot,
+                    start, games, self.base_seed
+                ).result()
+                self._add_chunk(frames, games)
+
+            simulation.player = pickle.loads(player_snapshot)
+            simulation.player.eval_mode()
+            if first_eval_game < self.num_games:
+                self.eval_started_game = first_eval_game
+
+        player_snapshot = pickle.dumps(simulation.player)
+        futures = {
+            executor.submit(
+                play_games_chunk, self.simulation_title, simulation.config, player_snapshot,
+                start, games, self.base_seed
+            ): games
+            for start, games in self._chunks(first_eval_game, self.num_games)
+        }
+        for future in concurrent.futures.as_completed(futures):
+            if self.stop_requested.is_set():
+                for pending in futures:
+                    pending.cancel()
+                return
+            frames, _ = future.result()
+            self._add_chunk(frames, futures[future])
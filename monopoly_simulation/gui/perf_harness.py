@@ -0,0 +1,234 @@
+"""
+Headless performance harness of the GUI.
+
+Drives `gui/app.py` with Streamlit's AppTest (no browser): submits configurations of increasing size
+through the config form with game preview off and on (and optionally in fast mode), polls the run
+until its final statistics are shown and measures
+- the run time of the script (wall time of the whole run, and the slowest single script run),
+- the render cost per simulated turn (time spent in script runs / turns played),
+- the memory held in the session state at the end of the run.
+
+Results are written as a JSON baseline; a later run can be compared against it as a regression check.
+
+Example:
+    python -m monopoly_simulation.gui.perf_harness --output gui_baseline.json
+    python -m monopoly_simulation.gui.perf_harness --compare gui_baseline.json --tolerance 0.25
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import pickle
+import platform
+import sys
+import time
+
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+
+APP_PATH = os.path.join(os.path.dirname(__file__), "app.py")
+
+# Metrics compared by the regression check; larger is worse for all of them
+METRICS = ["total_seconds", "max_script_seconds", "render_ms_per_turn", "session_state_mb"]
+
+DEFAULT_CASES = [
+    {"mode": "plain", "num_games": 10},
+    {"mode": "plain", "num_games": 100},
+    {"mode": "plain", "num_games": 1000},
+    {"mode": "preview", "num_games": 1},
+    {"mode": "preview", "num_games": 3},
+    {"mode": "preview", "num_games": 10},
+]
+
+FAST_CASES = [
+    {"mode": "fast", "num_games": 1000},
+    {"mode": "fast", "num_games": 10000},
+]
+
+
+def case_name(case):
+    return f"{case['mode']}-{case['num_games']}"
+
+
+def find_widget(widgets, label):
+    for widget in widgets:
+        if widget.label == label:
+            return widget
+    raise KeyError(f"No widget labelled '{label}' in the app.")
+
+
+def session_state_bytes(session_state):
+    """
+    Approximate memory held by the session state: deep memory of DataFrames
+    and the pickled size of other picklable values (e.g. the run registry).
+    """
+    total = 0
+    for key, value in session_state.filtered_state.items():
+        if isinstance(value, pd.DataFrame):
+            total += int(value.memory_usage(deep=True).sum())
+        else:
+            try:
+                total += len(pickle.dumps(value))
+            except Exception:
+                pass # threads, locks and other live objects
+    return total
+
+
+def run_case(case, max_turns=25, preview_speed=0.05, poll_seconds=0.2, timeout=600):
+    """
+    Submits one configuration through the config form and runs the app until the final statistics are shown.
+    The case fails if they are not shown within `timeout` seconds.
+    """
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    at.run()
+
+    if case["mode"] == "fast":
+        find_widget(at.checkbox, "Fast mode").set_value(True).run()
+    find_widget(at.number_input, "Number of games to run").set_value(case["num_games"])
+    find_widget(at.number_input, "Number of turns per game").set_value(max_turns)
+    if case["mode"] != "fast":
+        find_widget(at.checkbox, "Game preview").set_value(case["mode"] == "preview").run()
+    if case["mode"] == "preview":
+        find_widget(at.slider, "Preview speed (seconds per turn)").set_value(preview_speed)
+
+    script_seconds = []
+
+    def timed_run(run):
+        start = time.time()
+        run()
+        script_seconds.append(time.time() - start)
+
+    start = time.time()
+    deadline = start + timeout
+    # The engine prints every turn
+    with contextlib.redirect_stdout(io.StringIO()):
+        timed_run(find_widget(at.button, "Save").click().run)
+        while "run_registry" in at.session_state and not at.session_state.run_registry:
+            if at.exception:
+                break
+            if time.time() >= deadline:
+                raise TimeoutError(f"Case {case_name(case)} did not finish within {timeout}s.")
+            time.sleep(poll_seconds)
+            timed_run(at.run)
+    total_seconds = time.time() - start
+
+    if at.exception:
+        raise RuntimeError(f"App failed in case {case_name(case)}: {at.exception}")
+
+    # Fast mode keeps one cash row per turn standing for all games of the run
+    turns = int(at.session_state.player_cash_stats["Games"].fillna(1).sum())
+    return {
+        "name": case_name(case),
+        "mode": case["mode"],
+        "num_games": case["num_games"],
+        "turns": turns,
+        "script_runs": len(script_seconds),
+        "total_seconds": round(total_seconds, 4),
+        "max_script_seconds": round(max(script_seconds), 4),
+        "render_ms_per_turn": round(1000 * sum(script_seconds) / max(turns, 1), 4),
+        "session_state_mb": round(session_state_bytes(at.session_state) / 2**20, 4),
+    }
+
+
+def run_case_repeated(case, repeat=3, **kwargs):
+    """
+    Runs a case `repeat` times and keeps the median of every metric.
+    """
+    runs = [run_case(case, **kwargs) for _ in range(repeat)]
+    result = dict(runs[0])
+    for metric in METRICS + ["script_runs"]:
+        values = sorted(run[metric] for run in runs)
+        result[metric] = values[len(values) // 2]
+    result["repeat"] = repeat
+    return result
+
+
+def compare_results(results, baseline, tolerance=0.25, min_seconds=0.05):
+    """
+    Compares results with a baseline of the same format.
+    A metric regresses when it is more than `tolerance` (relative) above the baseline;
+    second metrics below `min_seconds` are too noisy to compare.
+
+    :return: (comparison DataFrame, number of regressions)
+    """
+    baseline_cases = {case["name"]: case for case in baseline["cases"]}
+    rows = []
+    for case in results["cases"]:
+        old = baseline_cases.get(case["name"])
+        if old is None:
+            continue
+        for metric in METRICS:
+            new_value, old_value = case[metric], old[metric]
+            change = (new_value - old_value) / old_value if old_value else 0.0
+            noisy = metric.endswith("seconds") and max(new_value, old_value) < min_seconds
+            rows.append({
+                "Case": case["name"],
+                "Metric": metric,
+                "Baseline": old_value,
+                "Current": new_value,
+                "Change": change,
+                "Regression": change > tolerance and not noisy,
+            })
+    comparison_df = pd.DataFrame(rows, columns=["Case", "Metric", "Baseline", "Current", "Change", "Regression"])
+    return comparison_df, int(comparison_df["Regression"].sum())
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Headless performance harness of the Monopoly Simulation GUI.")
+    parser.add_argument("--output", type=str, default="gui_perf.json", help="File the results are written to")
+    parser.add_argument("--compare", type=str, default=None, help="Baseline file to compare the results with")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown before a metric counts as regression")
+    parser.add_argument("--fast", action="store_true", help="Also measure fast mode runs")
+    parser.add_argument("--max_turns", type=int, default=25, help="Number of turns per game")
+    parser.add_argument("--games", type=int, nargs="*", default=None, help="Only run cases with these numbers of games")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case, the median of every metric is kept")
+    parser.add_argument("--timeout", type=float, default=600, help="Seconds after which an unfinished case fails")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+
+    cases = DEFAULT_CASES + (FAST_CASES if args.fast else [])
+    if args.games:
+        cases = [case for case in cases if case["num_games"] in args.games]
+
+    results = {
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "max_turns": args.max_turns,
+        "cases": [],
+    }
+    # Warm-up run, so imports and first-time caches are not measured in the first case
+    with contextlib.redirect_stdout(io.StringIO()):
+        run_case(DEFAULT_CASES[0], max_turns=args.max_turns)
+
+    for case in cases:
+        print(f"Running case {case_name(case)}...")
+        result = run_case_repeated(case, args.repeat, max_turns=args.max_turns, timeout=args.timeout)
+        print(
+            f"  {result['total_seconds']:.2f}s total, {result['max_script_seconds']:.3f}s slowest script run, "
+            f"{result['render_ms_per_turn']:.3f}ms per turn, {result['session_state_mb']:.2f}MB session state"
+        )
+        results["cases"].append(result)
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        comparison_df, regressions = compare_results(results, baseline, args.tolerance)
+        print(comparison_df.to_string(index=False))
+        if regressions:
+            print(f"{regressions} metric(s) regressed by more than {args.tolerance:.0%}.")
+            sys.exit(1)
+        print("No regressions.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Refresh policy and running counters of the live dashboard.
+
+While a run is going, the dashboard fragment polls the background run often (to switch preview games),
+but the statistics are only collected and redrawn when the refresh policy fires.
+Win / loss numbers come from running counters updated once per game, so a redraw does not recount
+the whole game stats frame.
+"""
+import time
+
+
+class RefreshPolicy:
+    """
+    Redraw the dashboard every `every_games` finished games or every `every_ms` milliseconds,
+    whichever comes first. Either limit can be disabled with None.
+    """
+    def __init__(self, every_games=None, every_ms=1000):
+        if not every_games and not every_ms:
+            raise ValueError("Refresh policy needs a game interval, a time interval or both.")
+        self.every_games = every_games or None
+        self.every_ms = every_ms or None
+        self.reset()
+
+    def reset(self):
+        self.last_games = 0
+        self.last_time = time.time()
+
+    def poll_seconds(self):
+        """
+        How often the dashboard has to check the policy.
+        """
+        if self.every_games:
+            return 0.25 if self.every_ms is None else min(0.25, self.every_ms / 1000)
+        return self.every_ms / 1000
+
+    def should_refresh(self, games_done, now=None):
+        now = time.time() if now is None else now
+        if self.every_games and games_done - self.last_games >= self.every_games:
+            return True
+        if self.every_ms and (now - self.last_time) * 1000 >= self.every_ms:
+            return True
+        return False
+
+    def mark_refreshed(self, games_done, now=None):
+        self.last_games = games_done
+        self.last_time = time.time() if now is None else now
+
+
+class OutcomeCounters:
+    """
+    Running number of wins and bankruptcies and the total turns played before bankruptcy, O(1) per game.
+    """
+    def __init__(self):
+        self.games = 0
+        self.wins = 0
+        self.bankruptcies = 0
+        self.bankrupt_turns = 0
+
+    def add_game(self, end_game_status, turns_played):
+        self.games += 1
+        if end_game_status == "Win":
+            self.wins += 1
+        elif end_game_status == "Bankrupcy":
+            self.bankruptcies += 1
+            self.bankrupt_turns += turns_played
+
+    def add_games(self, end_game_statuses, turns_played):
+        for end_game_status, turns in zip(end_game_statuses, turns_played):
+            self.add_game(end_game_status, turns)
+
+    @property
+    def avg_turns_bancrupt(self):
+        return self.bankrupt_turns / self.bankruptcies if self.bankruptcies else 0.0
@@ -0,0 +1,70 @@
+"""
+Session-scoped registry of finished GUI runs.
+
+A run is registered once all of its games are played, under its run id and the fingerprint of its config.
+Script reruns and runs re-opened from the run history are displayed from the registry instead of
+being simulated again. Only what the run summary displays is kept (win / loss counters, the player and
+the QLearning phase info); the rows of the run stay in the cumulative session frames only.
+"""
+import streamlit as st
+
+from monopoly_simulation.experiments.shards import config_fingerprint
+from monopoly_simulation.gui.refresh import OutcomeCounters
+
+
+FRAME_KEYS = ["game_stats", "property_reveue_stats", "property_owned_stats", "player_cash_stats"]
+
+
+class RunResult:
+    """
+    Summary of one finished run: its win / loss counters, the (trained) player and the QLearning phase info.
+    """
+    def __init__(self, run_id, simulation_title, config, player, outcome_counters, eval_started_game=None, game_preview=False):
+        self.run_id = run_id
+        self.simulation_title = simulation_title
+        self.config = config
+        self.player = player
+        self.outcome_counters = outcome_counters
+        self.eval_started_game = eval_started_game
+        self.game_preview = game_preview
+
+    @property
+    def num_games(self):
+        return self.outcome_counters.games
+
+
+def run_key(run_id, config):
+    return run_id, config_fingerprint(config)
+
+
+def get_run_result(run_id, config):
+    """
+    Finished result of the run, or None if the run was not played (to the end) in this session.
+    """
+    return st.session_state.run_registry.get(run_key(run_id, config))
+
+
+def mark_run_start():
+    """
+    Remembers where the rows of a new run start in the session frames.
+    """
+    st.session_state.run_frame_offsets = {key: len(st.session_state[key]) for key in FRAME_KEYS}
+
+
+def register_run(run_id, simulation_title, config, simulation, eval_started_game=None, game_preview=False):
+    """
+    Stores the win / loss counters of the games the run added to the session frames together with its simulation player.
+    """
+    game_stats = st.session_state.game_stats.iloc[st.session_state.run_frame_offsets["game_stats"]:]
+    outcome_counters = OutcomeCounters()
+    outcome_counters.add_games(game_stats["End Game Status"], game_stats["Turns Played"])
+    result = RunResult(run_id, simulation_title, config, simulation.player, outcome_counters, eval_started_game, game_preview)
+    st.session_state.run_registry[run_key(run_id, config)] = result
+    return result
+
+
+def finished_runs():
+    """
+    Registered runs, oldest first.
+    """
+    return sorted(st.session_state.run_registry.values(), key=lambda result: result.run_id)
@@ -1,178 +1,316 @@
 import time
+import pandas as pd
 import streamlit as st
 
 
 from monopoly_simulation.simualtion import Simulation
 from monopoly_simulation.player import create_player_from_type
-from monopoly_simulation.gui.board_display import render_html_board_with_game
-from monopoly_simulation.gui.statistics import display_cumulative_stats, update_win_loose_stats, get_owned_properties
+from monopoly_simulation.gui.board_animation import render_board_animation
+from monopoly_simulation.gui.background import BackgroundRun
+from monopoly_simulation.gui.fast_mode import FastRun
+from monopoly_simulation.experiments.worker_pool import shared_executor
+from monopoly_simulation.gui.run_registry import finished_runs, get_run_result, mark_run_start, register_run
+from monopoly_simulation.gui.statistics import display_cumulative_stats, update_win_loose_stats, frame_version, aggregate_cash_stats
 
 
-def run_simulations(num_games=100):
+class SessionFrameBuffer:
+    """
+    Collects rows of a session state DataFrame column by column and appends them with a single concat.
+    Enlarging a DataFrame with `df.loc[len(df)] = row` copies it on every row, which makes long runs quadratic.
+    """
+    def __init__(self, session_key):
+        self.session_key = session_key
+        self.columns = list(st.session_state[session_key].columns)
+        self.data = {column: [] for column in self.columns}
+
+    def append(self, row):
+        # Keys that are not columns of the session frame are ignored, like with .loc enlargement
+        for column in self.columns:
+            self.data[column].append(row.get(column))
+
+    def flush(self):
+        if not self.data[self.columns[0]]:
+            return
+        new_rows = pd.DataFrame(self.data, columns=self.columns)
+        frame = st.session_state[self.session_key]
+        if frame.empty:
+            st.session_state[self.session_key] = new_rows
+        else:
+            st.session_state[self.session_key] = pd.concat([frame, new_rows], ignore_index=True)
+        # Cached aggregates of this frame are rebuilt on the next render
+        st.session_state.data_versions[self.session_key] = frame_version(self.session_key) + 1
+        self.data = {column: [] for column in self.columns}
+
+    def merge_cash_frame(self, frame, run_start):
+        """
+        Adds per turn cash averages (fast mode chunks) to the rows of the current run, which starts at
+        row `run_start`, so the run keeps a single row per simulation and turn.
+        """
+        self.flush()
+        session_frame = st.session_state[self.session_key]
+        run_rows = frame.reindex(columns=self.columns)
+        if len(session_frame) > run_start:
+            run_rows = pd.concat([session_frame.iloc[run_start:], run_rows], ignore_index=True)
+        merged = aggregate_cash_stats(run_rows).reindex(columns=self.columns)
+        if run_start:
+            merged = pd.concat([session_frame.iloc[:run_start], merged], ignore_index=True)
+        st.session_state[self.session_key] = merged
+        st.session_state.data_versions[self.session_key] = frame_version(self.session_key) + 1
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+
+    def append_frame(self, frame):
+        """
+        Appends rows that already are a DataFrame (fast mode chunks), keeping only the session frame columns.
+        """
+        self.flush()
+        new_rows = frame.reindex(columns=self.columns)
+        frame = st.session_state[self.session_key]
+        if frame.empty:
+            st.session_state[self.session_key] = new_rows
+        else:
+            st.session_state[self.session_key] = pd.concat([frame, new_rows], ignore_index=True)
+        st.session_state.data_versions[self.session_key] = frame_version(self.session_key) + 1
+
+
+PREVIEW_GAMES = 50 # finished games kept for the preview animation when rendering falls behind
+
+
+def start_background_run(num_games):
+    """
+    Submits the games of the current simulation to a background thread owned by the session.
+    A run that is already going for the same simulation id is kept, so script reruns do not restart it.
+    """
+    run = st.session_state.get("background_run")
+    if run is not None and run.run_id == st.session_state.simulation_id:
+        return run
+    if run is not None:
+        run.stop()
+
+    initialize_simulation()
+    if st.session_state.fast_mode:
+        run = FastRun(
+            run_id=st.session_state.simulation_id,
+            simulation=st.session_state.simulation,
+            simulation_title=st.session_state.simulation_title,
+            num_games=num_games,
+            train_test_ratio=st.session_state.simulation_config.train_test_ratio,
+            executor=shared_executor(),
+        )
+    else:
+        run = BackgroundRun(
+            run_id=st.session_state.simulation_id,
+            simulation=st.session_state.simulation,
+            simulation_title=st.session_state.simulation_title,
+            num_games=num_games,
+            train_test_ratio=st.session_state.simulation_config.train_test_ratio,
+            preview_games=min(num_games, PREVIEW_GAMES) if st.session_state.game_preview else 0,
+        )
+    st.session_state.background_run = run
+    mark_run_start()
+    st.session_state.refresh_policy.reset()
+    st.session_state.dashboard_games = 0
+    st.session_state.preview_game = None
+    st.session_state.preview_until = 0.0
+    st.session_state.eval_started_game = None
+    return run.start()
+
+
+def collect_background_rows(run):
+    """
+    Moves rows finished by the background run into the session frames with one concat per frame
+    and adds the finished games to the running win / loss counters.
     """
-    Runs multiple simulations and updates the same Streamlit widget instead of creating new ones.
+    games_done = run.games_done
+    rows = run.take_rows()
+    for key, frame_rows in rows.items():
+        if isinstance(frame_rows, pd.DataFrame):
+            if frame_rows.empty:
+                continue
+            if key == "player_cash_stats":
+                SessionFrameBuffer(key).merge_cash_frame(frame_rows, st.session_state.run_frame_offsets[key])
+            else:
+                SessionFrameBuffer(key).append_frame(frame_rows)
+        elif frame_rows:
+            buffer = SessionFrameBuffer(key)
+            buffer.extend(frame_rows)
+            buffer.flush()
+
+    game_stats = rows["game_stats"]
+    if isinstance(game_stats, pd.DataFrame):
+        if not game_stats.empty:
+            st.session_state.outcome_counters.add_games(game_stats["End Game Status"], game_stats["Turns Played"])
+    else:
+        for row in game_stats:
+            st.session_state.outcome_counters.add_game(row["End Game Status"], row["Turns Played"])
+    st.session_state.dashboard_games = games_done
+    st.session_state.eval_started_game = run.eval_started_game
+
+
+def render_preview(run):
+    """
+    Shows the animation of the oldest finished game not shown yet, once the previous animation has ended.
+    Until then the current animation is emitted unchanged, so the browser keeps playing it.
+    """
+    if time.time() >= st.session_state.preview_until:
+        next_game = run.next_preview_game()
+        if next_game is not None:
+            st.session_state.preview_game = next_game
+            game_number, _, turn_outcomes = next_game
+            st.session_state.preview_until = time.time() + len(turn_outcomes) * st.session_state.speed
+
+    if st.session_state.preview_game is None:
+        st.write("Waiting for the first game...")
+        return None
+
+    game_number, board, turn_outcomes = st.session_state.preview_game
+    render_board_animation(board=board, turn_outcomes=turn_outcomes, speed=st.session_state.speed)
+    return game_number, turn_outcomes
+
+
+def preview_pending(run):
+    """
+    True while finished games of the run are still being animated or waiting for the preview.
+    """
+    return bool(st.session_state.game_preview and (
+        time.time() < st.session_state.preview_until or run.preview_games
+    ))
+
+
+def render_run_progress():
+    """
+    Live part of the dashboard, rerun on a timer as a fragment while the background run is going.
     """
+    run = st.session_state.background_run
+    num_games = run.num_games
+
+    # Statistics are collected and redrawn only when the refresh policy fires
+    policy = st.session_state.refresh_policy
+    finished = run.finished
+    if finished or policy.should_refresh(run.games_done):
+        collect_background_rows(run)
+        policy.mark_refreshed(st.session_state.dashboard_games)
+
+    progress = st.empty()
 
     # Layout for displaying game stats
     win_loose_col1, win_loose_col2 =  st.columns(2)
-    
-    if st.session_state.game_preview:
-        with win_loose_col1:
-            game_no = st.empty()
+
+    with win_loose_col1:
+        game_no = st.empty()
+        if st.session_state.game_preview:
             turn = st.empty()
             player_cash = st.empty()
             player_properties = st.empty()
-            avg_turns_bancrupt = st.empty()
-            qlearning_phase = st.empty()
+        avg_turns_bancrupt = st.empty()
+        qlearning_phase = st.empty()
+        if st.session_state.game_preview:
             win_loose_rate = st.empty()
-        with win_loose_col2:
-            sim_board = st.empty()
-    else:
-        with win_loose_col1:
-            game_no = st.empty()
-            turn = st.empty()
-            player_cash = st.empty()
-            player_properties = st.empty()
-            avg_turns_bancrupt = st.empty()
-            qlearning_phase = st.empty()
-        with win_loose_col2:
+    with win_loose_col2:
+        if st.session_state.game_preview:
+            preview = render_preview(run)
+            if preview is not None:
+                game_number, turn_outcomes = preview
+                last_outcome = turn_outcomes[-1]
+                properties_bought = sum(o["event"] == "Property Purchase" for o in turn_outcomes)
+                turn.write(f"Turn: {last_outcome["turn"] + 1}")
+                player_cash.write(f"💰 Player Cash: {last_outcome['player_cash']} $")
+                player_properties.write(f"🏠 Player Properties: {properties_bought}")
+        else:
             win_loose_rate = st.empty()
-        
-    
-    simulation = st.session_state.simulation # Get the simulation from session state
-        
-    # Print initial game number    
-    game_no.write(f"Running game 0/{num_games}...")
-    if st.session_state.simulation_config.player_type.lower() == "qlearning":
-        qlearning_phase.write(f"🤖 QLearning Phase: Training")
-    
 
-    # Running games
-    for i in range(num_games):
-        
-        if st.session_state.game_preview:
-            game_no.write(f"Game No: {i+1}")
+    game_no.write(f"Running game {st.session_state.dashboard_games}/{num_games}...")
+    progress.progress(min(1.0, st.session_state.dashboard_games / num_games))
+    if st.session_state.simulation_config.player_type == "qlearning":
+        eval_started_game = st.session_state.eval_started_game
+        if finished and eval_started_game is not None:
+            qlearning_phase.write(f"🤖 QLearning Training Finished at Game No {eval_started_game}")
+        elif eval_started_game is not None:
+            qlearning_phase.write(f"🤖 QLearning Phase: Evaluation")
         else:
-            if i % 10 == 0:
-                game_no.write(f"Running game {i}/{num_games}...")
-                
-        # Turn qLearning player into eval mode if the game is not in training phase
-        if st.session_state.simulation_config.player_type.lower() == "qlearning":
-            if i > st.session_state.simulation_config.train_test_ratio * num_games \
-                and st.session_state.eval_started_game is None:
-                simulation.player.eval_mode = True
-                st.session_state.eval_started_game = i
-                qlearning_phase.write(f"🤖 QLearning Phase: Evaluation")
-                
-        
-        simulation.run() # Runs fast and adds all events to the queue
-
-        # Events are read from the queue
-        # and displayed in the Streamlit app
-        while True:
-            
-            # check if the simlation event is available
-            turn_outcome = simulation.turn_outcomes_queue.popleft()
-            
-            
-            if turn_outcome:
-
-                if st.session_state.game_preview:
-                    turn.write(f"Turn: {turn_outcome["turn"] + 1}")
-                    player_cash.write(f"💰 Player Cash: {turn_outcome['player_cash']} $")
-                    
-
-                            
-                st.session_state.player_cash_stats.loc[len(st.session_state.player_cash_stats)] = {
-                    "Simulation Title": st.session_state.simulation_title,
-                    "Game No": i,
-                    "Turn": turn_outcome["turn"],
-                    "Player Cash": turn_outcome["player_cash"]
-                }
-                
-                # Check if the turn outcome is a rent payment
-                if turn_outcome["event"] == "Rent Payment":
-                    st.session_state.property_reveue_stats.loc[len(st.session_state.property_reveue_stats)] = {
-                        "Simulation Title": st.session_state.simulation_title,
-                        "Game No": i,
-                        "Property Name": turn_outcome["description"],
-                        "Revenue": turn_outcome["amount"]
-                    }
-                    
-                    
-                elif turn_outcome["event"] == "Property Purchase":
-                    
-                    st.session_state.property_owned_stats.loc[len(st.session_state.property_owned_stats)] = {
-                        "Simulation Title": st.session_state.simulation_title,
-                        "Game No": i,
-                        "Property Name": turn_outcome["description"],
-                        "Turn": turn_outcome["turn"],
-                        "Price": turn_outcome["amount"]
-                    }
-                    
-                    if st.session_state.game_preview:
-                        owned_properties =get_owned_properties(simulation_title=st.session_state.simulation_title, game_no=i)
-                        player_properties.write(f"🏠 Player Properties: {len(owned_properties)}")
-                
-                    
-                if st.session_state.game_preview:
-                    sim_board.html( render_html_board_with_game(
-                        board=simulation.board,
-                        simulation_title=st.session_state.simulation_title,
-                        game_no=i,
-                        turn_outcome=turn_outcome
-                    ))
-                    
-            
-                
-                # Check if the game has ended
-                if turn_outcome["end_game_status"] is not None:
-                    st.session_state.game_stats.loc[len(st.session_state.game_stats)]={
-                        "Simulation Title": st.session_state.simulation_title,
-                        "Game No": i,
-                        "Turns Played": turn_outcome["turn"],
-                        "Player Cash": turn_outcome["player_cash"],
-                        "End Game Status": turn_outcome["end_game_status"],
-                        "Description": turn_outcome["description"]
-                    }
-                    break
-            if st.session_state.game_preview:
-                # Wait for the specified speed before processing the next turn
-                time.sleep(st.session_state.speed)
-            
-        # Reset the simulation for the next game
-        simulation.reset()
-
-        # Update WIN / LOOSE stats dynamically
-        if st.session_state.game_preview:
-            update_win_loose_stats(
-                st.session_state.game_stats, 
-                win_loose_rate, 
-                avg_turns_bancrupt
-            )
-        
-        
-    
-    # Print final game number    
-    game_no.write(f"Running game {num_games}/{num_games}...")
-          
+            qlearning_phase.write(f"🤖 QLearning Phase: Training")
+
+    if run.error is not None:
+        st.error(f"Simulation run failed: {run.error!r}")
+
+    # Update WIN / LOOSE stats dynamically
+    update_win_loose_stats(
+        st.session_state.outcome_counters,
+        win_loose_rate,
+        avg_turns_bancrupt
+    )
+
+    # Once the run is over, the whole page is rerun to show the final statistics
+    if finished and not preview_pending(run) and st.session_state.get("live_run_id") == run.run_id:
+        st.session_state.live_run_id = None
+        st.rerun()
+
+
+def display_run_result(result):
+    """
+    Displays the summary of a finished run from the run registry.
+    """
+    st.write(f"Played {result.outcome_counters.games} games.")
+    if result.config.player_type == "qlearning" and result.eval_started_game is not None:
+        st.write(f"🤖 QLearning Training Finished at Game No {result.eval_started_game}")
+
+    win_loose_col1, win_loose_col2 = st.columns(2)
+    with win_loose_col1:
+        avg_turns_bancrupt = st.empty()
+    with win_loose_col2:
+        win_loose_rate = st.empty()
+    update_win_loose_stats(result.outcome_counters, win_loose_rate, avg_turns_bancrupt)
+
+
+def run_simulations(num_games=100):
+    """
+    Runs multiple simulations in the background and refreshes the live dashboard while they run.
+    The engine speed does not depend on rendering, and the run survives UI interactions.
+    A run that already finished in this session is displayed from the run registry instead.
+    """
+    result = get_run_result(st.session_state.simulation_id, st.session_state.simulation_config)
+    if result is None:
+        run = start_background_run(num_games)
+        live = not run.finished or preview_pending(run)
+        if live:
+            st.session_state.live_run_id = run.run_id
+            poll_seconds = st.session_state.refresh_policy.poll_seconds()
+            st.fragment(render_run_progress, run_every=poll_seconds)()
+            return False
+
+        # The fragment ran on the last poll and collected every row of the run
+        collect_background_rows(run)
+        result = register_run(
+            run_id=run.run_id,
+            simulation_title=run.simulation_title,
+            config=st.session_state.simulation_config,
+            simulation=run.simulation,
+            eval_started_game=run.eval_started_game,
+            game_preview=st.session_state.game_preview,
+        )
+        if run.error is not None:
+            st.error(f"Simulation run failed: {run.error!r}")
+
+    display_run_result(result)
+
     # After all games are done, display the final stats
     st.write("### Game Statistics Across Simulations")
-    if not st.session_state.game_preview:
-        update_win_loose_stats(
-            st.session_state.game_stats, 
-            win_loose_rate, 
-            avg_turns_bancrupt
-        )
-        if st.session_state.simulation_config.player_type.lower() == "qlearning":
-            training_phinished = st.session_state.eval_started_game
-            if training_phinished is not None:
-                qlearning_phase.write(f"🤖 QLearning Training Finished at Game No {training_phinished}")
-    
+    return True
+
+
+def reopen_run(result):
+    """
+    Makes a finished run the current one, so it is displayed from the registry.
+    """
+    st.session_state.simulation_id = result.run_id
+    st.session_state.simulation_title = result.simulation_title
+    st.session_state.simulation_config = result.config
+    st.session_state.num_games = result.num_games
+    st.session_state.game_preview = result.game_preview
+
 
-    
-    
-    
 def display_simulation_runtime_info():
     """
     Displays the simulation runtime with board and player position.
@@ -180,6 +318,23 @@ def display_simulation_runtime_info():
     # First display info about all simulations that were run
     st.write("### Run History")
     st.write(st.session_state.run_history)
+
+    # Finished runs can be opened again without simulating, once no run is going
+    run = st.session_state.get("background_run")
+    results = finished_runs()
+    if len(results) > 1 and (run is None or run.finished):
+        run_ids = [result.run_id for result in results]
+        titles = {result.run_id: result.simulation_title for result in results}
+        current_id = st.session_state.simulation_id
+        selected_id = st.selectbox(
+            "Open a finished run",
+            run_ids,
+            index=run_ids.index(current_id) if current_id in run_ids else None,
+            format_func=lambda run_id: f"{run_id}: {titles[run_id]}",
+        )
+        if selected_id is not None and selected_id != current_id:
+            reopen_run(results[run_ids.index(selected_id)])
+            st.rerun()
     
     # Display the current simulation title
     st.write("#### Current Simulation: ", st.session_state.simulation_title)
@@ -194,7 +349,6 @@ def initialize_simulation():
     
 
     # Create a player
-    config.player_type = config.player_type.lower().replace(" ", "_")
     print(f"Creating player of type: {config.player_type}")
     player = create_player_from_type(
         player_type=config.player_type, 
@@ -227,11 +381,10 @@ def render_simulation_display():
     
     display_simulation_runtime_info()
     
-    initialize_simulation()
-    
-    run_simulations(st.session_state.simulation_config.num_games)
+    finished = run_simulations(st.session_state.num_games)
     
-    display_cumulative_stats()
+    if finished:
+        display_cumulative_stats()
 
     
 
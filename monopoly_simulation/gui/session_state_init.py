@@ -1,6 +1,8 @@
 import streamlit as st
 import pandas as pd
 
+from monopoly_simulation.gui.refresh import RefreshPolicy, OutcomeCounters
+
 
 def init_session_state():
     """
@@ -10,14 +12,21 @@ def init_session_state():
     if 'simulation_config' not in st.session_state:
         st.session_state.simulation_config = None
     
+    if 'num_games' not in st.session_state:
+        st.session_state.num_games = 1
+
     if 'simulation' not in st.session_state:
         st.session_state.simulation = None
 
+    if 'fast_mode' not in st.session_state:
+        st.session_state.fast_mode = False
+
     if 'game_preview' not in st.session_state:
         st.session_state.game_preview = False
     
     if 'run_history' not in st.session_state:
         st.session_state.run_history = pd.DataFrame(columns=[
+            "Run Id",
             "Simulation Title", 
             "Player Type", 
             "Start Cash", 
@@ -38,7 +47,19 @@ def init_session_state():
         st.session_state.property_owned_stats = pd.DataFrame(columns=["Simulation Title", "Game No", "Property Name","Turn", "Price"])
 
     if 'player_cash_stats' not in st.session_state:
-        st.session_state.player_cash_stats = pd.DataFrame(columns=["Simulation Title", "Game No", "Turn", "Player Cash"])
+        st.session_state.player_cash_stats = pd.DataFrame(columns=["Simulation Title", "Game No", "Turn", "Player Cash", "Games"])
+
+    if 'outcome_counters' not in st.session_state:
+        st.session_state.outcome_counters = OutcomeCounters()
+
+    if 'refresh_policy' not in st.session_state:
+        st.session_state.refresh_policy = RefreshPolicy()
+
+    if 'run_registry' not in st.session_state:
+        st.session_state.run_registry = {}
+
+    if 'data_versions' not in st.session_state:
+        st.session_state.data_versions = {}
 
     if 'simulation_title' not in st.session_state:
         st.session_state.simulation_title = ""
@@ -52,4 +73,5 @@ def init_session_state():
     if 'speed' not in st.session_state:
         st.session_state.speed = 0.7
         
-    st.session_state.eval_started_game = None
+    if 'eval_started_game' not in st.session_state:
+        st.session_state.eval_started_game = None
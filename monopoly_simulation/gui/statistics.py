@@ -1,8 +1,63 @@
-import time
 import random
+import numpy as np
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
+
+
+WEBGL_THRESHOLD = 2000      # line traces with more points than this are drawn with WebGL (Scattergl)
+DOWNSAMPLE_THRESHOLD = 5000 # line traces with more points than this are downsampled on the server
+
+
+def memoize_by_version(name, data_version, compute):
+    """
+    Returns `compute()` cached in the session under `name` until `data_version` changes.
+    Without a data version (e.g. frames built by the experiment scripts) nothing is cached.
+    """
+    if data_version is None:
+        return compute()
+    cache = st.session_state.setdefault("aggregate_cache", {})
+    cached = cache.get(name)
+    if cached is None or cached[0] != data_version:
+        cached = (data_version, compute())
+        cache[name] = cached
+    return cached[1]
+
+
+def frame_version(session_key):
+    """
+    Version of a session frame, bumped every time new rows are appended to it.
+    """
+    return st.session_state.setdefault("data_versions", {}).get(session_key, 0)
+
+
+def downsample_series(x, y, max_points=DOWNSAMPLE_THRESHOLD):
+    """
+    Min/max bucket downsampling of a line: keeps the lowest and highest point of every bucket,
+    so peaks and drops stay visible. Series with at most `max_points` points are returned unchanged.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if len(x) <= max_points:
+        return x, y
+    buckets = np.array_split(np.arange(len(x)), max_points // 2)
+    keep = []
+    for bucket in buckets:
+        low = bucket[np.argmin(y[bucket])]
+        high = bucket[np.argmax(y[bucket])]
+        keep.extend(sorted({low, high}))
+    return x[keep], y[keep]
+
+
+def line_trace(x, y, **kwargs):
+    """
+    Line trace of a (downsampled) series, drawn with WebGL when it has many points.
+    """
+    x, y = downsample_series(x, y)
+    trace_type = go.Scattergl if len(x) > WEBGL_THRESHOLD else go.Scatter
+    return trace_type(x=x, y=y, **kwargs)
+
 
 def get_random_color_seq(color_sequence=px.colors.qualitative.Antique):
     random_colors = random.sample(color_sequence, len(color_sequence))
@@ -20,52 +75,57 @@ def get_owned_properties(simulation_title, game_no):
     return owned_properties
 
 
-def update_win_loose_stats(game_stats, win_loose_rate, avg_turns_bancrupt):
-    num_wins = len(game_stats[game_stats['End Game Status'] == 'Win'])
-    num_losses = len(game_stats[game_stats['End Game Status'] == 'Bankrupcy'])
-
+def plot_win_loose_stats(num_wins, num_losses):
     # Pie Chart: Wins vs Bankruptcies
-    pie_data = pd.DataFrame({
-        'Outcome': ['Wins', 'Bankruptcies'],
-        'Count': [num_wins, num_losses]
-    })
-
-    fig_pie = px.pie(
-        pie_data,
-        names='Outcome',
-        values='Count',
-        title='Wins vs Bankruptcies',
-        color_discrete_sequence=get_random_color_seq(),
-        width=200
-    )
-    fig_pie.update_layout(template='plotly_dark')
-    win_loose_rate.plotly_chart(fig_pie, key=f'win_loose_rate_{time.time()}')
+    fig_pie = go.Figure(go.Pie(
+        labels=['Wins', 'Bankruptcies'],
+        values=[num_wins, num_losses],
+        marker=dict(colors=get_random_color_seq()[:2]),
+    ))
+    fig_pie.update_layout(title='Wins vs Bankruptcies', template='plotly_dark', width=200)
+    return fig_pie
+
 
-    # Calculate overall average turns before bankruptcy
-    avg_turns_bancrupt_value = game_stats.loc[game_stats['End Game Status'] == 'Bankrupcy', 'Turns Played'].mean()
-    if pd.isna(avg_turns_bancrupt_value):
-        avg_turns_bancrupt_value = 0.0
+def update_win_loose_stats(outcome_counters, win_loose_rate, avg_turns_bancrupt):
+    """
+    Draws the win / loss stats from running OutcomeCounters. The pie chart is rebuilt only when the counts changed.
+    """
+    counts = (outcome_counters.wins, outcome_counters.bankruptcies)
+    fig_pie = memoize_by_version("win_loose_figure", counts, lambda: plot_win_loose_stats(*counts))
+    win_loose_rate.plotly_chart(fig_pie, key='win_loose_rate')
 
     avg_turns_bancrupt.write(
         f"""🕒 Average turns before bankruptcy:
-        {int(avg_turns_bancrupt_value)}"""
+        {int(outcome_counters.avg_turns_bancrupt)}"""
     )
 
     
-def display_game_stats(game_stats=None):
-
-    if game_stats.empty:
-        st.info("No simulation data available.")
-        return
-
+def aggregate_game_stats(game_stats):
+    """
+    Per simulation aggregates of the game stats: average turns before bankruptcy,
+    average turns played and the number of games per end game status.
+    """
     # Filter bankruptcies
     bankruptcies = game_stats[game_stats["End Game Status"] == "Bankrupcy"]
+    avg_turns_lose = bankruptcies.groupby("Simulation Title")["Turns Played"].mean().reset_index()
+    avg_turns_lose = avg_turns_lose.sort_values("Turns Played", ascending=False)
 
-    #  Average Turns Before Bankruptcy Chart
-    if not bankruptcies.empty:
-        avg_turns_lose = bankruptcies.groupby("Simulation Title")["Turns Played"].mean().reset_index()
-        avg_turns_lose = avg_turns_lose.sort_values("Turns Played", ascending=False)
+    avg_turns = game_stats.groupby("Simulation Title")["Turns Played"].mean().reset_index()
+    avg_turns = avg_turns.sort_values("Turns Played", ascending=False)
 
+    win_loss_counts = game_stats.groupby(["Simulation Title", "End Game Status"]).size().reset_index(name='Count')
+    return avg_turns_lose, avg_turns, win_loss_counts
+
+
+def plot_game_stats(avg_turns_lose, avg_turns, win_loss_counts):
+    """
+    Builds the game stats figures from pre-aggregated frames (see `aggregate_game_stats`).
+    Returns the figures in display order and an info message when there are no outcomes to show.
+    """
+    figures = []
+
+    #  Average Turns Before Bankruptcy Chart
+    if not avg_turns_lose.empty:
         fig_avg_turns_lose = px.bar(
             avg_turns_lose,
             x="Simulation Title",
@@ -77,14 +137,10 @@ def display_game_stats(game_stats=None):
             template="plotly_dark"
         )
         fig_avg_turns_lose.update_traces(marker_line_width=1.5, textposition="outside")
-        st.plotly_chart(fig_avg_turns_lose, use_container_width=True)
+        figures.append(fig_avg_turns_lose)
 
 
      #  Average Turns
-    
-    avg_turns = game_stats.groupby("Simulation Title")["Turns Played"].mean().reset_index()
-    avg_turns = avg_turns.sort_values("Turns Played", ascending=False)
-
     fig_avg_turns = px.bar(
         avg_turns,
         x="Simulation Title",
@@ -96,14 +152,11 @@ def display_game_stats(game_stats=None):
         template="plotly_dark"
     )
     fig_avg_turns.update_traces(marker_line_width=1.5, textposition="outside")
-    st.plotly_chart(fig_avg_turns, use_container_width=True)
+    figures.append(fig_avg_turns)
 
     # Wins vs Bankruptcies Chart
-    win_loss_counts = game_stats.groupby(["Simulation Title", "End Game Status"]).size().reset_index(name='Count')
-
     if win_loss_counts.empty:
-        st.info("No win/loss outcomes recorded yet.")
-        return
+        return figures, "No win/loss outcomes recorded yet."
 
     pivot_data = win_loss_counts.pivot(index='Simulation Title', columns='End Game Status', values='Count').fillna(0).reset_index()
 
@@ -111,8 +164,7 @@ def display_game_stats(game_stats=None):
     outcome_columns = [col for col in pivot_data.columns if col != "Simulation Title"]
 
     if not outcome_columns:
-        st.info("No outcomes to display.")
-        return
+        return figures, "No outcomes to display."
 
     melted = pivot_data.melt(id_vars=["Simulation Title"], value_vars=outcome_columns,
                              var_name="Outcome", value_name="Count")
@@ -130,14 +182,39 @@ def display_game_stats(game_stats=None):
     fig_outcomes.update_traces(
         marker_line_width=1.5,
     )
-    st.plotly_chart(fig_outcomes, use_container_width=True)
+    figures.append(fig_outcomes)
+    return figures, None
 
 
+def display_game_stats(game_stats=None, data_version=None):
 
-def display_property_revenue_stats(property_revenue_stats):
-    
-    # Revenue by Property
-    agg_prop_stats =property_revenue_stats.groupby(["Simulation Title", "Property Name"], as_index=False)["Revenue"].count()
+    if game_stats.empty:
+        st.info("No simulation data available.")
+        return
+
+    figures, info = memoize_by_version(
+        "game_stats", data_version, lambda: plot_game_stats(*aggregate_game_stats(game_stats))
+    )
+    for figure in figures:
+        st.plotly_chart(figure, use_container_width=True)
+
+    if info:
+        st.info(info)
+
+
+
+def aggregate_property_revenue(property_revenue_stats):
+    """
+    Counts rent collections per simulation and property.
+    """
+    agg_prop_stats = property_revenue_stats.groupby(["Simulation Title", "Property Name"], as_index=False)["Revenue"].count()
+    return agg_prop_stats
+
+
+def property_revenue_figure(agg_prop_stats):
+    """
+    Builds the rent collection figure from pre-aggregated counts (see `aggregate_property_revenue`).
+    """
     agg_prop_stats = agg_prop_stats.sort_values("Property Name")
 
     fig = px.bar(
@@ -150,41 +227,147 @@ def display_property_revenue_stats(property_revenue_stats):
         template="plotly_dark",  # Dark theme
         labels={"Revenue": "Rent Collected (times)", "Property Name": "Property"}
     )
+    return fig
 
 
-    st.plotly_chart(fig, key=f'agg_prop_stats_{time.time()}')
-    
-    
+def plot_property_revenue(agg_prop_stats):
+    """
+    Plots pre-aggregated rent collection counts (see `aggregate_property_revenue`).
+    """
+    st.plotly_chart(property_revenue_figure(agg_prop_stats), key='agg_prop_stats')
+
+
+def display_property_revenue_stats(property_revenue_stats, data_version=None):
     
+    # Revenue by Property
+    fig = memoize_by_version(
+        "property_revenue", data_version,
+        lambda: property_revenue_figure(aggregate_property_revenue(property_revenue_stats))
+    )
+    st.plotly_chart(fig, key='agg_prop_stats')
     
     
-def display_cash_stats(player_cash_stats):
+def aggregate_cash_stats(player_cash_stats):
+    """
+    Average player cash per simulation and turn.
+    A row can stand for several games (fast mode averages), its "Games" column weights it.
+    """
+    games = pd.to_numeric(player_cash_stats["Games"]).fillna(1.0) if "Games" in player_cash_stats else 1.0
+    weighted = player_cash_stats.assign(
+        **{"Cash Total": player_cash_stats["Player Cash"].astype(float) * games, "Games": games}
+    )
+
     # Group by BOTH Simulation Title and Turn
     agg_player_cash = (
-        player_cash_stats
-        .groupby(["Simulation Title", "Turn"], as_index=False)["Player Cash"]
-        .mean()
+        weighted
+        .groupby(["Simulation Title", "Turn"], as_index=False)[["Cash Total", "Games"]]
+        .sum()
     )
-    
+    agg_player_cash["Player Cash"] = agg_player_cash["Cash Total"] / agg_player_cash["Games"]
+
     agg_player_cash = agg_player_cash.sort_values(["Simulation Title", "Turn"])
+    return agg_player_cash[["Simulation Title", "Turn", "Player Cash", "Games"]]
 
-    fig = px.line(
-        agg_player_cash,
-        x="Turn",
-        y="Player Cash",
-        color="Simulation Title", 
-        color_discrete_sequence=get_random_color_seq(),
+
+def cash_stats_figure(agg_player_cash):
+    """
+    Builds the average cash figure from pre-aggregated series (see `aggregate_cash_stats`),
+    one downsampled line per simulation.
+    """
+    fig = go.Figure()
+    colors = get_random_color_seq()
+
+    for i, (title, series) in enumerate(agg_player_cash.groupby("Simulation Title", sort=False)):
+        fig.add_trace(line_trace(
+            series["Turn"], series["Player Cash"],
+            mode="lines", line=dict(color=colors[i % len(colors)]), name=title,
+        ))
+
+    fig.update_layout(
         title="Average Player Cash Over Turns",
         template="plotly_dark",
-        labels={"Player Cash": "Average Player Cash", "Turn": "Turn", "Simulation Title": "Simulation"}
+        xaxis_title="Turn",
+        yaxis_title="Average Player Cash",
+        legend_title_text="Simulation",
     )
+    return fig
+
 
-    st.plotly_chart(fig, key=f'agg_player_cash_{time.time()}')
+def display_cash_stats(player_cash_stats, data_version=None):
+    def aggregate_and_plot():
+        agg_player_cash = aggregate_cash_stats(player_cash_stats)
+        return agg_player_cash, cash_stats_figure(agg_player_cash)
+
+    agg_player_cash, fig = memoize_by_version("cash_stats", data_version, aggregate_and_plot)
+
+    st.plotly_chart(fig, key='agg_player_cash')
     
     return agg_player_cash
-    
-def display_property_ownership(property_owned_stats):
 
+
+def to_rgba(color, alpha):
+    """
+    Converts '#rrggbb' or 'rgb(r,g,b)' plotly colors into an 'rgba(...)' string.
+    """
+    if color.startswith("#"):
+        r, g, b = (int(color[i:i + 2], 16) for i in (1, 3, 5))
+    else:
+        r, g, b = (int(c) for c in color[color.index("(") + 1:color.index(")")].split(","))
+    return f"rgba({r},{g},{b},{alpha})"
+
+
+def display_cash_trajectory_stats(player_cash_trajectories):
+    """
+    Displays the mean player cash over turns with a P5-P95 band and the median
+    for every simulation, based on CashTrajectoryStats accumulators keyed by simulation title.
+    """
+    fig = go.Figure()
+    colors = get_random_color_seq()
+
+    for i, (title, cash_trajectory) in enumerate(player_cash_trajectories.items()):
+        color = colors[i % len(colors)]
+        trajectory_df = cash_trajectory.to_df(title)
+
+        # Every turn already is one aggregated point; only very long games need thinning
+        step = max(1, int(np.ceil(len(trajectory_df) / DOWNSAMPLE_THRESHOLD)))
+        trajectory_df = trajectory_df.iloc[::step]
+        scatter = go.Scattergl if len(trajectory_df) > WEBGL_THRESHOLD else go.Scatter
+
+        fig.add_trace(scatter(
+            x=trajectory_df["Turn"], y=trajectory_df["P95 Cash"],
+            mode="lines", line=dict(width=0), showlegend=False, hoverinfo="skip",
+            legendgroup=title,
+        ))
+        fig.add_trace(scatter(
+            x=trajectory_df["Turn"], y=trajectory_df["P5 Cash"],
+            mode="lines", line=dict(width=0), fill="tonexty", fillcolor=to_rgba(color, 0.2),
+            name=f"{title} (P5-P95)", legendgroup=title,
+        ))
+        fig.add_trace(scatter(
+            x=trajectory_df["Turn"], y=trajectory_df["P50 Cash"],
+            mode="lines", line=dict(color=color, dash="dot"),
+            name=f"{title} (median)", legendgroup=title,
+        ))
+        fig.add_trace(scatter(
+            x=trajectory_df["Turn"], y=trajectory_df["Mean Cash"],
+            mode="lines", line=dict(color=color),
+            name=f"{title} (mean)", legendgroup=title,
+            customdata=trajectory_df[["Surviving Games"]],
+            hovertemplate="Turn %{x}<br>Mean cash %{y:.0f}<br>Surviving games %{customdata[0]}",
+        ))
+
+    fig.update_layout(
+        title="Player Cash Over Turns",
+        template="plotly_dark",
+        xaxis_title="Turn",
+        yaxis_title="Player Cash",
+    )
+    st.plotly_chart(fig, key='player_cash_trajectory')
+    
+def aggregate_property_ownership(property_owned_stats):
+    """
+    Average number of properties bought per game for every simulation.
+    """
     # Group by Simulation Title and Game No to count properties owned per game
     property_counts = (
         property_owned_stats
@@ -199,8 +382,13 @@ def display_property_ownership(property_owned_stats):
         .groupby("Simulation Title", as_index=False)["Properties Owned"]
         .mean()
     )
+    return avg_property_counts
+
 
-    # Plot
+def property_ownership_figure(avg_property_counts):
+    """
+    Builds the average properties owned figure from pre-aggregated averages (see `aggregate_property_ownership`).
+    """
     fig_outcomes = px.bar(
         avg_property_counts,
         x="Simulation Title",
@@ -214,19 +402,39 @@ def display_property_ownership(property_owned_stats):
     )
 
     fig_outcomes.update_traces(marker_line_width=1.5)
-    st.plotly_chart(fig_outcomes, use_container_width=True)
+    return fig_outcomes
+
+
+def plot_property_ownership(avg_property_counts):
+    """
+    Plots pre-aggregated average properties owned (see `aggregate_property_ownership`).
+    """
+    st.plotly_chart(property_ownership_figure(avg_property_counts), use_container_width=True)
+
+
+def display_property_ownership(property_owned_stats, data_version=None):
+
+    fig = memoize_by_version(
+        "property_ownership", data_version,
+        lambda: property_ownership_figure(aggregate_property_ownership(property_owned_stats))
+    )
+    st.plotly_chart(fig, use_container_width=True)
 
     
 
 def display_cumulative_stats():
+    """
+    Displays the statistics of all runs of the session. Aggregates and figures are rebuilt
+    only when new rows were appended to the session frames since the last render.
+    """
     
     # Display game stats
-    display_game_stats(st.session_state.game_stats.copy())
+    display_game_stats(st.session_state.game_stats, frame_version("game_stats"))
      
     # Display property stats
-    display_property_revenue_stats(st.session_state.property_reveue_stats.copy())
+    display_property_revenue_stats(st.session_state.property_reveue_stats, frame_version("property_reveue_stats"))
     
     # Display player cash and properoty worth stats
-    display_cash_stats(st.session_state.player_cash_stats.copy())
+    display_cash_stats(st.session_state.player_cash_stats, frame_version("player_cash_stats"))
     
-    display_property_ownership(st.session_state.property_owned_stats.copy())
\ No newline at end of file
+    display_property_ownership(st.session_state.property_owned_stats, frame_version("property_owned_stats"))
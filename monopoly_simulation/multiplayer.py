@@ -0,0 +1,356 @@
+"""
+Multi-player game engine (2 to 8 players).
+
+Player state is kept as arrays indexed by player id (positions, cash, bankrupt flags, properties bought)
+and the owner id of every bought property in a position -> player id table, so turn order and rent
+transfers are plain list operations. Rent goes to the owner of the property.
+
+The existing Player strategies (always buy, never buy, QLearning) are used as decision policies only:
+before a purchase decision the policy gets the cash of its player, after it the engine reads the cash back.
+A game is played in rounds; in every round each player still in the game takes one turn. The game ends
+when one player is left or after `max_turns` rounds, then the richest remaining player wins.
+"""
+import argparse
+import asyncio
+import contextlib
+import os
+import random
+import time
+from collections import deque
+
+from monopoly_simulation.board import Board
+from monopoly_simulation.event_bus import EventBus
+from monopoly_simulation.fields import START, TAX, CHANCE, PROPERTY, RECEIVE, PAY, MOVE, SKIP
+from monopoly_simulation.player import Player, QLearningPlayer, create_player_from_type
+from monopoly_simulation.sampling import create_dice_sampler, create_chance_deck
+from monopoly_simulation.simualtion import Simulation, SimulationConfig, TURN_OUTCOME_FIELDS
+
+
+MIN_PLAYERS = 2
+MAX_PLAYERS = 8
+
+# Fields of a multi-player turn outcome: those of a single player game (properties owned is a count here)
+# followed by the id of the player and the owner receiving a rent payment. Indexes of TURN_OUTCOME_FIELDS
+# are the same for both engines.
+MULTIPLAYER_TURN_OUTCOME_FIELDS = TURN_OUTCOME_FIELDS + ("player", "payee")
+
+
+class MultiPlayerSimulation:
+    """
+    :param config: SimulationConfig of the game.
+    :param players: Player strategies, one per player; the index in the list is the player id.
+    :param event_bus: Optional EventBus turn outcomes are published to (default: `turn_outcomes_queue`).
+    """
+    def __init__(self, config: SimulationConfig, players, event_bus: EventBus=None):
+        if not MIN_PLAYERS <= len(players) <= MAX_PLAYERS:
+            raise ValueError(f"A game needs {MIN_PLAYERS} to {MAX_PLAYERS} players, got {len(players)}.")
+        self.config = config
+        self.players = list(players)
+        self.num_players = len(self.players)
+        self.rng = random.Random() # board layout and dice stream, seeded per game in reset()
+        self.turn_outcomes_queue = deque()
+
+        self.event_bus = event_bus
+        self.publish_turn_outcome = event_bus.publish if event_bus is not None else self.turn_outcomes_queue.append
+        self.reset()
+
+    def reset(self, seed=None):
+        """
+        Prepares a new game. With a `seed` the board layout and dice rolls of the game are reproducible.
+        """
+        if seed is not None:
+            self.rng.seed(seed)
+        num_players = self.num_players
+        self.current_turn = 0
+        self.board = Board(self.config, self.rng)
+        self.dice = create_dice_sampler(self.config, self.rng)
+        self.chance_deck = create_chance_deck(self.config, self.rng)
+
+        self.positions = [0] * num_players
+        self.cash = [self.config.start_cash] * num_players
+        self.bankrupt = bytearray(num_players)
+        self.skip_next = bytearray(num_players)
+        self.properties_owned = [0] * num_players
+        self.owned_positions = [[] for _ in range(num_players)]
+        self.owners = {} # position -> player id
+        self.players_left = num_players
+
+        for player in self.players:
+            player.reset(self.config.start_cash)
+
+    def flush_turn_outcomes(self):
+        if self.event_bus is not None:
+            self.event_bus.flush()
+
+    def die_roll(self):
+        # With `roll_again_on_doubles` the roll after a double is already added to the steps
+        steps, _ = self.dice.draw()
+        return steps
+
+    def pay(self, player_id, amount, payee=None):
+        """
+        Takes `amount` from a player, handing it to player `payee` if given.
+        A player who cannot pay hands over all remaining cash and goes bankrupt.
+        """
+        cash = self.cash
+        if amount > cash[player_id]:
+            if payee is not None:
+                cash[payee] += cash[player_id]
+            cash[player_id] = 0
+            raise Player.Bankrupcy()
+        cash[player_id] -= amount
+        if payee is not None:
+            cash[payee] += amount
+
+    def offer_property(self, player_id, field):
+        """
+        Asks the player's policy whether to buy a property; the policy pays from the player's cash.
+        """
+        policy = self.players[player_id]
+        policy.cash = self.cash[player_id]
+        policy.position = self.positions[player_id]
+        try:
+            return policy.buy_property(field, self.current_turn)
+        finally:
+            self.cash[player_id] = policy.cash
+
+    def go_bankrupt(self, player_id):
+        self.bankrupt[player_id] = 1
+        self.players_left -= 1
+        # Properties of the player go back to the bank
+        for position in self.owned_positions[player_id]:
+            del self.owners[position]
+        self.owned_positions[player_id] = []
+
+        policy = self.players[player_id]
+        if isinstance(policy, QLearningPlayer):
+            policy.cash = self.cash[player_id]
+            policy.lose()
+
+    def play_turn(self, player_id):
+        """
+        Plays one turn of a player and returns its outcome as a tuple in the order of MULTIPLAYER_TURN_OUTCOME_FIELDS.
+        """
+        config = self.config
+        board = self.board
+        positions = self.positions
+
+        event = None  # chance event, tax, property purchase or rent payment
+        description = None  # description of the event
+        amount = None  # amount of cash involved in the event
+        payee = None  # owner receiving a rent payment
+        end_game_status = None  # win, survived or bancrupt
+
+        try:
+            prev_position = positions[player_id]
+            steps = self.die_roll()
+            new_position = (prev_position + steps) % config.board_size
+            positions[player_id] = new_position
+            # A move of board_size steps or more can pass the start field more than once
+            self.cash[player_id] += (prev_position + steps) // config.board_size * config.start_passing_cash
+
+            field_code = board.field_codes.get(new_position)
+            if field_code is None:
+                field_code = board.reveal(new_position)
+
+            if field_code == START:
+                event = "Start"
+                description = "Received cash from Start field"
+                amount = config.start_passing_cash
+
+            elif field_code == TAX:
+                tax_amount = board.tax_amounts[new_position]
+                event = "Tax"
+                description = "Paid tax"
+                amount = -tax_amount
+                self.pay(player_id, tax_amount)
+
+            elif field_code == CHANCE:
+                if self.chance_deck is not None:
+                    action, amount, description = self.chance_deck.draw()
+                else:
+                    action, amount = board.chance_effects[new_position]
+                    description = board.chance_descriptions[new_position]
+                event = "Chance"
+                if action == RECEIVE:
+                    self.cash[player_id] += amount
+                elif action == PAY:
+                    self.pay(player_id, amount)
+                elif action == MOVE:
+                    positions[player_id] = (new_position + amount) % config.board_size
+                elif action == SKIP:
+                    self.skip_next[player_id] = 1
+
+            elif field_code == PROPERTY:
+                owner = self.owners.get(new_position)
+                if owner is None:
+                    field = board.get_field(new_position)
+                    description = field.name
+                    if self.offer_property(player_id, field):
+                        self.owners[new_position] = player_id
+                        self.owned_positions[player_id].append(new_position)
+                        self.properties_owned[player_id] += 1
+                        event = "Property Purchase"
+                        amount = -board.property_prices[new_position]
+                    else:
+                        event = "Buy Skip"
+                        amount = 0
+                elif owner != player_id:
+                    rent = board.property_rents[new_position]
+                    event = "Rent Payment"
+                    description = board.get_field(new_position).name
+                    amount = -rent
+                    payee = owner
+                    self.pay(player_id, rent, payee=owner)
+
+        except Player.Bankrupcy:
+            self.go_bankrupt(player_id)
+            end_game_status = "Bankrupcy"
+            event = "Game Over"
+            description = f"Player {player_id} has gone bancrupt"
+
+        return (
+            self.current_turn, new_position, self.cash[player_id], self.properties_owned[player_id],
+            event, description, amount, end_game_status, player_id, payee,
+        )
+
+    def finish_game(self):
+        """
+        Yields the end game status of every player still in the game: the richest ones win.
+        """
+        remaining = [player_id for player_id in range(self.num_players) if not self.bankrupt[player_id]]
+        best_cash = max((self.cash[player_id] for player_id in remaining), default=None)
+        for player_id in remaining:
+            won = self.cash[player_id] == best_cash
+            policy = self.players[player_id]
+            if won and isinstance(policy, QLearningPlayer):
+                policy.cash = self.cash[player_id]
+                policy.win()
+
+            yield (
+                self.current_turn,
+                self.positions[player_id],
+                self.cash[player_id],
+                self.properties_owned[player_id],
+                "Win" if won else "Game End",
+                "Player has won the game!" if won else "Player is still in the game at the end",
+                None,
+                "Win" if won else "Survived",
+                player_id,
+                None,
+            )
+
+    def run(self):
+        """
+        Plays the game to the end and publishes every turn outcome (to `turn_outcomes_queue` or the event bus)
+        as a tuple of values in the order of MULTIPLAYER_TURN_OUTCOME_FIELDS.
+        """
+        publish_turn_outcome = self.publish_turn_outcome
+        for values in self.iter_turn_values():
+            publish_turn_outcome(values)
+        self.flush_turn_outcomes()
+
+    def iter_turns(self):
+        """
+        Plays the game lazily, yielding the outcome of every player turn and then the end game status of
+        the remaining players. The consumer can stop at any turn (`reset` before the next game).
+        """
+        for values in self.iter_turn_values():
+            yield dict(zip(MULTIPLAYER_TURN_OUTCOME_FIELDS, values))
+
+    def iter_turn_values(self):
+        """
+        Like `iter_turns`, yielding every outcome as a tuple in the order of MULTIPLAYER_TURN_OUTCOME_FIELDS.
+        """
+        num_players = self.num_players
+        bankrupt = self.bankrupt
+        skip_next = self.skip_next
+
+        while self.current_turn < self.config.max_turns and self.players_left > 1:
+            for player_id in range(num_players):
+                if bankrupt[player_id]:
+                    continue
+                if skip_next[player_id]:
+                    skip_next[player_id] = 0
+                    continue
+                yield self.play_turn(player_id)
+                if self.players_left <= 1:
+                    break
+            self.current_turn += 1
+
+        yield from self.finish_game()
+
+    async def aiter_turns(self, yield_every=1):
+        """
+        Async variant of `iter_turns`, handing control back to the event loop every `yield_every` turns.
+        """
+        for turn_no, turn_outcome in enumerate(self.iter_turns(), 1):
+            yield turn_outcome
+            if turn_no % yield_every == 0:
+                await asyncio.sleep(0)
+
+    def iter_games(self, num_games, seed=None):
+        """
+        Plays `num_games` games lazily, resetting before each one, and yields (game index, turn outcome).
+        With a `seed`, game `g` is played with seed `seed + g`.
+        """
+        for game_no in range(num_games):
+            self.reset(None if seed is None else seed + game_no)
+            for turn_outcome in self.iter_turns():
+                yield game_no, turn_outcome
+
+
+def create_players(player_types, start_cash=2000, **kwargs):
+    """
+    One player strategy per entry of `player_types` (see `create_player_from_type`).
+    """
+    return [create_player_from_type(player_type, start_cash=start_cash, **kwargs) for player_type in player_types]
+
+
+def measure_turns_per_second(simulation, num_games):
+    turns = 0
+    start = time.perf_counter()
+    # The single-player engine prints every turn
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for game_no in range(num_games):
+            random.seed(game_no)
+            simulation.reset(game_no)
+            turns += sum(1 for turn_outcome in simulation.iter_turns() if turn_outcome["event"] not in ("Win", "Game End"))
+    return turns / (time.perf_counter() - start)
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Play multi-player Monopoly games and measure the engine throughput.")
+    parser.add_argument("--config_path", type=str, default=os.path.join("monopoly_simulation", "config", "default_config.yaml"))
+    parser.add_argument("--player_types", type=str, nargs="+", default=["always_buy", "never_buy", "qlearning", "always_buy"],
+                        help="One player type per player (2 to 8 players)")
+    parser.add_argument("--num_games", type=int, default=1000)
+    parser.add_argument("--max_turns", type=int, default=250)
+    parser.add_argument("--property_rent", type=int, default=50)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    config = SimulationConfig(args.config_path).with_overrides(max_turns=args.max_turns, property_rent=args.property_rent)
+
+    players = create_players(args.player_types, start_cash=config.start_cash,
+                             alpha=config.alpha, gamma=config.gamma, epsilon=config.epsilon, reward_strategy=config.reward_strategy)
+    simulation = MultiPlayerSimulation(config, players)
+
+    wins = [0] * simulation.num_players
+    random.seed(0)
+    for _, turn_outcome in simulation.iter_games(args.num_games, seed=0):
+        if turn_outcome["end_game_status"] == "Win":
+            wins[turn_outcome["player"]] += 1
+    for player_id, player_type in enumerate(args.player_types):
+        print(f"Player {player_id} ({player_type}): {wins[player_id]} wins in {args.num_games} games")
+
+    multi_turns = measure_turns_per_second(MultiPlayerSimulation(config, create_players(args.player_types, config.start_cash)), args.num_games)
+    single = Simulation(config, create_player_from_type(args.player_types[0], config.start_cash))
+    single_turns = measure_turns_per_second(single, args.num_games)
+    print(f"Multi-player engine: {multi_turns:.0f} turns/sec, single-player engine: {single_turns:.0f} turns/sec")
+
+
+if __name__ == "__main__":
+    main()
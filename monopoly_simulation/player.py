@@ -6,6 +6,7 @@ class Player:
         self.cash = cash
         self.position = 0
         self.properties = []
+        self.rng = None # generator of the player's decisions, the global `random` one if None
         
 
     class Bankrupcy(Exception):
@@ -31,6 +32,12 @@ class Player:
         self.cash = start_cash
         self.position = 0
         self.properties = []
+
+    def seed(self, seed):
+        """
+        Gives the player its own seeded generator for its decisions, leaving the global one alone.
+        """
+        self.rng = random.Random(seed)
         
 
 
@@ -60,13 +67,14 @@ class QLearningPlayer(Player):
         return self.q_table[(state, action)]
 
     def choose_action(self, state, actions):
-        if random.random() < self.epsilon:
-            return random.choice(actions)
+        rng = self.rng or random
+        if rng.random() < self.epsilon:
+            return rng.choice(actions)
         else:
             q_values = [self.get_q(state, a) for a in actions]
             max_q = max(q_values)
             best_actions = [a for a, q in zip(actions, q_values) if q == max_q]
-            return random.choice(best_actions)
+            return rng.choice(best_actions)
 
     def update(self, state, action, reward, next_state, next_actions):
         max_q_next = max([self.get_q(next_state, a) for a in next_actions], default=0)
@@ -0,0 +1,258 @@
+"""
+Replay logs: any game rebuilt from a few bytes.
+
+A game is fully determined by its seed (board layout, dice rolls and chance cards are all drawn from
+the generator seeded in `Simulation.reset`) and by the buy / skip choices of the player. A GameReplay
+stores the seed as a varint and the choices as a packed bitstring, so a game costs a few bytes.
+Replaying feeds the choices to a ReplayPlayer and plays the game again through `Simulation`,
+which regenerates exactly the turn outcomes of the original run.
+
+Example:
+    python -m monopoly_simulation.replay --player_type qlearning --num_games 1000
+"""
+import argparse
+import contextlib
+import json
+import os
+import time
+
+from monopoly_simulation.player import Player, create_player_from_type
+from monopoly_simulation.simualtion import Simulation, SimulationConfig
+
+
+REPLAY_MAGIC = b"MSRP1"
+
+
+def write_varint(out, value):
+    """
+    Appends a non-negative integer to the bytearray `out` as a LEB128 varint (7 bits per byte).
+    """
+    if value < 0:
+        raise ValueError("Varints encode non-negative integers only.")
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, offset=0):
+    """
+    Reads a varint from `data` at `offset` and returns (value, offset after it).
+    """
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def pack_decisions(decisions):
+    """
+    Packs a sequence of 0/1 choices into bytes, the first choice in the lowest bit of the first byte.
+    """
+    packed = bytearray((len(decisions) + 7) // 8)
+    for i, decision in enumerate(decisions):
+        if decision:
+            packed[i >> 3] |= 1 << (i & 7)
+    return bytes(packed)
+
+
+def unpack_decisions(packed, count):
+    return [packed[i >> 3] >> (i & 7) & 1 for i in range(count)]
+
+
+class GameReplay:
+    """
+    Seed and packed buy / skip choices of one game.
+    """
+    __slots__ = ("seed", "decision_count", "decisions")
+
+    def __init__(self, seed, decisions):
+        self.seed = seed
+        self.decision_count = len(decisions)
+        self.decisions = pack_decisions(decisions)
+
+    def choices(self):
+        return unpack_decisions(self.decisions, self.decision_count)
+
+    def to_bytes(self):
+        out = bytearray()
+        write_varint(out, self.seed)
+        write_varint(out, self.decision_count)
+        out += self.decisions
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data, offset=0):
+        """
+        Decodes a replay from `data` at `offset` and returns (replay, offset after it).
+        """
+        replay = cls.__new__(cls)
+        replay.seed, offset = read_varint(data, offset)
+        replay.decision_count, offset = read_varint(data, offset)
+        end = offset + (replay.decision_count + 7) // 8
+        replay.decisions = bytes(data[offset:end])
+        return replay, end
+
+
+class ReplayPlayer(Player):
+    """
+    Player repeating recorded buy / skip choices, in the order they were made.
+    """
+    def __init__(self, cash=2000):
+        super().__init__(cash)
+        self.choices = iter(())
+
+    def load(self, replay):
+        self.choices = iter(replay.choices())
+
+    def buy_property(self, property, turns_played=None):
+        if not next(self.choices):
+            return False
+        self.pay(property.price)
+        self.properties.append(property)
+        return True
+
+
+class ReplayLog:
+    """
+    Replays of the games of one config, stored as a header (the config) and one GameReplay per game.
+    """
+    def __init__(self, config):
+        self.config = config
+        self.games = []
+
+    def __len__(self):
+        return len(self.games)
+
+    def record(self, simulation, seed):
+        """
+        Plays one game of `simulation` with `seed`, yielding its turn outcomes, and appends its replay
+        once the game is over (a game abandoned early is not recorded).
+        """
+        if simulation.config != self.config:
+            raise ValueError("The simulation does not play the config of the replay log.")
+        simulation.reset(seed)
+        simulation.decisions = decisions = []
+        try:
+            yield from simulation.iter_turns()
+        finally:
+            simulation.decisions = None
+        self.games.append(GameReplay(seed, decisions))
+
+    def record_games(self, simulation, num_games, seed=0):
+        """
+        Like `Simulation.iter_games` with a seed, recording every game; yields (game index, turn outcome).
+        """
+        for game_no in range(num_games):
+            for turn_outcome in self.record(simulation, seed + game_no):
+                yield game_no, turn_outcome
+
+    def replay(self, game_no):
+        """
+        Plays game `game_no` again and yields its turn outcomes.
+        """
+        replay = self.games[game_no]
+        player = ReplayPlayer(self.config.start_cash)
+        simulation = Simulation(self.config, player)
+        simulation.reset(replay.seed)
+        player.load(replay)
+        yield from simulation.iter_turns()
+
+    def to_bytes(self):
+        header = json.dumps(self.config.to_dict(), sort_keys=True).encode("utf-8")
+        out = bytearray(REPLAY_MAGIC)
+        write_varint(out, len(header))
+        out += header
+        write_varint(out, len(self.games))
+        for replay in self.games:
+            out += replay.to_bytes()
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if data[:len(REPLAY_MAGIC)] != REPLAY_MAGIC:
+            raise ValueError("Not a replay log.")
+        offset = len(REPLAY_MAGIC)
+        header_size, offset = read_varint(data, offset)
+        config_fields = json.loads(data[offset:offset + header_size].decode("utf-8"))
+        offset += header_size
+        log = cls(SimulationConfig.from_dict(config_fields))
+        num_games, offset = read_varint(data, offset)
+        for _ in range(num_games):
+            replay, offset = GameReplay.from_bytes(data, offset)
+            log.games.append(replay)
+        return log
+
+    def save(self, path):
+        with open(path, "wb") as file:
+            file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as file:
+            return cls.from_bytes(file.read())
+
+
+def encode_turn_outcome(turn_outcome):
+    """
+    Canonical bytes of a turn outcome (owned properties by name), to compare a replay with the original run.
+    Must be called when the outcome is yielded, the list of owned properties grows during the game.
+    """
+    return json.dumps(
+        {**turn_outcome, "properties_owned": [field.name for field in turn_outcome["properties_owned"]]},
+        sort_keys=True,
+        ensure_ascii=False,
+    ).encode("utf-8") + b"\n"
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Record games into a replay log and check that replays match them.")
+    parser.add_argument("--config_path", type=str, default=os.path.join("monopoly_simulation", "config", "default_config.yaml"))
+    parser.add_argument("--player_type", type=str, default="qlearning", choices=["always_buy", "never_buy", "qlearning"])
+    parser.add_argument("--num_games", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=str, default=None, help="Optional file for the replay log")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    config = SimulationConfig(args.config_path).with_overrides(player_type=args.player_type)
+    player = create_player_from_type(
+        player_type=config.player_type,
+        start_cash=config.start_cash,
+        alpha=config.alpha,
+        gamma=config.gamma,
+        epsilon=config.epsilon,
+        reward_strategy=config.reward_strategy
+    )
+    simulation = Simulation(config, player)
+    log = ReplayLog(config)
+
+    # The engine prints every turn
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        original = [bytearray() for _ in range(args.num_games)]
+        for game_no, turn_outcome in log.record_games(simulation, args.num_games, args.seed):
+            original[game_no] += encode_turn_outcome(turn_outcome)
+
+        start = time.perf_counter()
+        mismatches = sum(
+            1 for game_no in range(args.num_games)
+            if b"".join(encode_turn_outcome(turn_outcome) for turn_outcome in log.replay(game_no)) != original[game_no]
+        )
+        seconds = time.perf_counter() - start
+
+    data = log.to_bytes()
+    turn_log_bytes = sum(len(game) for game in original)
+    print(f"{args.num_games} games: replay log of {len(data)} bytes, turn outcomes of {turn_log_bytes} bytes")
+    print(f"Replayed in {seconds:.2f}s, {mismatches} games differ from the original run")
+    if args.output:
+        log.save(args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""
+Precomputed sampling of dice rolls and chance cards.
+
+Every distribution is built once per config (alias tables for weighted outcomes, convolved dice sums)
+and a draw costs O(1): one or two random numbers and a table lookup, no matter how many dice or cards
+are configured. Samplers can draw one value at a time from the game's generator (single mode) or
+refill a block of values at once with NumPy (block mode) and hand them out one by one.
+"""
+import argparse
+import functools
+import itertools
+import math
+import random
+import time
+
+import numpy as np
+
+from monopoly_simulation.fields import CHANCE_ACTION_CODES
+
+
+class AliasTable:
+    """
+    Walker / Vose alias table: draws one of `outcomes` with probability proportional to `weights` in O(1).
+    """
+    def __init__(self, outcomes, weights):
+        if len(outcomes) != len(weights) or not outcomes:
+            raise ValueError("An alias table needs one positive weight per outcome.")
+        if any(weight <= 0 for weight in weights):
+            raise ValueError("Weights of an alias table must be positive.")
+        self.outcomes = list(outcomes)
+        n = len(outcomes)
+        total = sum(weights)
+        scaled = [weight * n / total for weight in weights]
+
+        self.prob = [1.0] * n
+        self.alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        # Leftovers are 1 up to rounding errors
+        self.uniform = all(p == 1.0 for p in self.prob)
+
+    def __len__(self):
+        return len(self.outcomes)
+
+    def sample(self, rng):
+        u = rng.random() * len(self.outcomes)
+        i = int(u)
+        if self.uniform or u - i < self.prob[i]:
+            return self.outcomes[i]
+        return self.outcomes[self.alias[i]]
+
+    def sample_block(self, generator, size):
+        """
+        `size` draws with a NumPy generator, as a list.
+        """
+        n = len(self.outcomes)
+        u = generator.random(size) * n
+        i = u.astype(np.int64)
+        if not self.uniform:
+            i = np.where(u - i < np.asarray(self.prob)[i], i, np.asarray(self.alias)[i])
+        outcomes = self.outcomes
+        return [outcomes[j] for j in i.tolist()]
+
+
+def dice_sum_distribution(num_dice, faces):
+    """
+    Probability of every sum of `num_dice` fair dice with `faces` faces, by repeated convolution.
+    """
+    distribution = {0: 1.0}
+    for _ in range(num_dice):
+        convolved = {}
+        for total, p in distribution.items():
+            for face in range(1, faces + 1):
+                convolved[total + face] = convolved.get(total + face, 0.0) + p / faces
+        distribution = convolved
+    return distribution
+
+
+def dice_roll_distribution(num_dice, faces, roll_again_on_doubles=False):
+    """
+    Distribution of the steps of one move as {(steps, doubles): probability}.
+
+    With `roll_again_on_doubles` a double is followed by one more roll and the player moves by both
+    sums at once (the field passed in between is not played), so the whole rule stays one table lookup.
+    """
+    roll = {}
+    if num_dice <= 3:
+        for faces_shown in itertools.product(range(1, faces + 1), repeat=num_dice):
+            key = (sum(faces_shown), num_dice > 1 and len(set(faces_shown)) == 1)
+            roll[key] = roll.get(key, 0.0) + 1.0 / faces ** num_dice
+    else:
+        # Too many dice to enumerate: doubles of every face are split off the convolved sums
+        double_p = 1.0 / faces ** num_dice
+        for total, p in dice_sum_distribution(num_dice, faces).items():
+            if total % num_dice == 0:
+                roll[(total, True)] = double_p
+                p -= double_p
+            if p > 1e-15:
+                roll[(total, False)] = p
+
+    if not roll_again_on_doubles:
+        return roll
+    steps = {}
+    for (total, doubles), p in roll.items():
+        if doubles:
+            for (second_total, _), second_p in roll.items():
+                key = (total + second_total, True)
+                steps[key] = steps.get(key, 0.0) + p * second_p
+        else:
+            steps[(total, False)] = steps.get((total, False), 0.0) + p
+    return steps
+
+
+@functools.lru_cache(maxsize=None)
+def dice_table(num_dice, faces, roll_again_on_doubles=False):
+    distribution = dice_roll_distribution(num_dice, faces, roll_again_on_doubles)
+    outcomes = sorted(distribution)
+    return AliasTable(outcomes, [distribution[outcome] for outcome in outcomes])
+
+
+def chance_cards(chance_events):
+    """
+    Chance events as (action code, amount, description) cards with their weights (default 1).
+    """
+    cards = [(CHANCE_ACTION_CODES[event["action"]], event["amount"], event["description"]) for event in chance_events]
+    weights = [event.get("weight", 1) for event in chance_events]
+    return cards, weights
+
+
+@functools.lru_cache(maxsize=256)
+def chance_event_table(config):
+    """
+    Alias table drawing a chance event (the config dict) of a config by its weight.
+    """
+    return AliasTable(list(config.chance_events), [event.get("weight", 1) for event in config.chance_events])
+
+
+class Sampler:
+    """
+    Draws from an alias table with the generator of a game.
+    With `block_size` > 0 draws are made `block_size` at a time with a NumPy generator seeded from `rng`,
+    so a seeded game still gets the same rolls.
+    """
+    def __init__(self, table, rng, block_size=0):
+        self.table = table
+        self.rng = rng
+        self.block_size = block_size
+        self.block = []
+        self.next_index = 0
+
+    def draw(self):
+        if not self.block_size:
+            return self.table.sample(self.rng)
+        if self.next_index == len(self.block):
+            generator = np.random.default_rng(self.rng.getrandbits(64))
+            self.block = self.table.sample_block(generator, self.block_size)
+            self.next_index = 0
+        value = self.block[self.next_index]
+        self.next_index += 1
+        return value
+
+
+class ChanceDeck:
+    """
+    Shuffled deck of chance cards, drawn from the top and reshuffled when it runs out
+    (O(1) per draw, amortized over a pass through the deck).
+    Every card is in the deck in a number of copies proportional to its weight (see `deck_copies`),
+    so cards come up as often as with the alias table of the same events.
+    """
+    def __init__(self, chance_events, rng):
+        self.cards, self.weights = chance_cards(chance_events)
+        self.deck = [card for card, copies in zip(self.cards, deck_copies(self.weights)) for _ in range(copies)]
+        self.rng = rng
+        self.order = []
+
+    def shuffle(self):
+        self.order = list(self.deck)
+        self.rng.shuffle(self.order)
+
+    def draw(self):
+        """
+        Next card as (action code, amount, description).
+        """
+        if not self.order:
+            self.shuffle()
+        return self.order.pop()
+
+
+# Number of cards of a deck whose weights are not small integers
+DECK_RESOLUTION = 1000
+
+
+def deck_copies(weights):
+    """
+    Copies of every card in a deck with the given weights. Integer weights give exact proportions
+    (reduced by their common divisor); other weights are scaled to a deck of about DECK_RESOLUTION cards,
+    so every card's share is off by at most 1 / (2 * DECK_RESOLUTION), and every card has at least one copy.
+    """
+    if all(float(weight).is_integer() for weight in weights):
+        copies = [int(weight) for weight in weights]
+        divisor = functools.reduce(math.gcd, copies)
+        copies = [count // divisor for count in copies]
+        if sum(copies) <= 10 * DECK_RESOLUTION:
+            return copies
+    total = sum(weights)
+    return [max(1, round(weight * DECK_RESOLUTION / total)) for weight in weights]
+
+
+def create_dice_sampler(config, rng):
+    return Sampler(
+        dice_table(config.num_dice, config.die_faces, config.roll_again_on_doubles),
+        rng,
+        config.sampling_block_size,
+    )
+
+
+def create_chance_deck(config, rng):
+    """
+    Chance deck of the config, or None if chance events are fixed per chance field.
+    """
+    return ChanceDeck(config.chance_events, rng) if config.chance_deck else None
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Measure the cost of a dice draw for several dice rules.")
+    parser.add_argument("--draws", type=int, default=1_000_000)
+    parser.add_argument("--faces", type=int, default=6)
+    parser.add_argument("--block_size", type=int, default=4096)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    rng = random.Random(0)
+
+    start = time.perf_counter()
+    for _ in range(args.draws):
+        rng.randint(1, args.faces)
+    print(f"randint 1d{args.faces}: {1e9 * (time.perf_counter() - start) / args.draws:.0f} ns per draw")
+
+    for num_dice, roll_again in [(1, False), (2, False), (2, True), (10, False)]:
+        for block_size in [0, args.block_size]:
+            sampler = Sampler(dice_table(num_dice, args.faces, roll_again), rng, block_size)
+            start = time.perf_counter()
+            for _ in range(args.draws):
+                sampler.draw()
+            rule = f"{num_dice}d{args.faces}" + (" roll again on doubles" if roll_again else "")
+            mode = f"block of {block_size}" if block_size else "single"
+            print(f"{rule} ({mode}): {1e9 * (time.perf_counter() - start) / args.draws:.0f} ns per draw")
+
+
+if __name__ == "__main__":
+    main()
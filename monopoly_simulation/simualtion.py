@@ -1,84 +1,274 @@
 import argparse
+import asyncio
+import hashlib
+import json
 import os
 import random
-from typing import List, Dict, Any
+from typing import List
 from collections import deque
 import time
 
 from monopoly_simulation.config import validate
 from monopoly_simulation.player import Player, QLearningPlayer, create_player_from_type
 from monopoly_simulation.board import Board
-
+from monopoly_simulation.fields import (
+    START, TAX, CHANCE, PROPERTY, FIELD_TYPE_NAMES,
+    RECEIVE, PAY, MOVE, SKIP,
+)
+from monopoly_simulation.event_bus import EventBus
+from monopoly_simulation.sampling import create_dice_sampler, create_chance_deck
+
+
+
+# Fields of a SimulationConfig with their defaults (None: required in the config file)
+CONFIG_FIELDS = {
+    "alpha": 0.1,
+    "gamma": 0.9,
+    "epsilon": 0.1,
+    "reward_strategy": "sparse",
+    "board_size": None,
+    "chance_fields": None,
+    "chance_events": [],
+    "die_faces": None,
+    "max_turns": None,
+    "player_type": None,
+    "property_fields": None,
+    "property_price": 100,
+    "property_rent": 10,
+    "start_cash": None,
+    "start_passing_cash": 200,
+    "tax_fields": None,
+    "tax_amount": 50,
+    "train_agent": False,
+    "train_test_ratio": 0.8,
+    "num_dice": 1,
+    "roll_again_on_doubles": False,
+    "chance_deck": False,
+    "sampling_block_size": 0,
+}
+
+# (absolute path, modification time) -> field values of a parsed and validated config file
+_parsed_configs = {}
+
+
+def load_config_fields(config_path):
+    """
+    Parses and validates a config file once per (path, modification time) and returns its field values.
+    """
+    if not os.path.exists(config_path):
+        raise FileNotFoundError(f"Configuration file '{config_path}' does not exist.")
+
+    key = (os.path.abspath(config_path), os.stat(config_path).st_mtime_ns)
+    fields = _parsed_configs.get(key)
+    if fields is None:
+        config = validate.validate_config(config_path)
+        fields = {}
+        for name, default in CONFIG_FIELDS.items():
+            fields[name] = config[name] if default is None else config.get(name, default)
+        fields["chance_events"] = tuple(fields["chance_events"])
+        _parsed_configs[key] = fields
+    return fields
 
 
 class SimulationConfig:
+    """
+    Immutable simulation config. It is hashable and compared by content, so it can be shared
+    with worker processes and used in cache keys; `with_overrides` returns a changed copy.
+    """
+    __slots__ = tuple(CONFIG_FIELDS) + ("_content_hash",)
+
     def __init__(
         self,
         config_path: str=os.path.join("monopoly_simulation", "config", "default_config.yaml")
     ):
-        self.load_config(config_path)
-
-    def load_config(self, config_path):
-        if not os.path.exists(config_path):
-            raise FileNotFoundError(f"Configuration file '{config_path}' does not exist.")
-        
-        config = validate.validate_config(config_path)
-
-        self.alpha=config.get("alpha", 0.1)
-        self.gamma=config.get("gamma", 0.9)
-        self.epsilon=config.get("epsilon", 0.1)
-        self.reward_strategy=config.get("reward_strategy", "sparse")
-        self.board_size=config["board_size"]
-        self.chance_fields=config["chance_fields"]
-        self.chance_events=config.get("chance_events", [])
-        self.die_faces=config["die_faces"]
-        self.max_turns=config["max_turns"]
-        self.player_type=config["player_type"]
-        self.property_fields=config["property_fields"]
-        self.property_price=config.get("property_price", 100)
-        self.property_rent=config.get("property_rent", 10)
-        self.start_cash=config["start_cash"]
-        self.start_passing_cash=config.get("start_passing_cash", 200)
-        self.tax_fields=config["tax_fields"]
-        self.tax_amount=config.get("tax_amount", 50)
-        self.train_agent=config.get("train_agent", False)
-        self.train_test_ratio=config.get("train_test_ratio", 0.8)
+        self._set_fields(load_config_fields(config_path))
+
+    def _set_fields(self, fields):
+        for name, value in fields.items():
+            object.__setattr__(self, name, value)
+        content = json.dumps(self.to_dict(), sort_keys=True, default=str)
+        object.__setattr__(self, "_content_hash", hashlib.sha256(content.encode("utf-8")).hexdigest())
+
+    def with_overrides(self, **overrides):
+        """
+        Copy of the config with some fields replaced, e.g. `config.with_overrides(start_cash=2000)`.
+        """
+        unknown = set(overrides) - set(CONFIG_FIELDS)
+        if unknown:
+            raise TypeError(f"Unknown config fields: {', '.join(sorted(unknown))}")
+        if "chance_events" in overrides:
+            overrides["chance_events"] = tuple(overrides["chance_events"])
+
+        config = object.__new__(SimulationConfig)
+        config._set_fields({**self.to_dict(), **overrides})
+        return config
+
+    @classmethod
+    def from_dict(cls, fields):
+        """
+        Config from field values alone (e.g. those of `to_dict`), without reading a config file.
+        Optional fields that are missing get their defaults.
+        """
+        unknown = set(fields) - set(CONFIG_FIELDS)
+        if unknown:
+            raise TypeError(f"Unknown config fields: {', '.join(sorted(unknown))}")
+        missing = [name for name, default in CONFIG_FIELDS.items() if default is None and name not in fields]
+        if missing:
+            raise TypeError(f"Missing config fields: {', '.join(missing)}")
+        values = {name: fields.get(name, default) for name, default in CONFIG_FIELDS.items()}
+        values["chance_events"] = tuple(values["chance_events"])
+
+        config = object.__new__(cls)
+        config._set_fields(values)
+        return config
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in CONFIG_FIELDS}
+
+    @property
+    def content_hash(self):
+        """
+        Stable sha256 hex digest of the field values.
+        """
+        return self._content_hash
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"SimulationConfig is immutable, use with_overrides({name}=...) instead.")
+
+    def __delattr__(self, name):
+        raise AttributeError("SimulationConfig is immutable.")
+
+    def __eq__(self, other):
+        if not isinstance(other, SimulationConfig):
+            return NotImplemented
+        return self._content_hash == other._content_hash
+
+    def __hash__(self):
+        return hash(self._content_hash)
+
+    def __repr__(self):
+        return f"SimulationConfig({self.to_dict()})"
+
+    def __getstate__(self):
+        return self.to_dict()
+
+    def __setstate__(self, state):
+        self._set_fields(state)
+
+
+# Fields of a turn outcome, in the order of the tuples of `Simulation.iter_turn_values`
+TURN_OUTCOME_FIELDS = (
+    "turn",
+    "player_position",
+    "player_cash",
+    "properties_owned",
+    "event",
+    "description",
+    "amount",
+    "end_game_status",
+)
+
+
+class TurnSubscription:
+    """
+    Consumer of the turn records of some event kinds (None: all), built with only the requested fields.
+    """
+    __slots__ = ("callback", "events", "fields", "indices")
+
+    def __init__(self, callback, events=None, fields=None):
+        fields = TURN_OUTCOME_FIELDS if fields is None else tuple(fields)
+        unknown = set(fields) - set(TURN_OUTCOME_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown turn outcome fields: {sorted(unknown)}")
+        self.callback = callback
+        self.events = None if events is None else frozenset(events)
+        self.fields = fields
+        self.indices = [(field, TURN_OUTCOME_FIELDS.index(field)) for field in fields]
+
+    def notify(self, values):
+        self.callback({field: values[i] for field, i in self.indices})
 
 
 class Simulation:
-    def __init__(self, config: SimulationConfig, player: Player):
+    def __init__(self, config: SimulationConfig, player: Player, event_bus: EventBus=None):
         self.config = config
         self.current_turn = 0
-        self.board = Board(self.config) 
+        self.rng = random.Random() # board layout and dice stream, seeded per game in reset()
+        self.board = Board(self.config, self.rng) 
+        self.dice = create_dice_sampler(self.config, self.rng)
+        self.chance_deck = create_chance_deck(self.config, self.rng)
         self.player = player
         self.turn_outcomes_queue = deque() 
+
+        # Turn outcome value tuples go to the local queue unless an event bus is provided
+        self.event_bus = event_bus
+        self.publish_turn_outcome = event_bus.publish if event_bus is not None else self.turn_outcomes_queue.append
+
+        # Observers of `observe`, see `subscribe`
+        self.subscriptions = []
+        self.update_subscribers()
+
+        # Buy (1) / skip (0) choices of the player when recording a replay (see replay.py)
+        self.decisions = None
         
 
-    def reset(self):
+    def reset(self, seed=None):
+        """
+        Prepares a new game. With a `seed` the board layout and dice rolls of the game are reproducible.
+        """
+        if seed is not None:
+            self.rng.seed(seed)
         self.current_turn = 0
-        self.board = Board(self.config) 
+        self.board = Board(self.config, self.rng) 
+        self.dice = create_dice_sampler(self.config, self.rng)
+        self.chance_deck = create_chance_deck(self.config, self.rng)
         self.player.reset(self.config.start_cash)
 
-    def die_roll(self):
-        return random.randint(1, self.config.die_faces)
+    def flush_turn_outcomes(self):
+        """
+        Hands buffered turn outcomes of the finished game to the event bus transport.
+        """
+        if self.event_bus is not None:
+            self.event_bus.flush()
 
-    def play_chance_event(self, chance_event: Dict[str, Any]):
-        print(f"Chance event: {chance_event["description"]}")
-        
-                    
-        if chance_event["action"] == "receive":
-            print(f"Player receives {chance_event["amount"]}")
-            self.player.receive(chance_event["amount"])
+    def die_roll(self):
+        """
+        Steps of one move. With `roll_again_on_doubles` the roll after a double is already added to them.
+        """
+        steps, doubles = self.dice.draw()
+        if doubles and self.config.roll_again_on_doubles:
+            print("Player rolled doubles and rolls again")
+        return steps
+
+    def offer_property(self, field):
+        """
+        Lets the player decide on buying a property. When recording, the choice is appended to `decisions`,
+        also when paying for the property bankrupts the player.
+        """
+        try:
+            bought = self.player.buy_property(field, self.current_turn)
+        except Player.Bankrupcy:
+            if self.decisions is not None:
+                self.decisions.append(1)
+            raise
+        if self.decisions is not None:
+            self.decisions.append(1 if bought else 0)
+        return bought
+
+    def apply_chance_effect(self, action: int, amount: int):
+        if action == RECEIVE:
+            print(f"Player receives {amount}")
+            self.player.receive(amount)
         
-        elif chance_event["action"] == "pay":
-            print(f"Player must pay {chance_event["amount"]}")
-            self.player.pay(chance_event["amount"])
+        elif action == PAY:
+            print(f"Player must pay {amount}")
+            self.player.pay(amount)
         
-        elif chance_event["action"] == "move":
-            print(f"Player moves {chance_event["amount"]} steps")
-            self.player.move(chance_event["amount"], self.config.board_size)
+        elif action == MOVE:
+            print(f"Player moves {amount} steps")
+            self.player.move(amount, self.config.board_size)
         
-        elif chance_event["action"] == "skip":
+        elif action == SKIP:
             print("Player skips the next turn")
             if self.current_turn != self.config.max_turns -1:
                 self.current_turn += 1
@@ -88,20 +278,99 @@ class Simulation:
 
 
     def run(self):
-    
-        while self.current_turn <= self.config.max_turns:
-            
-            turn_outcome = {
-                "turn": self.current_turn,
-                "player_position": self.player.position, #where player stepped on the board
-                "player_cash": self.player.cash,
-                "properties_owned": self.player.properties,
-                "event": None,  # chance event, tax, property purchase or rent payment
-                "description": None,  # description of the event
-                "amount": None,  # amount of cash involved in the event
-                "end_game_status": None, # win or bancrupt
-                
+        """
+        Plays the game to the end and publishes every turn outcome (to `turn_outcomes_queue` or the event bus)
+        as a tuple of values in the order of TURN_OUTCOME_FIELDS; consumers build records from them if needed.
+        """
+        publish_turn_outcome = self.publish_turn_outcome
+        for values in self.iter_turn_values():
+            publish_turn_outcome(values)
+        self.flush_turn_outcomes()
+
+    def subscribe(self, callback, events=None, fields=None):
+        """
+        Registers `callback` for the turn records of the given event kinds (e.g. ("Rent Payment",), all
+        kinds if None). Each record is a dict holding only `fields` (names of TURN_OUTCOME_FIELDS, all if None).
+        Records are built by `observe`, and only for turns some subscriber is registered for.
+        Returns the subscription, to be passed to `unsubscribe`.
+        """
+        subscription = TurnSubscription(callback, events, fields)
+        self.subscriptions.append(subscription)
+        self.update_subscribers()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        self.subscriptions.remove(subscription)
+        self.update_subscribers()
+
+    def update_subscribers(self):
+        # Subscriptions per event kind, and those registered for every kind
+        self.all_event_subscribers = [s for s in self.subscriptions if s.events is None]
+        self.event_subscribers = {}
+        for subscription in self.subscriptions:
+            for event in subscription.events or ():
+                self.event_subscribers.setdefault(event, []).append(subscription)
+        for event, subscribers in self.event_subscribers.items():
+            subscribers.extend(self.all_event_subscribers)
+
+    def observe(self, turn_log=None):
+        """
+        Plays the game to the end, handing records only to the subscribers of each turn's event kind.
+        Turns nobody subscribed to build no record at all. With a `turn_log` list the values of every
+        turn are appended to it. Returns the values of the last turn.
+        """
+        event_subscribers = self.event_subscribers
+        all_event_subscribers = self.all_event_subscribers
+        values = None
+        for values in self.iter_turn_values():
+            if turn_log is not None:
+                turn_log.append(values)
+            subscribers = event_subscribers.get(values[4], all_event_subscribers)
+            for subscription in subscribers:
+                subscription.notify(values)
+        return values
+
+    def play_games(self, num_games, log_sampler, seed=None, first_game_no=0):
+        """
+        Plays `num_games` games for subscribers (see `observe`), keeping a summary of every game and
+        turn logs only for the games `log_sampler` (a GameLogSampler) selects.
+        With a `seed`, game `g` is played with seed `seed + g`.
+        """
+        for game_no in range(first_game_no, first_game_no + num_games):
+            game_seed = None if seed is None else seed + game_no
+            self.reset(game_seed)
+            turn_log = [] if log_sampler.start_game() else None
+            last_turn = self.observe(turn_log)
+            log_sampler.end_game(game_no, game_seed, last_turn, turn_log)
+        return log_sampler
+
+    def iter_turns(self):
+        """
+        Plays the game lazily, yielding one turn outcome per turn; nothing is published.
+        The consumer can stop at any turn (the game is then abandoned, `reset` before the next one).
+        """
+        for turn, player_position, player_cash, properties_owned, event, description, amount, end_game_status in self.iter_turn_values():
+            yield {
+                "turn": turn,
+                "player_position": player_position, #where player stepped on the board
+                "player_cash": player_cash,
+                "properties_owned": properties_owned,
+                "event": event,  # chance event, tax, property purchase or rent payment
+                "description": description,  # description of the event
+                "amount": amount,  # amount of cash involved in the event
+                "end_game_status": end_game_status, # win or bancrupt
             }
+
+    def iter_turn_values(self):
+        """
+        Plays the game lazily, yielding every turn as a tuple of values in the order of TURN_OUTCOME_FIELDS.
+        """
+        while self.current_turn <= self.config.max_turns:
+
+            turn = self.current_turn
+            player_position = self.player.position
+            player_cash = self.player.cash
+            event = description = amount = None
             
             if self.current_turn < self.config.max_turns:
 
@@ -114,64 +383,73 @@ class Simulation:
                     
                     prev_position, new_position = self.player.move(steps, self.config.board_size)
                     print(f"Player moved from {prev_position} to {new_position}")
-                    turn_outcome["player_position"] = new_position
+                    player_position = new_position
 
-                    if prev_position > new_position:
+                    # A move of board_size steps or more can pass the start field more than once
+                    laps = (prev_position + steps) // self.config.board_size
+                    if laps:
                         print("Player has passed the start field, receiving cash.")
-                        self.player.receive(self.config.start_passing_cash)
+                        self.player.receive(laps * self.config.start_passing_cash)
 
                     
-                    field = self.board.get_field(new_position)
-                    print(f"Player landed on {field.field_type} field")
+                    board = self.board
+                    field_code = board.field_codes.get(new_position)
+                    if field_code is None:
+                        field_code = board.reveal(new_position)
+                    print(f"Player landed on {FIELD_TYPE_NAMES[field_code]} field")
                     
-                    if field.field_type == "Start":
+                    if field_code == START:
                         print("Player is on the Start field")
                         
-                        turn_outcome["event"] = "Start"
-                        turn_outcome["description"] = "Received cash from Start field"
-                        turn_outcome["amount"] = self.config.start_passing_cash
+                        event = "Start"
+                        description = "Received cash from Start field"
+                        amount = self.config.start_passing_cash
                     
-                    elif field.field_type == "Tax":
-                        print(f"Player pays tax of {field.tax_amount}")
-                        self.player.pay(field.tax_amount)
-
-                        turn_outcome["event"] = "Tax"
-                        turn_outcome["description"] = f"Paid tax"
-                        turn_outcome["amount"] = -field.tax_amount
+                    elif field_code == TAX:
+                        tax_amount = board.tax_amounts[new_position]
+                        print(f"Player pays tax of {tax_amount}")
+                        self.player.pay(tax_amount)
+
+                        event = "Tax"
+                        description = "Paid tax"
+                        amount = -tax_amount
                     
-                    elif field.field_type == "Chance":
-                        chance_event = field.chance_event
-                        self.play_chance_event(chance_event)
-
-                        turn_outcome["event"] = "Chance"
-                        turn_outcome["description"] = chance_event["description"]
-                        turn_outcome["amount"] = chance_event["amount"]
+                    elif field_code == CHANCE:
+                        if self.chance_deck is not None:
+                            action, amount, description = self.chance_deck.draw()
+                        else:
+                            action, amount = board.chance_effects[new_position]
+                            description = board.chance_descriptions[new_position]
+                        print(f"Chance event: {description}")
+                        self.apply_chance_effect(action, amount)
+                        event = "Chance"
 
                                     
-                    elif field.field_type == "Property":
-                        if not field.is_owned:
+                    elif field_code == PROPERTY:
+                        field = board.get_field(new_position)
+                        if not board.is_owned(new_position):
                             print(f"Player buys property {field.name} for {field.price}")
-                            bought = self.player.buy_property(field, self.current_turn )
+                            bought = self.offer_property(field)
 
                             if bought:
-                                field.is_owned = True  
-                                self.board.set_field(new_position, field)  # Update the board with the new property state
+                                board.mark_owned(new_position)
 
-                                turn_outcome["event"] = "Property Purchase"
-                                turn_outcome["description"] = field.name
-                                turn_outcome["amount"] = -field.price
+                                event = "Property Purchase"
+                                description = field.name
+                                amount = -board.property_prices[new_position]
                             else:
                                 print(f"Player skipped buying property {field.name}")
-                                turn_outcome["event"] = "Buy Skip"
-                                turn_outcome["description"] = field.name
-                                turn_outcome["amount"] = 0
+                                event = "Buy Skip"
+                                description = field.name
+                                amount = 0
                         else:
-                            print(f"Player pays rent of {field.rent}")
-                            self.player.pay(field.rent)
+                            rent = board.property_rents[new_position]
+                            print(f"Player pays rent of {rent}")
+                            self.player.pay(rent)
 
-                            turn_outcome["event"] = "Rent Payment"
-                            turn_outcome["description"] = field.name
-                            turn_outcome["amount"] = -field.rent
+                            event = "Rent Payment"
+                            description = field.name
+                            amount = -rent
 
                 except Player.Bankrupcy as e:
                     print(e)
@@ -179,27 +457,43 @@ class Simulation:
                     if isinstance(self.player, QLearningPlayer):
                         self.player.lose()
 
-                    turn_outcome["end_game_status"] = "Bankrupcy"
-                    turn_outcome["event"] = "Game Over"
-                    turn_outcome["description"] = "Player has gone bancrupt"
-                    self.turn_outcomes_queue.append(turn_outcome) 
-
+                    yield (turn, player_position, player_cash, self.player.properties,
+                           "Game Over", "Player has gone bancrupt", None, "Bankrupcy")
                     return
                 
-                self.turn_outcomes_queue.append(turn_outcome) 
+                yield (turn, player_position, player_cash, self.player.properties,
+                       event, description, amount, None)
                 self.current_turn += 1
 
             else:
                 if isinstance(self.player, QLearningPlayer):
                     self.player.win()
                 
-                turn_outcome["end_game_status"] = "Win"
-                turn_outcome["event"] = "Win"
-                turn_outcome["description"] = f"🏆🎉 Player has won the game! (by lasting for {self.config.max_turns} turns without going bancrupt)"
-                self.turn_outcomes_queue.append(turn_outcome) 
-                print(turn_outcome["description"])
+                description = f"🏆🎉 Player has won the game! (by lasting for {self.config.max_turns} turns without going bancrupt)"
+                print(description)
+                yield (turn, player_position, player_cash, self.player.properties,
+                       "Win", description, None, "Win")
                 return
 
+    async def aiter_turns(self, yield_every=1):
+        """
+        Async variant of `iter_turns`, handing control back to the event loop every `yield_every` turns.
+        """
+        for turn_no, turn_outcome in enumerate(self.iter_turns(), 1):
+            yield turn_outcome
+            if turn_no % yield_every == 0:
+                await asyncio.sleep(0)
+
+    def iter_games(self, num_games, seed=None):
+        """
+        Plays `num_games` games lazily, resetting before each one, and yields (game index, turn outcome).
+        With a `seed`, game `g` is played with seed `seed + g`.
+        """
+        for game_no in range(num_games):
+            self.reset(None if seed is None else seed + game_no)
+            for turn_outcome in self.iter_turns():
+                yield game_no, turn_outcome
+
 
 
 def config_and_run_multiple_simulations(
@@ -214,10 +508,11 @@ def config_and_run_multiple_simulations(
     if not os.path.exists(default_config_path):
         raise FileNotFoundError(f"Default configuration file '{default_config_path}' does not exist.")
 
-    config = SimulationConfig(default_config_path)
-    config.player_type = player_type
-    config.start_cash = start_cash
-    config.max_turns = max_turns
+    config = SimulationConfig(default_config_path).with_overrides(
+        player_type=player_type,
+        start_cash=start_cash,
+        max_turns=max_turns,
+    )
 
     
     player = create_player_from_type(
@@ -0,0 +1,344 @@
+"""
+Compact binary file format for full turn logs.
+
+Layout of a file:
+- header: magic, then a JSON document with the board layout (board size and the config of the games)
+  and the turn outcome fields stored
+- one block per game, every value a varint:
+  number of turns, end game status code, then column by column
+  position (delta modulo the board size), cash (zigzag delta) and outcome kind code
+- trailer: the string table (events, descriptions and statuses are codes into it, 0 is None),
+  the outcome kind table, the game index (game number, offset, size and turns of every block),
+  then the trailer offset and magic
+
+An outcome kind is what a turn adds besides the player's move and cash: the turn delta, the change
+in the number of owned properties, the event, its description and its amount. A game only has a few
+dozen different kinds (one per tax, chance card and property), so a turn costs about four bytes.
+
+The string table is kept in the trailer rather than the header, so the writer can stream games to
+disk without knowing all descriptions up front. The game index gives random access to any game,
+and the reader decodes the varints of all blocks at once with NumPy, straight into columns.
+
+Example:
+    python -m monopoly_simulation.turn_log --num_games 2000 --output games.turnlog
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import struct
+import time
+
+import numpy as np
+import pandas as pd
+
+from monopoly_simulation.player import create_player_from_type
+from monopoly_simulation.replay import write_varint, read_varint
+from monopoly_simulation.simualtion import Simulation, SimulationConfig, TURN_OUTCOME_FIELDS
+
+
+TURN_LOG_MAGIC = b"MSTL1"
+TRAILER = struct.Struct("<Q5s")  # trailer offset, magic
+COLUMNS = ("player_position", "player_cash", "kind")
+KIND_FIELDS = ("turn", "properties_owned", "event", "description", "amount")
+
+
+def zigzag(value):
+    return value << 1 if value >= 0 else (-value << 1) - 1
+
+
+def decode_varints(data):
+    """
+    All LEB128 varints of a buffer, decoded at once into an int64 array (values must fit in 63 bits).
+    """
+    b = np.frombuffer(data, dtype=np.uint8)
+    if not len(b):
+        return np.zeros(0, dtype=np.int64)
+    end_indices = np.flatnonzero(b < 0x80)
+    starts = np.empty_like(end_indices)
+    starts[0] = 0
+    starts[1:] = end_indices[:-1] + 1
+    if len(end_indices) == len(b):
+        return b.astype(np.int64)
+    # Position of every byte within its varint gives the shift of its 7 bits
+    shifts = np.arange(len(b)) - np.repeat(starts, end_indices - starts + 1)
+    parts = (b & 0x7F).astype(np.int64) << (7 * shifts)
+    return np.bitwise_or.reduceat(parts, starts)
+
+
+def unzigzag(values):
+    return (values >> 1) ^ -(values & 1)
+
+
+class TurnLogWriter:
+    """
+    Streams games to a turn log file. Turns are encoded when they are added, so owned properties are
+    counted at that time; `close` (or leaving the `with` block) writes the string table and game index.
+    """
+    def __init__(self, path, config):
+        self.file = open(path, "wb")
+        self.board_size = config.board_size
+        self.strings = {}
+        self.kinds = {}
+        self.index = []
+        header = json.dumps({
+            "board_size": config.board_size,
+            "config": config.to_dict(),
+            "fields": TURN_OUTCOME_FIELDS,
+        }, sort_keys=True).encode("utf-8")
+        out = bytearray(TURN_LOG_MAGIC)
+        write_varint(out, len(header))
+        out += header
+        self.file.write(out)
+        self.offset = len(out)
+        self.start_game()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def string_code(self, value):
+        if value is None:
+            return 0
+        code = self.strings.get(value)
+        if code is None:
+            code = self.strings[value] = len(self.strings) + 1
+        return code
+
+    def kind_code(self, kind):
+        code = self.kinds.get(kind)
+        if code is None:
+            code = self.kinds[kind] = len(self.kinds)
+        return code
+
+    def start_game(self):
+        self.columns = tuple([] for _ in COLUMNS)
+        self.last = (0, 0, 0, 0)  # turn, position, cash, properties owned of the previous turn
+        self.end_game_status = None
+
+    def add_turn(self, turn_outcome):
+        """
+        Adds a turn of the current game, as a turn outcome dict or a tuple of `Simulation.iter_turn_values`.
+        """
+        if isinstance(turn_outcome, dict):
+            turn_outcome = tuple(turn_outcome[field] for field in TURN_OUTCOME_FIELDS)
+        turn, position, cash, properties_owned, event, description, amount, end_game_status = turn_outcome
+        if not isinstance(properties_owned, int):
+            properties_owned = len(properties_owned)
+        last_turn, last_position, last_cash, last_properties = self.last
+        positions, cash_deltas, kinds = self.columns
+        positions.append((position - last_position) % self.board_size)
+        cash_deltas.append(zigzag(cash - last_cash))
+        kinds.append(self.kind_code((
+            turn - last_turn,
+            zigzag(properties_owned - last_properties),
+            self.string_code(event),
+            self.string_code(description),
+            0 if amount is None else zigzag(amount) + 1,
+        )))
+        self.last = (turn, position, cash, properties_owned)
+        if end_game_status is not None:
+            self.end_game_status = end_game_status
+
+    def end_game(self, game_no):
+        """
+        Writes the block of the current game under number `game_no`.
+        """
+        num_turns = len(self.columns[0])
+        out = bytearray()
+        write_varint(out, num_turns)
+        write_varint(out, self.string_code(self.end_game_status))
+        for column in self.columns:
+            for value in column:
+                write_varint(out, value)
+        self.file.write(out)
+        self.index.append((game_no, self.offset, len(out), num_turns))
+        self.offset += len(out)
+        self.start_game()
+
+    def write_game(self, game_no, turn_outcomes):
+        for turn_outcome in turn_outcomes:
+            self.add_turn(turn_outcome)
+        self.end_game(game_no)
+
+    def close(self):
+        if self.file.closed:
+            return
+        out = bytearray()
+        write_varint(out, len(self.strings))
+        for value in self.strings:
+            encoded = value.encode("utf-8")
+            write_varint(out, len(encoded))
+            out += encoded
+        write_varint(out, len(self.kinds))
+        for kind in self.kinds:
+            for value in kind:
+                write_varint(out, value)
+        write_varint(out, len(self.index))
+        previous_offset = 0
+        for game_no, offset, size, num_turns in self.index:
+            write_varint(out, game_no)
+            write_varint(out, offset - previous_offset)
+            write_varint(out, size)
+            write_varint(out, num_turns)
+            previous_offset = offset
+        out += TRAILER.pack(self.offset, TURN_LOG_MAGIC)
+        self.file.write(out)
+        self.file.close()
+
+
+class TurnLogReader:
+    """
+    Reads a turn log file: `read_game` decodes one game through the index, `read` all games.
+    Columns are NumPy arrays; event, description and end game status are object arrays of strings
+    (None where empty), amount is a float array (NaN where empty), properties_owned is a count.
+    """
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            self.data = file.read()
+        data = self.data
+        if data[:len(TURN_LOG_MAGIC)] != TURN_LOG_MAGIC:
+            raise ValueError("Not a turn log file.")
+        trailer_offset, magic = TRAILER.unpack_from(data, len(data) - TRAILER.size)
+        if magic != TURN_LOG_MAGIC:
+            raise ValueError("The turn log file is incomplete (writer not closed).")
+
+        header_size, offset = read_varint(data, len(TURN_LOG_MAGIC))
+        self.header = json.loads(data[offset:offset + header_size].decode("utf-8"))
+        self.board_size = self.header["board_size"]
+        self.data_offset = offset + header_size
+        self.data_end = trailer_offset
+
+        num_strings, offset = read_varint(data, trailer_offset)
+        strings = [None]
+        for _ in range(num_strings):
+            size, offset = read_varint(data, offset)
+            strings.append(data[offset:offset + size].decode("utf-8"))
+            offset += size
+        self.strings = np.array(strings, dtype=object)
+
+        num_kinds, offset = read_varint(data, offset)
+        kinds = []
+        for _ in range(num_kinds * len(KIND_FIELDS)):
+            value, offset = read_varint(data, offset)
+            kinds.append(value)
+        # One column per kind field, indexed by kind code
+        self.kinds = np.array(kinds, dtype=np.int64).reshape(num_kinds, len(KIND_FIELDS)).T
+
+        num_games, offset = read_varint(data, offset)
+        self.games = {}  # game number -> (offset, size, turns)
+        block_offset = 0
+        for _ in range(num_games):
+            game_no, offset = read_varint(data, offset)
+            delta, offset = read_varint(data, offset)
+            size, offset = read_varint(data, offset)
+            num_turns, offset = read_varint(data, offset)
+            block_offset += delta
+            self.games[game_no] = (block_offset, size, num_turns)
+
+    def __len__(self):
+        return len(self.games)
+
+    def read_game(self, game_no):
+        offset, size, _ = self.games[game_no]
+        return self.decode_blocks(self.data[offset:offset + size], [game_no])
+
+    def read(self):
+        return self.decode_blocks(self.data[self.data_offset:self.data_end], list(self.games))
+
+    def decode_blocks(self, data, game_numbers):
+        values = decode_varints(data)
+        counts = np.empty(len(game_numbers), dtype=np.int64)
+        statuses = np.empty(len(game_numbers), dtype=np.int64)
+        column_slices = [[] for _ in COLUMNS]
+        position = 0
+        for g in range(len(game_numbers)):
+            num_turns = int(values[position])
+            counts[g] = num_turns
+            statuses[g] = values[position + 1]
+            position += 2
+            for column in column_slices:
+                column.append(values[position:position + num_turns])
+                position += num_turns
+        positions, cash, kinds = (
+            np.concatenate(column) if column else np.zeros(0, dtype=np.int64) for column in column_slices
+        )
+        turns, properties, events, descriptions, amounts = (kind_field[kinds] for kind_field in self.kinds)
+
+        starts = np.cumsum(counts) - counts
+        columns = {
+            "game_no": np.repeat(np.asarray(game_numbers, dtype=np.int64), counts),
+            "turn": per_game_cumsum(turns, starts, counts),
+            "player_position": per_game_cumsum(positions, starts, counts) % self.board_size,
+            "player_cash": per_game_cumsum(unzigzag(cash), starts, counts),
+            "properties_owned": per_game_cumsum(unzigzag(properties), starts, counts),
+            "event": self.strings[events],
+            "description": self.strings[descriptions],
+            "amount": np.where(amounts == 0, np.nan, unzigzag(amounts - 1)),
+        }
+        end_game_status = np.full(len(turns), None, dtype=object)
+        last_turns = starts + counts - 1
+        end_game_status[last_turns[counts > 0]] = self.strings[statuses[counts > 0]]
+        columns["end_game_status"] = end_game_status
+        return columns
+
+    def read_df(self):
+        return pd.DataFrame(self.read())
+
+
+def per_game_cumsum(deltas, starts, counts):
+    """
+    Running sums of `deltas` restarting at every game.
+    """
+    sums = np.cumsum(deltas)
+    if not len(sums):
+        return sums
+    before_game = sums[starts[counts > 0]] - deltas[starts[counts > 0]]
+    return sums - np.repeat(before_game, counts[counts > 0])
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Write games to a turn log and compare it with CSV.")
+    parser.add_argument("--config_path", type=str, default=os.path.join("monopoly_simulation", "config", "default_config.yaml"))
+    parser.add_argument("--player_type", type=str, default="always_buy", choices=["always_buy", "never_buy", "qlearning"])
+    parser.add_argument("--num_games", type=int, default=2000)
+    parser.add_argument("--output", type=str, default="games.turnlog")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    config = SimulationConfig(args.config_path).with_overrides(player_type=args.player_type)
+    player = create_player_from_type(player_type=config.player_type, start_cash=config.start_cash)
+    simulation = Simulation(config, player)
+
+    rows = []
+    # The engine prints every turn
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull), TurnLogWriter(args.output, config) as writer:
+        for game_no in range(args.num_games):
+            simulation.reset(game_no)
+            for turn_outcome in simulation.iter_turns():
+                writer.add_turn(turn_outcome)
+                rows.append({"game_no": game_no, **turn_outcome, "properties_owned": len(turn_outcome["properties_owned"])})
+            writer.end_game(game_no)
+
+    csv = pd.DataFrame(rows).to_csv(index=False).encode("utf-8")
+    start = time.perf_counter()
+    pd.read_csv(io.BytesIO(csv))
+    csv_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    columns = TurnLogReader(args.output).read()
+    log_seconds = time.perf_counter() - start
+
+    log_size = os.path.getsize(args.output)
+    print(f"{len(rows)} turns of {args.num_games} games")
+    print(f"CSV: {len(csv)} bytes, read in {csv_seconds:.3f}s")
+    print(f"Turn log: {log_size} bytes ({len(csv) / log_size:.1f}x smaller), read in {log_seconds:.3f}s")
+    print(f"Decoded turn log matches the games: {pd.DataFrame(columns).equals(pd.DataFrame(rows)[list(columns)].astype({'amount': float}))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,7 @@ setup(
             'compare-reward-strategies=monopoly_simulation.cli:compare_reward_strategies',
             'compare-start-cash=monopoly_simulation.cli:compare_start_cash',
             'compare-players=monopoly_simulation.cli:compare_players',
+            'monopoly-distributed=monopoly_simulation.experiments.distributed:main',
         ],
     },
 )
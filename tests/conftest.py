@@ -0,0 +1,13 @@
+import os
+
+import pytest
+
+from monopoly_simulation.simualtion import SimulationConfig
+
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "monopoly_simulation", "config", "default_config.yaml")
+
+
+@pytest.fixture
+def config():
+    return SimulationConfig(CONFIG_PATH).with_overrides(max_turns=25)
@@ -0,0 +1,39 @@
+import random
+
+from monopoly_simulation import fields as field_types
+from monopoly_simulation.board import Board
+from monopoly_simulation.fields import PropertyField, TaxField
+
+
+def placed_counts(board):
+    counts = [0, 0, 0, 0]
+    for position in range(1, board.board_size):
+        counts[board.field_codes[position]] += 1
+    return counts
+
+
+def test_revealing_every_position_places_every_field(config):
+    board = Board(config, random.Random(0))
+    board.fields
+    assert board.field_codes[0] == field_types.START
+    assert placed_counts(board)[1:] == [config.tax_fields, config.chance_fields, config.property_fields]
+
+
+def test_reveal_is_reproducible(config):
+    first = Board(config, random.Random(5))
+    second = Board(config, random.Random(5))
+    for position in (7, 3, 12):
+        assert first.reveal(position) == second.reveal(position)
+
+
+def test_set_field_keeps_unplaced_fields_in_sync(config):
+    board = Board(config, random.Random(0))
+    code = board.reveal(1)
+    replacement = PropertyField("Custom", 100, 10) if code != field_types.PROPERTY else TaxField(tax_amount=10)
+    board.set_field(1, replacement)
+
+    assert board.get_field(1) is replacement
+    assert board.unplaced_total == sum(board.unplaced)
+    # The replaced field is placed on another position instead
+    board.fields
+    assert placed_counts(board)[1:] == [config.tax_fields, config.chance_fields, config.property_fields]
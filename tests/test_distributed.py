@@ -0,0 +1,53 @@
+from monopoly_simulation.experiments.distributed import SQLiteJobBroker
+
+
+def shard(title, seed_start):
+    return {"simulation_title": title, "seed_start": seed_start}
+
+
+def test_shards_are_claimed_once_in_order(tmp_path):
+    broker = SQLiteJobBroker(str(tmp_path / "broker.db"))
+    broker.publish("job", [shard("a", 0), shard("a", 10)])
+
+    first_id, first = broker.claim("w1")
+    second_id, second = broker.claim("w2")
+    assert (first["seed_start"], second["seed_start"]) == (0, 10)
+    assert broker.claim("w3") is None
+
+    assert broker.complete(first_id, "w1", {"games": 10})
+    assert not broker.complete(second_id, "w1", {"games": 10})  # not the worker holding the lease
+    assert broker.progress("job") == {"done": 1, "running": 1}
+    assert broker.unfinished("job") == 1
+
+
+def test_expired_leases_are_retried_then_failed(tmp_path):
+    broker = SQLiteJobBroker(str(tmp_path / "broker.db"), lease_seconds=-1, max_attempts=2)
+    broker.publish("job", [shard("a", 0)])
+
+    shard_id, _ = broker.claim("w1")
+    # The lease of w1 is already over, so the shard is handed out again
+    assert broker.claim("w2")[0] == shard_id
+    assert not broker.complete(shard_id, "w1", {})
+    broker.reclaim_expired()
+    assert broker.progress("job") == {"failed": 1}
+    assert broker.unfinished() == 0
+
+
+def test_failed_shards_go_back_to_the_queue(tmp_path):
+    broker = SQLiteJobBroker(str(tmp_path / "broker.db"), max_attempts=2)
+    broker.publish("job", [shard("a", 0)])
+
+    shard_id, _ = broker.claim("w1")
+    broker.fail(shard_id, "w1", "boom")
+    assert broker.progress("job") == {"pending": 1}
+    shard_id, _ = broker.claim("w1")
+    broker.fail(shard_id, "w1", "boom")
+    assert broker.progress("job") == {"failed": 1}
+
+
+def test_fail_unfinished(tmp_path):
+    broker = SQLiteJobBroker(str(tmp_path / "broker.db"))
+    broker.publish("job", [shard("a", 0), shard("b", 0)])
+    broker.claim("w1")
+    broker.fail_unfinished("job", "Timed out")
+    assert broker.progress("job") == {"failed": 2}
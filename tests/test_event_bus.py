@@ -0,0 +1,81 @@
+import threading
+
+from monopoly_simulation.event_bus import (
+    END_OF_STREAM,
+    EventBus,
+    RingBufferTransport,
+    SocketBroker,
+    SocketTransport,
+    decode_batch,
+    encode_batch,
+)
+from monopoly_simulation.fields import PropertyField
+from monopoly_simulation.multiplayer import MULTIPLAYER_TURN_OUTCOME_FIELDS, MultiPlayerSimulation, create_players
+from monopoly_simulation.simualtion import TURN_OUTCOME_FIELDS
+
+
+def test_events_are_sent_in_batches():
+    transport = RingBufferTransport()
+    bus = EventBus(transport, batch_size=3)
+    for event in range(7):
+        bus.publish((event,))
+    assert transport.size == 2
+    bus.close()
+
+    batches = list(EventBus(transport).subscribe())
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    assert [event for batch in batches for event in batch] == [(event,) for event in range(7)]
+
+
+def test_ring_buffer_blocks_producers_when_full():
+    transport = RingBufferTransport(capacity=2)
+    bus = EventBus(transport, batch_size=1)
+
+    def produce():
+        for event in range(5):
+            bus.publish((event,))
+        bus.close()
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+
+    events = list(EventBus(transport).events(timeout=5))
+    producer.join()
+    assert events == [(event,) for event in range(5)]
+
+
+def test_socket_frames_are_json():
+    field = PropertyField("Central Key", 100, 10)
+    batch = [(0, 3, 900, [field], "Property Purchase", "Central Key", -100, None)]
+    payload = encode_batch(batch)
+
+    assert payload.startswith(b"[")
+    assert decode_batch(payload) == [(0, 3, 900, ["Central Key"], "Property Purchase", "Central Key", -100, None)]
+    assert decode_batch(encode_batch(END_OF_STREAM)) == END_OF_STREAM
+
+
+def test_socket_transport_through_broker():
+    broker = SocketBroker().start()
+    try:
+        publisher = EventBus(SocketTransport(broker.host, broker.port, "publisher"), batch_size=2)
+        for event in range(3):
+            publisher.publish((event, "Tax"))
+        publisher.close()
+
+        subscriber = EventBus(SocketTransport(broker.host, broker.port, "subscriber"))
+        assert list(subscriber.events(timeout=5)) == [(0, "Tax"), (1, "Tax"), (2, "Tax")]
+    finally:
+        broker.stop()
+
+
+def test_multiplayer_publishes_turn_outcome_tuples(config):
+    players = create_players(["always_buy", "never_buy"], start_cash=config.start_cash)
+    transport = RingBufferTransport()
+    simulation = MultiPlayerSimulation(config, players, EventBus(transport))
+    simulation.reset(1)
+    simulation.run()
+
+    events = transport.receive(0)
+    assert all(len(values) == len(MULTIPLAYER_TURN_OUTCOME_FIELDS) for values in events)
+    assert MULTIPLAYER_TURN_OUTCOME_FIELDS[:len(TURN_OUTCOME_FIELDS)] == TURN_OUTCOME_FIELDS
+    assert events[-1][7] in ("Win", "Survived")
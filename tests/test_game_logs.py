@@ -0,0 +1,71 @@
+import contextlib
+import io
+
+import pytest
+
+from monopoly_simulation.game_logs import GameLogSampler, bankrupt_before
+from monopoly_simulation.player import create_player_from_type
+from monopoly_simulation.simualtion import Simulation
+
+
+def last_turn(turn, status):
+    return (turn, 0, 100, [], None, None, None, status)
+
+
+def play(sampler, num_games):
+    for game_no in range(num_games):
+        turn_log = [] if sampler.start_game() else None
+        if turn_log is not None:
+            turn_log.append(last_turn(game_no, "Win"))
+        sampler.end_game(game_no, None, last_turn(game_no, "Win"), turn_log)
+
+
+def test_reservoir_keeps_sample_size_games():
+    sampler = GameLogSampler(5, seed=0)
+    play(sampler, 3)
+    assert [game_no for game_no, _ in sampler.sampled_games()] == [0, 1, 2]
+    play(sampler, 100)
+    assert len(sampler.sampled_games()) == 5
+    assert len(sampler.summaries) == 103
+
+
+def test_reservoir_sample_is_uniform():
+    counts = [0] * 20
+    for seed in range(4000):
+        sampler = GameLogSampler(5, seed=seed)
+        play(sampler, 20)
+        for game_no, _ in sampler.sampled_games():
+            counts[game_no] += 1
+    # Every game is sampled with probability 5 / 20
+    assert [count / 4000 for count in counts] == pytest.approx([0.25] * 20, abs=0.03)
+
+
+def test_keep_log_predicate():
+    sampler = GameLogSampler(0, keep_log=bankrupt_before(5))
+    for game_no, (turns, status) in enumerate([(3, "Bankrupcy"), (8, "Bankrupcy"), (25, "Win")]):
+        assert sampler.start_game()
+        sampler.end_game(game_no, None, last_turn(turns, status), [last_turn(turns, status)])
+    assert list(sampler.kept_logs) == [0]
+    assert sampler.sampled_games() == []
+
+
+def test_sampler_needs_a_non_negative_size():
+    with pytest.raises(ValueError):
+        GameLogSampler(-1)
+
+
+def test_play_games_keeps_summaries_of_every_game(config):
+    config = config.with_overrides(player_type="always_buy")
+    simulation = Simulation(config, create_player_from_type("always_buy", start_cash=config.start_cash))
+    with contextlib.redirect_stdout(io.StringIO()):
+        sampler = simulation.play_games(30, GameLogSampler(4, seed=1), seed=0)
+
+    summary_df = sampler.summary_df("always_buy")
+    assert len(summary_df) == 30
+    sampled_df = sampler.sampled_turn_outcomes_df("always_buy")
+    assert sampled_df["game_no"].nunique() == 4
+    # The last turn of every sampled log matches the summary of its game
+    last_turns = sampled_df.groupby("game_no").tail(1).set_index("game_no")
+    summaries = summary_df.set_index("Game No").loc[last_turns.index]
+    assert list(last_turns["turn"]) == list(summaries["Turns Played"])
+    assert list(last_turns["end_game_status"]) == list(summaries["End Game Status"])
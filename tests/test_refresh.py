@@ -0,0 +1,31 @@
+import pytest
+
+from monopoly_simulation.gui.refresh import OutcomeCounters, RefreshPolicy
+
+
+def test_refresh_by_games():
+    policy = RefreshPolicy(every_games=10, every_ms=None)
+    policy.mark_refreshed(0, now=0)
+    assert not policy.should_refresh(9, now=100)
+    assert policy.should_refresh(10, now=0)
+
+
+def test_refresh_by_time():
+    policy = RefreshPolicy(every_games=None, every_ms=500)
+    policy.mark_refreshed(0, now=10.0)
+    assert not policy.should_refresh(1000, now=10.4)
+    assert policy.should_refresh(0, now=10.5)
+    assert policy.poll_seconds() == 0.5
+
+
+def test_refresh_policy_needs_a_limit():
+    with pytest.raises(ValueError):
+        RefreshPolicy(every_games=None, every_ms=None)
+
+
+def test_outcome_counters():
+    counters = OutcomeCounters()
+    counters.add_games(["Win", "Bankrupcy", "Bankrupcy"], [25, 4, 6])
+    assert (counters.games, counters.wins, counters.bankruptcies) == (3, 1, 2)
+    assert counters.avg_turns_bancrupt == 5
+    assert OutcomeCounters().avg_turns_bancrupt == 0.0
@@ -0,0 +1,68 @@
+import contextlib
+import io
+
+import pytest
+
+from monopoly_simulation.player import create_player_from_type
+from monopoly_simulation.replay import (
+    GameReplay,
+    ReplayLog,
+    encode_turn_outcome,
+    pack_decisions,
+    read_varint,
+    unpack_decisions,
+    write_varint,
+)
+from monopoly_simulation.simualtion import Simulation
+
+
+@pytest.mark.parametrize("value", [0, 1, 127, 128, 300, 2**32, 2**63 + 5])
+def test_varint_round_trip(value):
+    out = bytearray(b"x")
+    write_varint(out, value)
+    assert read_varint(out, 1) == (value, len(out))
+
+
+def test_varints_are_non_negative():
+    with pytest.raises(ValueError):
+        write_varint(bytearray(), -1)
+
+
+def test_decisions_round_trip():
+    decisions = [1, 0, 0, 1, 1, 1, 0, 1, 1, 0]
+    packed = pack_decisions(decisions)
+    assert len(packed) == 2
+    assert unpack_decisions(packed, len(decisions)) == decisions
+
+
+def test_game_replay_round_trip():
+    replay = GameReplay(12345, [1, 0, 1])
+    decoded, offset = GameReplay.from_bytes(replay.to_bytes())
+    assert offset == len(replay.to_bytes())
+    assert (decoded.seed, decoded.choices()) == (12345, [1, 0, 1])
+
+
+def test_replays_match_the_recorded_games(config):
+    config = config.with_overrides(player_type="qlearning")
+    player = create_player_from_type("qlearning", start_cash=config.start_cash)
+    log = ReplayLog(config)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        original = [bytearray() for _ in range(20)]
+        for game_no, turn_outcome in log.record_games(Simulation(config, player), 20, seed=7):
+            original[game_no] += encode_turn_outcome(turn_outcome)
+
+        decoded = ReplayLog.from_bytes(log.to_bytes())
+        assert decoded.config == config
+        for game_no in range(20):
+            replayed = b"".join(encode_turn_outcome(turn_outcome) for turn_outcome in decoded.replay(game_no))
+            assert replayed == original[game_no]
+
+
+def test_replay_log_does_not_need_a_config_file(config, tmp_path, monkeypatch):
+    log = ReplayLog(config)
+    path = tmp_path / "games.replay"
+    log.save(path)
+
+    monkeypatch.chdir(tmp_path)
+    assert ReplayLog.load(path).config == config
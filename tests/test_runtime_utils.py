@@ -0,0 +1,28 @@
+from monopoly_simulation.player import create_player_from_type
+from monopoly_simulation.simualtion import Simulation
+from monopoly_simulation.experiments.runtime_utils import run_balanced_and_collect_results
+
+
+def make_simulation(config, player_type):
+    config = config.with_overrides(player_type=player_type)
+    player = create_player_from_type(
+        player_type=config.player_type,
+        start_cash=config.start_cash,
+        alpha=config.alpha,
+        gamma=config.gamma,
+        epsilon=config.epsilon,
+        reward_strategy=config.reward_strategy
+    )
+    return {"title": player_type, "simulation": Simulation(config, player)}
+
+
+def test_balanced_run_with_two_workers(config):
+    simulations = [make_simulation(config, "always_buy"), make_simulation(config, "qlearning")]
+
+    results = run_balanced_and_collect_results(simulations, num_games=20, workers=2)
+
+    for result in results:
+        game_stats_df = result["game_stats_df"]
+        assert len(game_stats_df) == 20
+        assert set(game_stats_df["Simulation Title"]) == {result["title"]}
+    assert results[0]["worker_utilization_df"]["Games"].sum() == 40
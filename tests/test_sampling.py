@@ -0,0 +1,83 @@
+import random
+
+import numpy as np
+import pytest
+
+from monopoly_simulation.sampling import (
+    AliasTable,
+    ChanceDeck,
+    Sampler,
+    deck_copies,
+    dice_roll_distribution,
+    dice_sum_distribution,
+)
+
+
+def frequencies(draws, outcomes):
+    return [draws.count(outcome) / len(draws) for outcome in outcomes]
+
+
+def test_alias_table_follows_weights():
+    table = AliasTable(["a", "b", "c"], [1, 2, 7])
+    rng = random.Random(0)
+    draws = [table.sample(rng) for _ in range(50000)]
+    assert frequencies(draws, ["a", "b", "c"]) == pytest.approx([0.1, 0.2, 0.7], abs=0.01)
+
+
+def test_alias_table_block_sampling_follows_weights():
+    table = AliasTable(["a", "b"], [3, 1])
+    draws = table.sample_block(np.random.default_rng(0), 50000)
+    assert frequencies(draws, ["a", "b"]) == pytest.approx([0.75, 0.25], abs=0.01)
+
+
+def test_alias_table_rejects_bad_weights():
+    with pytest.raises(ValueError):
+        AliasTable(["a", "b"], [1, 0])
+    with pytest.raises(ValueError):
+        AliasTable(["a"], [1, 2])
+
+
+def test_block_sampler_is_reproducible():
+    table = AliasTable(list(range(6)), [1] * 6)
+    sampler_a = Sampler(table, random.Random(3), block_size=8)
+    sampler_b = Sampler(table, random.Random(3), block_size=8)
+    assert [sampler_a.draw() for _ in range(20)] == [sampler_b.draw() for _ in range(20)]
+
+
+def test_dice_sum_distribution():
+    distribution = dice_sum_distribution(2, 6)
+    assert sum(distribution.values()) == pytest.approx(1.0)
+    assert distribution[7] == pytest.approx(6 / 36)
+    assert min(distribution) == 2 and max(distribution) == 12
+
+
+@pytest.mark.parametrize("num_dice", [1, 2, 5])
+@pytest.mark.parametrize("roll_again", [False, True])
+def test_dice_roll_distribution_sums_to_one(num_dice, roll_again):
+    distribution = dice_roll_distribution(num_dice, 6, roll_again)
+    assert sum(distribution.values()) == pytest.approx(1.0)
+
+
+def test_roll_again_on_doubles_adds_a_second_roll():
+    distribution = dice_roll_distribution(2, 6, roll_again_on_doubles=True)
+    # Double ones followed by double ones
+    assert distribution[(4, True)] == pytest.approx(1 / 36 * 1 / 36)
+    assert max(steps for steps, _ in distribution) == 24
+    assert sum(p for (_, doubles), p in distribution.items() if doubles) == pytest.approx(1 / 6)
+
+
+def test_deck_copies():
+    assert deck_copies([2, 4, 6]) == [1, 2, 3]
+    assert deck_copies([1, 1]) == [1, 1]
+    assert deck_copies([0.5, 0.25, 0.25]) == [500, 250, 250]
+    assert deck_copies([1000, 1]) == [1000, 1]
+
+
+def test_chance_deck_follows_weights():
+    events = [
+        {"action": "receive", "amount": 100, "description": "common", "weight": 10},
+        {"action": "pay", "amount": 50, "description": "rare", "weight": 1},
+    ]
+    deck = ChanceDeck(events, random.Random(0))
+    draws = [deck.draw()[2] for _ in range(11000)]
+    assert draws.count("rare") == 1000
@@ -0,0 +1,43 @@
+import concurrent.futures
+import contextlib
+import io
+
+from monopoly_simulation.player import create_player_from_type
+from monopoly_simulation.experiments.scheduler import ArmProgress, GuidedScheduler
+
+
+def make_arm(config, player_type, num_games):
+    config = config.with_overrides(player_type=player_type)
+    return ArmProgress(player_type, config, create_player_from_type(player_type, start_cash=config.start_cash), num_games)
+
+
+def test_every_arm_is_probed_first(config):
+    scheduler = GuidedScheduler(workers=2, probe_chunk=5)
+    arms = [make_arm(config, "always_buy", 100), make_arm(config, "never_buy", 100)]
+    first, second = scheduler.next_shard(arms), scheduler.next_shard(arms)
+    assert {first["simulation_title"], second["simulation_title"]} == {"always_buy", "never_buy"}
+    assert first["num_games"] == second["num_games"] == 5
+
+
+def test_chunks_follow_the_remaining_cost(config):
+    scheduler = GuidedScheduler(workers=2, probe_chunk=5, min_chunk_seconds=0)
+    cheap, costly = make_arm(config, "always_buy", 100), make_arm(config, "never_buy", 100)
+    for arm, seconds in ((cheap, 0.01), (costly, 0.1)):
+        arm.take(5)
+        arm.in_flight -= 1
+        arm.record_cost(5, seconds * 5)
+
+    shard = scheduler.next_shard([cheap, costly])
+    assert shard["simulation_title"] == "never_buy"
+    assert shard["seed_start"] == 5
+
+
+def test_all_games_are_played_once(config):
+    arms = [make_arm(config, "always_buy", 50), make_arm(config, "never_buy", 30)]
+    with contextlib.redirect_stdout(io.StringIO()), concurrent.futures.ThreadPoolExecutor(2) as executor:
+        aggregates, utilization_df = GuidedScheduler(workers=2, probe_chunk=4).run(arms, executor)
+
+    for title, num_games in (("always_buy", 50), ("never_buy", 30)):
+        seeds = sorted(seed for seed, *_ in aggregates[title].game_summaries)
+        assert seeds == list(range(num_games))
+    assert utilization_df["Games"].sum() == 80
@@ -0,0 +1,68 @@
+import pytest
+
+from monopoly_simulation.experiments.sequential_testing import (
+    STOP_MAX_GAMES,
+    STOP_PRECISION,
+    STOP_SEPARATION,
+    ArmStats,
+    corrected_confidence,
+    stopping_reason,
+    z_score,
+)
+
+
+def arm(wins, losses, bankrupt_turns=10):
+    stats = ArmStats()
+    for _ in range(wins):
+        stats.add_game("Win", 100)
+    for i in range(losses):
+        stats.add_game("Bankrupcy", bankrupt_turns + i % 2)
+    return stats
+
+
+def test_z_score():
+    assert z_score(0.95) == pytest.approx(1.959964, abs=1e-6)
+
+
+def test_wilson_interval():
+    low, high = arm(wins=50, losses=50).win_rate_interval(0.95)
+    assert (low, high) == pytest.approx((0.4038, 0.5962), abs=1e-4)
+    # Stays inside [0, 1] and is not degenerate at rates of 0 and 1
+    low, high = arm(wins=0, losses=20).win_rate_interval(0.95)
+    assert low == pytest.approx(0.0, abs=1e-12) and 0.0 < high < 0.2
+    assert ArmStats().win_rate_interval() == (0.0, 1.0)
+
+
+def test_bankrupt_turns_interval():
+    stats = arm(wins=0, losses=100)
+    low, high = stats.bankrupt_turns_interval(0.95)
+    assert stats.avg_turns_before_bankruptcy == pytest.approx(10.5)
+    assert low < 10.5 < high
+    assert arm(wins=5, losses=1).bankrupt_turns_interval() == (None, None)
+
+
+def test_merge_equals_adding_all_games():
+    merged = arm(wins=3, losses=7).merge(arm(wins=5, losses=2))
+    direct = arm(wins=8, losses=9)
+    assert vars(merged) == vars(direct)
+
+
+def test_corrected_confidence_is_bonferroni():
+    assert corrected_confidence(0.95, num_arms=2, max_looks=5) == pytest.approx(1 - 0.05 / 20)
+    assert corrected_confidence(0.95, num_arms=1, max_looks=1, intervals_per_arm=1) == pytest.approx(0.95)
+
+
+def test_stopping_reasons():
+    arms = {"a": arm(wins=0, losses=200), "b": arm(wins=200, losses=0)}
+    assert stopping_reason("a", arms, max_games=1000, min_games=100) == STOP_PRECISION
+    assert stopping_reason("a", arms, max_games=200) == STOP_MAX_GAMES
+    assert stopping_reason("a", arms, max_games=1000, min_games=300) is None
+
+    arms = {"a": arm(wins=20, losses=180, bankrupt_turns=5), "b": arm(wins=120, losses=80, bankrupt_turns=5)}
+    arms["a"].bankrupt_turns_sq_sum *= 100  # wide turns interval, so only separation can stop the arm
+    assert stopping_reason("a", arms, max_games=1000, win_rate_precision=0.01) == STOP_SEPARATION
+
+
+def test_close_arms_keep_playing():
+    arms = {"a": arm(wins=100, losses=100), "b": arm(wins=105, losses=95)}
+    assert stopping_reason("a", arms, max_games=1000, win_rate_precision=0.01) is None
@@ -0,0 +1,52 @@
+import contextlib
+import io
+import random
+
+import pytest
+
+from monopoly_simulation.player import create_player_from_type
+from monopoly_simulation.experiments.shards import make_shards, run_shard
+
+
+@pytest.fixture
+def qlearning_shards(config):
+    def shards(num_games, shard_size):
+        config_ = config.with_overrides(player_type="qlearning")
+        player = create_player_from_type("qlearning", start_cash=config_.start_cash)
+        player.eval_mode()
+        return make_shards("qlearning", config_, player, num_games, shard_size=shard_size)
+    return shards
+
+
+def run_shards(shards):
+    with contextlib.redirect_stdout(io.StringIO()):
+        aggregates = [run_shard(shard) for shard in shards]
+    merged = aggregates[0]
+    for aggregate in aggregates[1:]:
+        merged.merge(aggregate)
+    return merged
+
+
+def test_merged_shards_equal_a_single_shard(qlearning_shards):
+    merged = run_shards(qlearning_shards(60, shard_size=15))
+    single = run_shards(qlearning_shards(60, shard_size=60))
+
+    assert sorted(merged.game_summaries) == sorted(single.game_summaries)
+    assert merged.rent_payments == single.rent_payments
+    assert merged.property_purchases == single.property_purchases
+    assert merged.summary("qlearning") == single.summary("qlearning")
+    assert merged.cash_trajectory.count == single.cash_trajectory.count
+
+
+def test_shards_do_not_touch_the_global_generator(qlearning_shards):
+    random.seed(1)
+    state = random.getstate()
+    run_shards(qlearning_shards(10, shard_size=10))
+    assert random.getstate() == state
+
+
+def test_shard_with_a_changed_config_is_rejected(qlearning_shards):
+    shard = qlearning_shards(5, shard_size=5)[0]
+    shard["config"] = shard["config"].with_overrides(max_turns=10)
+    with pytest.raises(ValueError):
+        run_shard(shard)
@@ -0,0 +1,39 @@
+from monopoly_simulation.player import create_player_from_type
+from monopoly_simulation.simualtion import Simulation
+
+
+class FixedDice:
+    """
+    Dice sampler stand-in returning the given (steps, doubles) rolls.
+    """
+    def __init__(self, rolls):
+        self.rolls = list(rolls)
+
+    def draw(self):
+        return self.rolls.pop(0)
+
+
+def test_long_moves_pay_the_start_bonus_once_per_lap(config):
+    config = config.with_overrides(player_type="never_buy")
+    simulation = Simulation(config, create_player_from_type("never_buy", start_cash=config.start_cash))
+    simulation.reset(0)
+    simulation.dice = FixedDice([(2 * config.board_size, True)])
+
+    _, position, _, _, event, _, _, _ = next(simulation.iter_turn_values())
+
+    assert position == 0
+    assert event == "Start"
+    assert simulation.player.cash == config.start_cash + 2 * config.start_passing_cash
+
+
+def test_passing_start_pays_the_bonus(config):
+    config = config.with_overrides(player_type="never_buy")
+    simulation = Simulation(config, create_player_from_type("never_buy", start_cash=config.start_cash))
+    simulation.reset(0)
+    simulation.player.position = config.board_size - 1
+    simulation.dice = FixedDice([(1, False)])
+
+    _, position, _, _, _, _, _, _ = next(simulation.iter_turn_values())
+
+    assert position == 0
+    assert simulation.player.cash == config.start_cash + config.start_passing_cash
@@ -0,0 +1,73 @@
+import random
+
+import pytest
+
+from monopoly_simulation.experiments.trajectory_stats import CashTrajectoryStats, QuantileSketch
+
+
+def exact_quantile(values, q):
+    return sorted(values)[int(q * (len(values) - 1))]
+
+
+@pytest.mark.parametrize("q", [0.0, 0.05, 0.5, 0.95, 1.0])
+def test_sketch_quantiles_are_within_relative_accuracy(q):
+    rng = random.Random(0)
+    values = [rng.lognormvariate(6, 1.5) for _ in range(5000)]
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    for value in values:
+        sketch.add(value)
+    assert sketch.quantile(q) == pytest.approx(exact_quantile(values, q), rel=0.01)
+
+
+def test_sketch_handles_negative_and_zero_values():
+    values = [-500, -20, 0, 0, 0, 30, 700]
+    sketch = QuantileSketch()
+    for value in values:
+        sketch.add(value)
+    assert sketch.quantile(0.0) == pytest.approx(-500, rel=0.01)
+    assert sketch.quantile(0.5) == 0.0
+    assert sketch.quantile(1.0) == pytest.approx(700, rel=0.01)
+    assert QuantileSketch().quantile(0.5) is None
+
+
+def test_merged_sketches_equal_one_sketch():
+    values = list(range(1, 1000))
+    merged, first, single = QuantileSketch(), QuantileSketch(), QuantileSketch()
+    for value in values[:400]:
+        first.add(value)
+    for value in values[400:]:
+        merged.add(value)
+    for value in values:
+        single.add(value)
+    merged.merge(first)
+    assert (merged.positive, merged.count) == (single.positive, single.count)
+    with pytest.raises(ValueError):
+        merged.merge(QuantileSketch(relative_accuracy=0.05))
+
+
+def test_cash_trajectory_moments_and_merge():
+    rng = random.Random(1)
+    games = [[(turn, rng.randint(0, 3000)) for turn in range(rng.randint(1, 10))] for _ in range(200)]
+    single, first, second = CashTrajectoryStats(10), CashTrajectoryStats(10), CashTrajectoryStats(10)
+    for i, game in enumerate(games):
+        for turn, cash in game:
+            single.add(turn, cash)
+            (first if i % 2 else second).add(turn, cash)
+    first.merge(second)
+
+    turn_0 = [cash for game in games for turn, cash in game if turn == 0]
+    mean = sum(turn_0) / len(turn_0)
+    variance = sum((cash - mean) ** 2 for cash in turn_0) / (len(turn_0) - 1)
+    for stats in (single, first):
+        assert stats.count[0] == len(turn_0)
+        assert stats.mean[0] == pytest.approx(mean)
+        assert stats.variance(0) == pytest.approx(variance)
+
+
+def test_turn_log_counts_bankruptcies():
+    stats = CashTrajectoryStats(5)
+    stats.add_turn_log([
+        (0, 3, 1000, [], None, None, None, None),
+        (1, 5, 0, [], "Game Over", None, None, "Bankrupcy"),
+    ])
+    assert stats.survival()[:2] == [1, 0]
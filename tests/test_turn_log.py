@@ -0,0 +1,72 @@
+import contextlib
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from monopoly_simulation.player import create_player_from_type
+from monopoly_simulation.replay import write_varint
+from monopoly_simulation.simualtion import Simulation
+from monopoly_simulation.turn_log import TurnLogReader, TurnLogWriter, decode_varints, unzigzag, zigzag
+
+
+def test_zigzag_round_trip():
+    values = [0, -1, 1, -2, 2, -1000, 123456789, -(2**40)]
+    encoded = [zigzag(value) for value in values]
+    assert encoded[:5] == [0, 1, 2, 3, 4]
+    assert all(code >= 0 for code in encoded)
+    assert unzigzag(np.array(encoded, dtype=np.int64)).tolist() == values
+
+
+def test_decode_varints_matches_the_encoder():
+    values = [0, 1, 127, 128, 255, 300, 16384, 2**35, 5]
+    data = bytearray()
+    for value in values:
+        write_varint(data, value)
+    assert decode_varints(bytes(data)).tolist() == values
+    assert decode_varints(bytes([1, 2, 3])).tolist() == [1, 2, 3]
+    assert len(decode_varints(b"")) == 0
+
+
+def play_games(config, num_games):
+    simulation = Simulation(config, create_player_from_type("always_buy", start_cash=config.start_cash))
+    games = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for game_no in range(num_games):
+            simulation.reset(game_no)
+            games.append([
+                {**turn_outcome, "properties_owned": len(turn_outcome["properties_owned"])}
+                for turn_outcome in simulation.iter_turns()
+            ])
+    return games
+
+
+def test_turn_log_round_trip(config, tmp_path):
+    config = config.with_overrides(player_type="always_buy")
+    games = play_games(config, 25)
+    path = tmp_path / "games.turnlog"
+    with TurnLogWriter(path, config) as writer:
+        for game_no, turn_outcomes in enumerate(games):
+            writer.write_game(game_no, turn_outcomes)
+
+    reader = TurnLogReader(path)
+    assert len(reader) == 25
+    expected = pd.DataFrame([{"game_no": game_no, **turn} for game_no, turns in enumerate(games) for turn in turns])
+    decoded = reader.read_df()
+    pd.testing.assert_frame_equal(decoded, expected[list(decoded)].astype({"amount": float}), check_dtype=False)
+
+    game = pd.DataFrame(reader.read_game(7))
+    pd.testing.assert_frame_equal(
+        game, expected[expected["game_no"] == 7][list(game)].reset_index(drop=True).astype({"amount": float}),
+        check_dtype=False,
+    )
+
+
+def test_unclosed_turn_log_is_rejected(config, tmp_path):
+    path = tmp_path / "games.turnlog"
+    writer = TurnLogWriter(path, config)
+    writer.file.flush()
+    with pytest.raises(ValueError):
+        TurnLogReader(path)
+    writer.close()
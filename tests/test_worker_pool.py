@@ -0,0 +1,50 @@
+import os
+import time
+
+import pytest
+
+from monopoly_simulation.experiments.worker_pool import FairWorkerPool
+
+
+def finish_time(seconds):
+    time.sleep(seconds)
+    return time.time()
+
+
+def die_once(path):
+    if not os.path.exists(path):
+        open(path, "w").close()
+        os._exit(1)
+    return "survived"
+
+
+def die_always():
+    os._exit(1)
+
+
+@pytest.fixture(scope="module")
+def pool():
+    return FairWorkerPool(workers=1)
+
+
+def test_owners_share_the_workers(pool):
+    large_run = [pool.submit("large", finish_time, 0.05) for _ in range(8)]
+    small_run = pool.submit("small", finish_time, 0.05)
+    assert small_run.result(timeout=60) < max(future.result(timeout=60) for future in large_run)
+
+
+def test_jobs_of_a_dead_worker_are_requeued(pool, tmp_path):
+    flag = str(tmp_path / "died")
+    futures = [pool.submit("a", die_once, flag), pool.submit("a", finish_time, 0)]
+    assert futures[0].result(timeout=60) == "survived"
+    assert futures[1].result(timeout=60) > 0
+    assert pool.pending_jobs() == {}
+
+
+def test_job_killing_every_worker_fails(pool):
+    future = pool.submit("a", die_always)
+    with pytest.raises(Exception) as error:
+        future.result(timeout=60)
+    assert type(error.value).__name__ == "BrokenProcessPool"
+    # The pool works again afterwards
+    assert pool.submit("a", finish_time, 0).result(timeout=60) > 0